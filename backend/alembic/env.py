@@ -25,7 +25,7 @@ config.set_main_option("sqlalchemy.url", database_url)
 
 # Import Base and all models so target_metadata has every table
 from app.database import Base
-from app.models import user, task, comment, file  # noqa: F401
+from app.models import user, task, comment, file, archive, stats, task_history  # noqa: F401
 
 target_metadata = Base.metadata
 
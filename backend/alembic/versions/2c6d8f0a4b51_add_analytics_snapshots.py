@@ -0,0 +1,33 @@
+"""add analytics snapshots
+
+Revision ID: 2c6d8f0a4b51
+Revises: f19b3e6c8a27
+Create Date: 2026-10-19 01:12:37.640218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c6d8f0a4b51'
+down_revision: Union[str, Sequence[str], None] = 'f19b3e6c8a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('analytics_snapshots',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('generated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('analytics_snapshots')
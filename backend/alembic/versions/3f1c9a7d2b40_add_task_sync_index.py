@@ -0,0 +1,28 @@
+"""add task delta sync index
+
+Revision ID: 3f1c9a7d2b40
+Revises: 6a9b24b6eee4
+Create Date: 2026-10-18 09:12:41.302114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7d2b40'
+down_revision: Union[str, Sequence[str], None] = '6a9b24b6eee4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_owner_updated_at_id', 'tasks', ['owner_id', 'updated_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_owner_updated_at_id', table_name='tasks')
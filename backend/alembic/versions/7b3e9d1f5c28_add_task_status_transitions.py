@@ -0,0 +1,65 @@
+"""add task status transitions
+
+Revision ID: 7b3e9d1f5c28
+Revises: 2c6d8f0a4b51
+Create Date: 2026-10-19 09:41:05.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3e9d1f5c28'
+down_revision: Union[str, Sequence[str], None] = '2c6d8f0a4b51'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _backfill() -> None:
+    """
+    Give every live task a creation transition into its current status at created_at (as
+    stats_service.backfill_status_transitions would), so later status changes of tasks created
+    before this table never count a status below zero. Statuses are already coded (see c81f5d2e7a06).
+    """
+    op.execute(
+        "INSERT INTO task_status_transitions (task_id, owner_id, from_status, to_status, changed_at) "
+        "SELECT id, owner_id, NULL, status, COALESCE(created_at, CURRENT_TIMESTAMP) "
+        "FROM tasks WHERE is_deleted = false"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_status_transitions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('from_status', sa.SmallInteger(), nullable=True),
+    sa.Column('to_status', sa.SmallInteger(), nullable=True),
+    sa.Column('changed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_task_status_transitions_task_id'), 'task_status_transitions', ['task_id'], unique=False)
+    op.create_index('ix_task_status_transitions_owner_changed_at', 'task_status_transitions', ['owner_id', 'changed_at'], unique=False)
+    op.create_table('task_flow_checkpoints',
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('todo', sa.Integer(), nullable=False),
+    sa.Column('in_progress', sa.Integer(), nullable=False),
+    sa.Column('done', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('owner_id', 'day')
+    )
+    _backfill()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('task_flow_checkpoints')
+    op.drop_index('ix_task_status_transitions_owner_changed_at', table_name='task_status_transitions')
+    op.drop_index(op.f('ix_task_status_transitions_task_id'), table_name='task_status_transitions')
+    op.drop_table('task_status_transitions')
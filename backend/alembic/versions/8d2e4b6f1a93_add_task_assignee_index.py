@@ -0,0 +1,28 @@
+"""add task assignee index
+
+Revision ID: 8d2e4b6f1a93
+Revises: 3f1c9a7d2b40
+Create Date: 2026-10-18 09:48:03.517620
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2e4b6f1a93'
+down_revision: Union[str, Sequence[str], None] = '3f1c9a7d2b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_assigned_to_is_deleted_status', 'tasks', ['assigned_to', 'is_deleted', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_assigned_to_is_deleted_status', table_name='tasks')
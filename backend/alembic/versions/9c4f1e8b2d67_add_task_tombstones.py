@@ -0,0 +1,36 @@
+"""add task tombstones
+
+Revision ID: 9c4f1e8b2d67
+Revises: 7b3e9d1f5c28
+Create Date: 2026-10-19 14:12:37.502918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4f1e8b2d67'
+down_revision: Union[str, Sequence[str], None] = '7b3e9d1f5c28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_tombstones',
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('removed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('task_id')
+    )
+    op.create_index('ix_task_tombstones_owner_removed_at_task_id', 'task_tombstones', ['owner_id', 'removed_at', 'task_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_tombstones_owner_removed_at_task_id', table_name='task_tombstones')
+    op.drop_table('task_tombstones')
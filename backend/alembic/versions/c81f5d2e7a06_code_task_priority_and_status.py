@@ -0,0 +1,66 @@
+"""store task priority and status as small-integer codes
+
+Revision ID: c81f5d2e7a06
+Revises: b57e0c3a9d14
+Create Date: 2026-10-18 11:20:37.140552
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81f5d2e7a06'
+down_revision: Union[str, Sequence[str], None] = 'b57e0c3a9d14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Codes match app.models.task.TASK_PRIORITIES / TASK_STATUSES (list position)
+PRIORITY_TO_CODE = """
+    CASE lower(trim(priority)) WHEN 'low' THEN 0 WHEN 'high' THEN 2 ELSE 1 END
+"""
+STATUS_TO_CODE = """
+    CASE replace(replace(lower(trim(status)), '-', '_'), ' ', '_')
+        WHEN 'in_progress' THEN 1 WHEN 'done' THEN 2 ELSE 0 END
+"""
+PRIORITY_TO_STRING = "CASE priority_code WHEN 0 THEN 'low' WHEN 2 THEN 'high' ELSE 'medium' END"
+STATUS_TO_STRING = "CASE status_code WHEN 1 THEN 'in_progress' WHEN 2 THEN 'done' ELSE 'todo' END"
+
+
+def _convert(table: str, new_type, priority_expr: str, status_expr: str, indexed: bool) -> None:
+    """Add *_code columns, fill them from the old ones, then swap them in under the old names."""
+    with op.batch_alter_table(table) as batch_op:
+        batch_op.add_column(sa.Column('priority_code', new_type, nullable=True))
+        batch_op.add_column(sa.Column('status_code', new_type, nullable=True))
+    op.execute(f"UPDATE {table} SET priority_code = {priority_expr}, status_code = {status_expr}")
+    with op.batch_alter_table(table) as batch_op:
+        if indexed:
+            batch_op.drop_index('ix_tasks_assigned_to_is_deleted_status')
+            batch_op.drop_index('ix_tasks_status')
+            batch_op.drop_index('ix_tasks_priority')
+        batch_op.drop_column('priority')
+        batch_op.drop_column('status')
+    with op.batch_alter_table(table) as batch_op:
+        batch_op.alter_column('priority_code', new_column_name='priority', existing_type=new_type, nullable=False)
+        batch_op.alter_column('status_code', new_column_name='status', existing_type=new_type, nullable=False)
+    with op.batch_alter_table(table) as batch_op:
+        if indexed:
+            batch_op.create_index('ix_tasks_priority', ['priority'], unique=False)
+            batch_op.create_index('ix_tasks_status', ['status'], unique=False)
+            batch_op.create_index('ix_tasks_assigned_to_is_deleted_status', ['assigned_to', 'is_deleted', 'status'], unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _convert('tasks', sa.SmallInteger(), PRIORITY_TO_CODE, STATUS_TO_CODE, indexed=True)
+    _convert('archived_tasks', sa.SmallInteger(), PRIORITY_TO_CODE, STATUS_TO_CODE, indexed=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    priority_expr = PRIORITY_TO_STRING.replace('priority_code', 'priority')
+    status_expr = STATUS_TO_STRING.replace('status_code', 'status')
+    _convert('archived_tasks', sa.String(), priority_expr, status_expr, indexed=False)
+    _convert('tasks', sa.String(), priority_expr, status_expr, indexed=True)
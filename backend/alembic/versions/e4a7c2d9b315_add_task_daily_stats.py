@@ -0,0 +1,67 @@
+"""add task daily stats
+
+Revision ID: e4a7c2d9b315
+Revises: c81f5d2e7a06
+Create Date: 2026-10-18 23:20:41.512093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7c2d9b315'
+down_revision: Union[str, Sequence[str], None] = 'c81f5d2e7a06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# app.models.task.TASK_STATUSES.index("done") (see c81f5d2e7a06)
+DONE_CODE = 2
+# (rollup column, timestamp counted, condition) as in app.services.stats_service.rebuild_daily_stats
+SERIES = [
+    ("created", "created_at", "is_deleted = false"),
+    ("completed", "completed_at", "is_deleted = false AND completed_at IS NOT NULL"),
+    ("deleted", "updated_at", "is_deleted = true"),
+    ("overdue", "due_date", f"is_deleted = false AND status != {DONE_CODE} AND due_date IS NOT NULL"),
+]
+STAT_COLUMNS = [column for column, _, _ in SERIES]
+
+
+def _backfill() -> None:
+    """Count existing live and archived tasks per owner and UTC day into task_daily_stats."""
+    postgres = op.get_bind().dialect.name == "postgresql"
+    events = []
+    for table in ("tasks", "archived_tasks"):
+        for column, timestamp, condition in SERIES:
+            day = f"CAST({timestamp} AS DATE)" if postgres else f"date({timestamp})"
+            counts = ", ".join(f"{int(c == column)} AS {c}" for c in STAT_COLUMNS)
+            events.append(f"SELECT owner_id, {day} AS day, {counts} FROM {table} WHERE {condition}")
+    sums = ", ".join(f"SUM({c})" for c in STAT_COLUMNS)
+    op.execute(
+        f"INSERT INTO task_daily_stats (owner_id, day, {', '.join(STAT_COLUMNS)}) "
+        f"SELECT owner_id, day, {sums} FROM ({' UNION ALL '.join(events)}) AS events GROUP BY owner_id, day"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_daily_stats',
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('created', sa.Integer(), nullable=False),
+    sa.Column('completed', sa.Integer(), nullable=False),
+    sa.Column('deleted', sa.Integer(), nullable=False),
+    sa.Column('overdue', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('owner_id', 'day')
+    )
+    op.create_index(op.f('ix_task_daily_stats_day'), 'task_daily_stats', ['day'], unique=False)
+    _backfill()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_task_daily_stats_day'), table_name='task_daily_stats')
+    op.drop_table('task_daily_stats')
@@ -0,0 +1,60 @@
+"""add task counters
+
+Revision ID: f19b3e6c8a27
+Revises: e4a7c2d9b315
+Create Date: 2026-10-18 23:58:12.307415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f19b3e6c8a27'
+down_revision: Union[str, Sequence[str], None] = 'e4a7c2d9b315'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Codes of app.models.task.TASK_STATUSES / TASK_PRIORITIES (see c81f5d2e7a06)
+STATUS_CODES = {"todo": 0, "in_progress": 1, "done": 2}
+PRIORITY_CODES = {"low": 0, "medium": 1, "high": 2}
+
+
+def _backfill() -> None:
+    """Count each owner's live tasks into task_counters (as stats_service.reconcile_task_counters would)."""
+    columns = ["total"] + [f"status_{s}" for s in STATUS_CODES] + [f"priority_{p}" for p in PRIORITY_CODES] + ["due_open"]
+    counts = ["COUNT(*)"]
+    counts += [f"SUM(CASE WHEN status = {code} THEN 1 ELSE 0 END)" for code in STATUS_CODES.values()]
+    counts += [f"SUM(CASE WHEN priority = {code} THEN 1 ELSE 0 END)" for code in PRIORITY_CODES.values()]
+    counts.append(f"SUM(CASE WHEN status != {STATUS_CODES['done']} AND due_date IS NOT NULL THEN 1 ELSE 0 END)")
+    op.execute(
+        f"INSERT INTO task_counters (owner_id, {', '.join(columns)}) "
+        f"SELECT owner_id, {', '.join(counts)} FROM tasks WHERE is_deleted = false GROUP BY owner_id"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_counters',
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('status_todo', sa.Integer(), nullable=False),
+    sa.Column('status_in_progress', sa.Integer(), nullable=False),
+    sa.Column('status_done', sa.Integer(), nullable=False),
+    sa.Column('priority_low', sa.Integer(), nullable=False),
+    sa.Column('priority_medium', sa.Integer(), nullable=False),
+    sa.Column('priority_high', sa.Integer(), nullable=False),
+    sa.Column('due_open', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('owner_id')
+    )
+    op.create_index('ix_tasks_owner_id_due_date', 'tasks', ['owner_id', 'due_date'], unique=False)
+    _backfill()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_owner_id_due_date', table_name='tasks')
+    op.drop_table('task_counters')
@@ -15,6 +15,53 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: Optional[str] = None
     EMAIL_FROM: Optional[str] = None
 
+    # Archival: done tasks completed (and soft-deleted tasks last touched) more than
+    # ARCHIVE_AFTER_DAYS ago are moved to archived_* tables, ARCHIVE_BATCH_SIZE per commit.
+    ARCHIVE_AFTER_DAYS: int = 180
+    ARCHIVE_BATCH_SIZE: int = 500
+
+    # Garbage collection: soft-deleted rows older than GC_RETENTION_DAYS are hard-deleted,
+    # GC_BATCH_SIZE per commit with GC_BATCH_SLEEP_SECONDS between batches.
+    GC_RETENTION_DAYS: int = 30
+    GC_BATCH_SIZE: int = 500
+    GC_BATCH_SLEEP_SECONDS: float = 0.1
+
+    # Analytics response cache: entries are invalidated by task writes, so the TTL only
+    # bounds how long an entry survives writes that bypass the API (scripts, jobs).
+    ANALYTICS_CACHE_TTL_SECONDS: int = 3600
+    # Expired entries are still served this long while one background refresh recomputes them
+    ANALYTICS_CACHE_STALE_SECONDS: int = 300
+    # In-process LRU in front of Redis: entry bound, and how long a local copy may be served
+    # without hearing about changes (other workers' writes normally arrive via pub/sub)
+    CACHE_LOCAL_MAX_ENTRIES: int = 10000
+    CACHE_LOCAL_TTL_SECONDS: int = 30
+    CACHE_INVALIDATION_CHANNEL: str = "task-cache:invalidate"
+    # Single-flight misses: how long the computing worker holds the Redis lock, and how long
+    # other callers wait for its result before computing it themselves
+    CACHE_LOCK_TTL_SECONDS: int = 30
+    CACHE_SINGLE_FLIGHT_TIMEOUT_SECONDS: float = 10
+    # Redis connection pool, and the circuit breaker that caches in memory while Redis is down:
+    # probed every CACHE_HEALTH_CHECK_INTERVAL_SECONDS, opened after that many failures in a row
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 0.5
+    REDIS_CONNECT_TIMEOUT_SECONDS: float = 0.5
+    CACHE_HEALTH_CHECK_INTERVAL_SECONDS: float = 5
+    CACHE_BREAKER_FAILURE_THRESHOLD: int = 3
+    # Cached values at least this large (packed, before compression) are zlib-compressed
+    CACHE_COMPRESS_MIN_BYTES: int = 1024
+    CACHE_COMPRESSION_LEVEL: int = 6
+    # Compute a user's summary and default trends in the background when they log in
+    CACHE_WARM_ON_LOGIN: bool = True
+
+    # Comma-separated emails of users allowed to use admin endpoints (cache inspect/purge)
+    ADMIN_EMAILS: str = ""
+
+    # Analytics snapshots: performance and 7/30/90-day trends are precomputed every
+    # ANALYTICS_SNAPSHOT_INTERVAL_MINUTES; a snapshot older than ANALYTICS_SNAPSHOT_MAX_AGE_MINUTES
+    # (e.g. beat not running) is recomputed on the next request instead.
+    ANALYTICS_SNAPSHOT_INTERVAL_MINUTES: int = 15
+    ANALYTICS_SNAPSHOT_MAX_AGE_MINUTES: int = 60
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
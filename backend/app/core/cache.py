@@ -0,0 +1,65 @@
+"""
+Cache backend setup shared by the API and scripts: Redis behind an in-process LRU, with an
+in-memory fallback while Redis is unhealthy (see app.utils.cache_backends).
+"""
+import logging
+
+import redis.asyncio as redis
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.backends.redis import RedisBackend
+
+from app.config import settings
+from app.utils.cache_backends import FailoverBackend, TwoTierBackend
+from app.utils.cache_coder import CompactCoder
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "task-cache"
+
+
+async def init_cache(redis_url: str, start: bool = True) -> FailoverBackend:
+    """
+    Build the cache backend and initialize FastAPICache with it. With start, the health probe
+    and invalidation listener run until the backend's stop(); one-off scripts skip them.
+    """
+    # Creating a client never connects; bounded pool and timeouts keep a dead Redis cheap
+    # Cached values are binary (see app.utils.cache_coder), so responses stay undecoded
+    pool = redis.ConnectionPool.from_url(
+        redis_url,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT_SECONDS,
+    )
+    redis_client = redis.Redis(connection_pool=pool)
+    # The invalidation listener blocks on reads between messages, so it gets no read timeout
+    subscriber = redis.from_url(
+        redis_url,
+        socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT_SECONDS,
+        encoding="utf8",
+        decode_responses=True,
+    )
+    fallback = InMemoryBackend()
+    fallback._store = {}  # the class-level default dict is shared by every instance
+    backend = FailoverBackend(
+        TwoTierBackend(
+            RedisBackend(redis_client),
+            redis_client,
+            channel=settings.CACHE_INVALIDATION_CHANNEL,
+            max_entries=settings.CACHE_LOCAL_MAX_ENTRIES,
+            local_ttl_seconds=settings.CACHE_LOCAL_TTL_SECONDS,
+            subscriber=subscriber,
+        ),
+        fallback,
+        redis_client,
+        failure_threshold=settings.CACHE_BREAKER_FAILURE_THRESHOLD,
+        probe_interval_seconds=settings.CACHE_HEALTH_CHECK_INTERVAL_SECONDS,
+        probe_timeout_seconds=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+    )
+    FastAPICache.init(backend, prefix=CACHE_PREFIX, coder=CompactCoder)
+    # An unreachable Redis at startup means starting on the in-memory tier right away
+    await backend.probe(open_on_failure=True)
+    if start:
+        backend.start()
+    logger.info("Cache initialized (Redis healthy: %s)", not backend.is_open)
+    return backend
@@ -1,5 +1,8 @@
 import os
 from celery import Celery
+from celery.schedules import crontab
+
+from app.config import settings
 
 # Use Redis as broker and backend
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
@@ -13,3 +16,23 @@ celery_app.conf.update(
     timezone="UTC",
     enable_utc=True,
 )
+
+# Periodic maintenance jobs (run `celery -A app.worker beat` alongside the worker)
+celery_app.conf.beat_schedule = {
+    "archive-old-tasks": {
+        "task": "app.worker.archive_tasks_task",
+        "schedule": crontab(hour=3, minute=0),
+    },
+    "purge-soft-deleted": {
+        "task": "app.worker.purge_deleted_task",
+        "schedule": crontab(hour=4, minute=0),
+    },
+    "reconcile-task-counters": {
+        "task": "app.worker.reconcile_task_counters_task",
+        "schedule": crontab(hour=5, minute=0),
+    },
+    "refresh-analytics-snapshots": {
+        "task": "app.worker.refresh_analytics_snapshots_task",
+        "schedule": settings.ANALYTICS_SNAPSHOT_INTERVAL_MINUTES * 60.0,
+    },
+}
@@ -19,16 +19,22 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 
 from fastapi_cache import FastAPICache
-from fastapi_cache.backends.redis import RedisBackend
-import redis.asyncio as redis
+from fastapi_cache.backends.inmemory import InMemoryBackend
 
+from app.core.cache import CACHE_PREFIX, init_cache
 from app.database import Base, engine
 from app.models import user as _  # noqa: F401
 from app.models import comment as _  # noqa: F401
 from app.models import file as _  # noqa: F401
+from app.models import archive as _  # noqa: F401
+from app.models import stats as _  # noqa: F401
+from app.models import task_history as _  # noqa: F401
 from app.routes import auth, tasks, comments, files, analytics, exports, users, websockets
 from app.routes.files import files_by_id_router
+from app.services import stats_service as _  # noqa: F401  (keeps task_daily_stats in step with task writes)
 from app.utils.auth import get_current_user
+from app.utils.cache_backends import FailoverBackend
+from app.utils.cache_coder import CompactCoder
 
 logger = logging.getLogger(__name__)
 
@@ -76,18 +82,26 @@ async def startup_event():
 
     redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
     try:
-        redis_client = redis.from_url(redis_url, encoding="utf8", decode_responses=True)
-        FastAPICache.init(RedisBackend(redis_client), prefix="task-cache")
-        logger.info("Cache initialized with Redis backend")
+        await init_cache(redis_url)
     except Exception as exc:
         logger.warning("Cache initialization failed: %s; using in-memory fallback", exc)
         try:
-            from fastapi_cache.backends.in_memory import InMemoryBackend
-            FastAPICache.init(InMemoryBackend(), prefix="task-cache")
+            FastAPICache.init(InMemoryBackend(), prefix=CACHE_PREFIX, coder=CompactCoder)
             logger.info("Cache initialized with in-memory backend")
         except Exception as fallback_exc:
             logger.warning("In-memory cache fallback failed: %s", fallback_exc)
 
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the cache health probe and invalidation listener."""
+    try:
+        backend = FastAPICache.get_backend()
+    except AssertionError:  # cache never initialized
+        return
+    if isinstance(backend, FailoverBackend):
+        await backend.stop()
+
 # Include routers
 app.include_router(exports.router)
 app.include_router(tasks.router)
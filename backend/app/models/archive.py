@@ -0,0 +1,72 @@
+from datetime import datetime
+
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text
+
+from app.database import Base
+from app.models.task import TASK_PRIORITIES, TASK_STATUSES, CodedString
+
+
+# Cold storage for tasks moved out of `tasks` by archive_service. Rows keep their original
+# ids and columns so they can be unioned with live rows when a request asks for archived data.
+
+
+class ArchivedTask(Base):
+    """Archived task: same shape as Task plus the time it was moved."""
+
+    __tablename__ = "archived_tasks"
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String, nullable=False)
+    description = Column(String, nullable=True)
+    completed = Column(Boolean, default=False)
+    is_deleted = Column(Boolean, default=False, nullable=False)
+    priority = Column(CodedString(TASK_PRIORITIES), nullable=False, default="medium")
+    status = Column(CodedString(TASK_STATUSES), nullable=False, default="todo")
+    due_date = Column(DateTime, nullable=True)
+    tags = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    completed_at = Column(DateTime, nullable=True)
+
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    assigned_to = Column(Integer, ForeignKey("users.id"), nullable=True)
+
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Lets TaskResponse tell archived rows from live ones
+    archived = True
+
+    __table_args__ = (
+        Index('ix_archived_tasks_owner_id', 'owner_id'),
+        Index('ix_archived_tasks_assigned_to', 'assigned_to'),
+    )
+
+
+class ArchivedComment(Base):
+    """Archived comment belonging to an archived task."""
+
+    __tablename__ = "archived_comments"
+
+    id = Column(Integer, primary_key=True)
+    content = Column(Text, nullable=False)
+    task_id = Column(Integer, nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    is_deleted = Column(Boolean, default=False, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+
+
+class ArchivedFile(Base):
+    """Archived file metadata belonging to an archived task. The blob stays on disk."""
+
+    __tablename__ = "archived_files"
+
+    id = Column(Integer, primary_key=True)
+    filename = Column(String, nullable=False)
+    filepath = Column(String, nullable=False)
+    size = Column(Integer, nullable=False)
+    content_type = Column(String, nullable=False)
+    task_id = Column(Integer, nullable=False, index=True)
+    uploaded_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    is_deleted = Column(Boolean, default=False, nullable=False)
+    created_at = Column(DateTime, nullable=False)
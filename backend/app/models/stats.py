@@ -0,0 +1,69 @@
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, String, Text
+
+from app.database import Base
+
+
+class TaskDailyStats(Base):
+    """
+    Per-owner, per-UTC-day task counters maintained by stats_service on every task write.
+
+    created:   live tasks created that day
+    completed: live tasks completed that day (by completed_at)
+    deleted:   tasks soft-deleted that day
+    overdue:   live, not-done tasks due that day (past days are overdue)
+    """
+
+    __tablename__ = "task_daily_stats"
+
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True, index=True)
+    created = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
+    deleted = Column(Integer, nullable=False, default=0)
+    overdue = Column(Integer, nullable=False, default=0)
+
+
+class TaskCounters(Base):
+    """
+    Live per-owner counts of non-deleted tasks, maintained by stats_service with atomic
+    increments so the dashboard summary is a primary-key lookup.
+
+    due_open counts not-done tasks with a due date: the candidates for `overdue`.
+    """
+
+    __tablename__ = "task_counters"
+
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    status_todo = Column(Integer, nullable=False, default=0)
+    status_in_progress = Column(Integer, nullable=False, default=0)
+    status_done = Column(Integer, nullable=False, default=0)
+    priority_low = Column(Integer, nullable=False, default=0)
+    priority_medium = Column(Integer, nullable=False, default=0)
+    priority_high = Column(Integer, nullable=False, default=0)
+    due_open = Column(Integer, nullable=False, default=0)
+
+
+class AnalyticsSnapshot(Base):
+    """Precomputed analytics response (JSON), refreshed by the snapshot job and served as-is."""
+
+    __tablename__ = "analytics_snapshots"
+
+    name = Column(String, primary_key=True)  # e.g. "performance", "trends:30:user:7"
+    payload = Column(Text, nullable=False)
+    generated_at = Column(DateTime, nullable=False)
+
+
+class TaskFlowCheckpoint(Base):
+    """
+    Tasks per status for one owner at the end of one UTC day, derived from task_status_transitions.
+    Written by flow_service for finished days only, so rows never change once written.
+    """
+
+    __tablename__ = "task_flow_checkpoints"
+
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    todo = Column(Integer, nullable=False, default=0)
+    in_progress = Column(Integer, nullable=False, default=0)
+    done = Column(Integer, nullable=False, default=0)
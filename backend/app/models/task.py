@@ -1,12 +1,48 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Boolean
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, SmallInteger, String, Boolean
 from sqlalchemy.orm import relationship
+from sqlalchemy.types import TypeDecorator
 
 from app.database import Base
 
 
-# String constants for priority (used by tests and schemas); DB stores plain strings
+# Ordered value lists: the position is the small-integer code stored in the DB, so
+# ORDER BY priority is low < medium < high and status sorts todo < in_progress < done.
+TASK_PRIORITIES = ("low", "medium", "high")
+TASK_STATUSES = ("todo", "in_progress", "done")
+
+
+class CodedString(TypeDecorator):
+    """Stores one of a fixed, ordered set of strings as its SmallInteger index.
+    Python code and the API keep using the strings; comparisons bind to the codes."""
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, values):
+        super().__init__()
+        self.values = tuple(values)
+        self._codes = {value: code for code, value in enumerate(self.values)}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            return self._codes[value]
+        except KeyError:
+            raise ValueError(f"{value!r} is not one of {', '.join(self.values)}")
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self.values[value]
+
+    def process_literal_param(self, value, dialect):
+        return str(self.process_bind_param(value, dialect))
+
+
+# String constants for priority (used by tests and schemas); DB stores small-integer codes
 class TaskPriority:
     LOW = "low"
     MEDIUM = "medium"
@@ -24,8 +60,8 @@ class Task(Base):
     description = Column(String, nullable=True)
     completed = Column(Boolean, default=False)
     is_deleted = Column(Boolean, default=False, nullable=False)
-    priority = Column(String, nullable=False, default="medium", index=True)
-    status = Column(String, nullable=False, default="todo", index=True)  # todo, in_progress, done
+    priority = Column(CodedString(TASK_PRIORITIES), nullable=False, default="medium", index=True)
+    status = Column(CodedString(TASK_STATUSES), nullable=False, default="todo", index=True)  # todo, in_progress, done
     due_date = Column(DateTime, nullable=True)
     tags = Column(String, nullable=True)  # JSON array string e.g. ["tag1","tag2"]
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -45,5 +81,11 @@ class Task(Base):
         Index('ix_tasks_completed', 'completed'),
         Index('ix_tasks_created_at', 'created_at'),
         Index('ix_tasks_due_date', 'due_date'),
+        # Delta sync: keyset scan over (updated_at, id) per owner
+        Index('ix_tasks_owner_updated_at_id', 'owner_id', 'updated_at', 'id'),
+        # "Assigned to me" views: scope=assigned on list, export and analytics
+        Index('ix_tasks_assigned_to_is_deleted_status', 'assigned_to', 'is_deleted', 'status'),
+        # Summary overdue count: one owner's tasks by due date
+        Index('ix_tasks_owner_id_due_date', 'owner_id', 'due_date'),
     )
 
@@ -0,0 +1,47 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer
+
+from app.database import Base
+from app.models.task import TASK_STATUSES, CodedString
+
+
+class TaskStatusTransition(Base):
+    """
+    One change of a task's place on the board, written by stats_service with the task write.
+    from_status is None when the task was created; to_status is None when it was deleted.
+    No FK to tasks: history outlives archiving and purging.
+    """
+
+    __tablename__ = "task_status_transitions"
+
+    id = Column(Integer, primary_key=True)
+    task_id = Column(Integer, nullable=False, index=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    from_status = Column(CodedString(TASK_STATUSES), nullable=True)
+    to_status = Column(CodedString(TASK_STATUSES), nullable=True)
+    changed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # Flow scans: one owner's transitions in time order
+        Index('ix_task_status_transitions_owner_changed_at', 'owner_id', 'changed_at'),
+    )
+
+
+class TaskTombstone(Base):
+    """
+    A task that left the tasks table (archived or purged), so delta sync can report it as
+    deleted to clients whose cursor predates its removal. Kept for GC_RETENTION_DAYS; older
+    sync cursors are rejected (see task_service.get_task_changes).
+    """
+
+    __tablename__ = "task_tombstones"
+
+    task_id = Column(Integer, primary_key=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    removed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # Delta sync: keyset scan over (removed_at, task_id) per owner
+        Index('ix_task_tombstones_owner_removed_at_task_id', 'owner_id', 'removed_at', 'task_id'),
+    )
@@ -1,62 +1,235 @@
 """Analytics router for reporting."""
 import logging
-from typing import List
+from datetime import date, datetime, timedelta
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Query, status, HTTPException
+from fastapi import APIRouter, Depends, Query, Response, status, HTTPException
 from sqlalchemy.orm import Session
-from fastapi_cache.decorator import cache
+from fastapi_cache import FastAPICache
 
 from app.database import get_db
-from app.schemas.analytics import TaskSummary, UserPerformance, TaskTrends
-from app.services import analytics_service
-from app.utils.auth import get_current_user
-from app.utils.cache import user_key_builder
+from app.schemas.analytics import (
+    CompletionTimeDistribution, TaskBurndown, TaskFlow, TaskSummary, TaskTrends, UserPerformance,
+)
+from app.services import analytics_service, flow_service, snapshot_service
+from app.utils.auth import get_current_admin, get_current_user
+from app.config import settings
+from app.utils import cache_metrics
+from app.utils.cache import (
+    PERFORMANCE_TAG, cached, describe_keys, find_keys, key_pattern, purge_keys, tagged_key_builder,
+)
+from app.utils.cache_backends import FailoverBackend, TwoTierBackend
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/analytics", tags=["Analytics"])
 
+# Entries are invalidated by task writes (see app.utils.cache), so they can live long
+CACHE_TTL = settings.ANALYTICS_CACHE_TTL_SECONDS
+CACHE_STALE_TTL = settings.ANALYTICS_CACHE_STALE_SECONDS
+# Snapshot-backed endpoints report when their numbers were computed
+GENERATED_AT_HEADER = "X-Generated-At"
+
 
 @router.get("/tasks/summary", response_model=TaskSummary, status_code=status.HTTP_200_OK)
-@cache(expire=30, key_builder=user_key_builder)
+@router.get("/summary", response_model=TaskSummary, status_code=status.HTTP_200_OK)
+@cached(
+    expire=CACHE_TTL, stale_ttl=CACHE_STALE_TTL, namespace="analytics:summary", key_builder=tagged_key_builder()
+)
 def get_task_summary(
+    scope: str = Query("owned", description="Tasks to summarize: owned, assigned (to me) or all (either)"),
+    tag: Optional[str] = Query(None, description="Only summarize tasks with this tag"),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user)
 ):
-    """Get task summary for current user (count by status and priority)."""
-    summary = analytics_service.get_task_summary(db, current_user.id)
+    """Get task summary for current user (count by status and priority). `/summary` is a compatibility alias."""
+    try:
+        summary = analytics_service.get_task_summary(db, current_user.id, scope, tag)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return summary
 
 
-@router.get("/summary", response_model=TaskSummary, status_code=status.HTTP_200_OK)
-@cache(expire=30, key_builder=user_key_builder)
-def get_task_summary_alias(
+@router.get("/users/performance", response_model=List[UserPerformance], status_code=status.HTTP_200_OK)
+def get_user_performance(
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of users to return"),
+    offset: int = Query(0, ge=0, description="Number of users to skip"),
+    order_by: str = Query(
+        "user_id", description="Sort field: user_id, completion_rate, tasks_completed, tasks_assigned"
+    ),
+    sort_order: str = Query("asc", description="Sort order: asc or desc"),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user)
 ):
-    """Compatibility alias for task summary endpoint."""
-    return get_task_summary(db=db, current_user=current_user)
+    """
+    Get performance metrics for all users (tasks assigned, completed, completion rate, avg time)
+    from the latest snapshot; X-Generated-At tells when it was computed.
+    """
+    try:
+        rows, generated_at = snapshot_service.get_user_performance(db, limit, offset, order_by, sort_order)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    response.headers[GENERATED_AT_HEADER] = generated_at.isoformat() + "Z"
+    return rows
 
 
-@router.get("/users/performance", response_model=List[UserPerformance], status_code=status.HTTP_200_OK)
-@cache(expire=60, key_builder=user_key_builder)
-def get_user_performance(
+@router.get(
+    "/tasks/completion-times", response_model=CompletionTimeDistribution, status_code=status.HTTP_200_OK
+)
+@cached(
+    expire=CACHE_TTL,
+    stale_ttl=CACHE_STALE_TTL,
+    namespace="analytics:completion-times",
+    key_builder=tagged_key_builder(PERFORMANCE_TAG, per_user=False),
+)
+def get_completion_times(
+    group_by: str = Query("user", description="Group by: user (owner), priority or tag"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of groups to return"),
+    offset: int = Query(0, ge=0, description="Number of groups to skip"),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user)
 ):
-    """Get performance metrics for all users (tasks assigned, completed, completion rate, avg time)."""
-    return analytics_service.get_user_performance(db)
+    """Get p50/p90/p99 time-to-complete and a histogram for done tasks, per user, priority or tag."""
+    try:
+        return analytics_service.get_completion_time_distribution(db, group_by, limit, offset)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _is_snapshot_trends(days, granularity, tz, start, end, scope, **kwargs) -> bool:
+    """Default trends requests over a snapshot window: served from the user's snapshot, not the response cache."""
+    return (
+        (granularity, tz, scope, start, end) == ("day", "UTC", "owned", None, None)
+        and days in snapshot_service.SNAPSHOT_TREND_DAYS
+    )
 
 
 @router.get("/tasks/trends", response_model=TaskTrends, status_code=status.HTTP_200_OK)
-@cache(expire=60, key_builder=user_key_builder)
+@cached(
+    expire=CACHE_TTL,
+    stale_ttl=CACHE_STALE_TTL,
+    namespace="analytics:trends",
+    key_builder=tagged_key_builder(),
+    bypass=_is_snapshot_trends,
+)
 def get_task_trends(
-    days: int = Query(30),
+    days: int = Query(30, description="Days back from end, used when start is omitted"),
+    granularity: str = Query("day", description="Bucket size: hour, day, week or month"),
+    tz: str = Query("UTC", description="IANA time zone for bucket boundaries, e.g. Europe/Berlin"),
+    start: Optional[datetime] = Query(None, description="Range start (local to tz unless an offset is given)"),
+    end: Optional[datetime] = Query(None, description="Range end, inclusive (default: now)"),
+    scope: str = Query("owned", description="Tasks to count: owned, assigned (to me) or all (either)"),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user)
 ):
-    """Get daily task creation and completion trends."""
+    """
+    Get task creation, completion, deletion and due trends per hour, day, week or month.
+    Default daily UTC trends of owned tasks over 7, 30 or 90 days come from the latest snapshot;
+    other requests are cached like the summary.
+    """
     if days < 1 or days > 365:
         raise HTTPException(status_code=400, detail="days must be between 1 and 365")
-    trends = analytics_service.get_task_trends(db, days)
-    return TaskTrends(daily_trends=trends)
+    try:
+        if _is_snapshot_trends(days, granularity, tz, start, end, scope):
+            trends, generated_at = snapshot_service.get_task_trends(db, current_user.id, days)
+        else:
+            generated_at = datetime.utcnow()
+            trends = analytics_service.get_task_trends(
+                db, days, current_user.id, scope, granularity, tz, start, end
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return TaskTrends(daily_trends=trends, granularity=granularity, tz=tz, generated_at=generated_at)
+
+
+def _flow_window(days: int, start: Optional[date], end: Optional[date]):
+    """(start, end) UTC days: end defaults to today, start to days - 1 days before end."""
+    if days < 1 or days > flow_service.MAX_FLOW_DAYS:
+        raise HTTPException(status_code=400, detail=f"days must be between 1 and {flow_service.MAX_FLOW_DAYS}")
+    end = end or datetime.utcnow().date()
+    return start or end - timedelta(days=days - 1), end
+
+
+@router.get("/flow", response_model=TaskFlow, status_code=status.HTTP_200_OK)
+@cached(
+    expire=CACHE_TTL, stale_ttl=CACHE_STALE_TTL, namespace="analytics:flow", key_builder=tagged_key_builder()
+)
+def get_task_flow(
+    days: int = Query(30, description="Days back from end, used when start is omitted"),
+    start: Optional[date] = Query(None, description="First UTC day (YYYY-MM-DD)"),
+    end: Optional[date] = Query(None, description="Last UTC day, inclusive (default: today)"),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    """Cumulative flow of owned tasks: how many are todo, in progress and done at the end of each day."""
+    start, end = _flow_window(days, start, end)
+    try:
+        return TaskFlow(days=flow_service.get_flow(db, current_user.id, start, end))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/burndown", response_model=TaskBurndown, status_code=status.HTTP_200_OK)
+@cached(
+    expire=CACHE_TTL, stale_ttl=CACHE_STALE_TTL, namespace="analytics:burndown", key_builder=tagged_key_builder()
+)
+def get_task_burndown(
+    days: int = Query(30, description="Days back from end, used when start is omitted"),
+    start: Optional[date] = Query(None, description="First UTC day (YYYY-MM-DD)"),
+    end: Optional[date] = Query(None, description="Last UTC day, inclusive (default: today)"),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    """Burndown of owned tasks: open (todo + in progress) and done at the end of each day."""
+    start, end = _flow_window(days, start, end)
+    try:
+        return TaskBurndown(days=flow_service.get_burndown(db, current_user.id, start, end))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/cache/stats", status_code=status.HTTP_200_OK)
+def get_cache_stats(current_user=Depends(get_current_admin)):
+    """
+    Lookups served by the in-process tier, by Redis, and missed (this worker, since start),
+    and whether Redis is currently healthy.
+    """
+    backend = FastAPICache.get_backend()
+    stats = backend.stats() if isinstance(backend, (FailoverBackend, TwoTierBackend)) else {}
+    return {"backend": type(backend).__name__, **stats}
+
+
+@router.get("/cache/metrics", status_code=status.HTTP_200_OK)
+def get_cache_metrics(current_user=Depends(get_current_admin)):
+    """
+    Hits, stale hits, misses, sets, evictions, purges, value sizes and backend latency per cache
+    namespace and per route (this worker, since start), plus per-tier counts when two-tier.
+    """
+    backend = FastAPICache.get_backend()
+    tiers = backend.stats() if isinstance(backend, (FailoverBackend, TwoTierBackend)) else None
+    return {**cache_metrics.snapshot(), "tiers": tiers}
+
+
+@router.get("/cache/keys", status_code=status.HTTP_200_OK)
+async def inspect_cache_keys(
+    namespace: Optional[str] = Query(None, description="Only keys of this namespace, e.g. analytics:summary"),
+    user_id: Optional[int] = Query(None, description="Only keys of this user"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of keys to return"),
+    current_user=Depends(get_current_admin)
+):
+    """Admin: cached entries with namespace, remaining TTL and size."""
+    keys = await find_keys(key_pattern(namespace, user_id), limit)
+    return {"keys": await describe_keys(keys)}
+
+
+@router.delete("/cache/keys", status_code=status.HTTP_200_OK)
+async def purge_cache_keys(
+    namespace: Optional[str] = Query(None, description="Purge keys of this namespace"),
+    user_id: Optional[int] = Query(None, description="Purge keys of this user"),
+    current_user=Depends(get_current_admin)
+):
+    """Admin: delete cached entries of a namespace and/or user from every tier."""
+    if namespace is None and user_id is None:
+        raise HTTPException(status_code=400, detail="namespace or user_id is required")
+    return {"purged": await purge_keys(namespace, user_id)}
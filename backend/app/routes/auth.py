@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.database import get_db
 from app.models.user import User
 from app.schemas.user import Token, UserCreate, UserLogin
+from app.services.cache_warmer import warm_user_caches
 from app.utils.auth import create_access_token, hash_password, verify_password, get_current_user
 
 
@@ -60,9 +62,13 @@ def register_user(
 @router.post("/login", status_code=status.HTTP_200_OK)
 def login(
     login_data: UserLogin,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
-    """Authenticate user and return JWT access token. Returns 200 on success, 401 on failure."""
+    """
+    Authenticate user and return JWT access token. Returns 200 on success, 401 on failure.
+    After the response, the user's dashboard analytics are computed into the cache.
+    """
     user = db.query(User).filter(User.email == login_data.email).first()
 
     if not user or not verify_password(login_data.password, user.hashed_password):
@@ -73,6 +79,8 @@ def login(
         )
 
     access_token = create_access_token(data={"sub": str(user.id)})
+    if settings.CACHE_WARM_ON_LOGIN:
+        background_tasks.add_task(warm_user_caches, db.get_bind(), user.id)
 
     return {
         "access_token": access_token,
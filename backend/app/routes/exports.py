@@ -4,11 +4,12 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, Query, status, HTTPException
 from fastapi.responses import StreamingResponse
+from sqlalchemy import false, select
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.models.task import Task
-from app.services import export_service
+from app.models.task import TASK_PRIORITIES, Task
+from app.services import archive_service, export_service, task_service
 from app.utils.auth import get_current_user
 
 logger = logging.getLogger(__name__)
@@ -21,46 +22,62 @@ def export_tasks(
     format: Optional[str] = Query(None),
     completed: Optional[bool] = Query(None),
     priority: Optional[str] = Query(None),
-    limit: int = Query(1000, ge=1, le=10000),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of tasks (default: all)"),
     offset: int = Query(0, ge=0),
+    scope: str = Query("owned", description="Which tasks to export: owned, assigned (to me) or all (either)"),
+    include_archived: bool = Query(False, description="Also export tasks moved to the archive"),
+    compact: bool = Query(False, description="JSON without indentation or spaces"),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user)
 ):
-    """Export user's tasks as CSV or JSON."""
+    """
+    Export user's tasks as CSV, JSON or NDJSON (one task per line). Rows are read from a
+    server-side cursor and streamed as they are encoded, so exports of any size use constant memory.
+    """
     if format is None or format == "":
-        raise HTTPException(status_code=400, detail="Format is required (csv or json)")
-    if format not in ["csv", "json"]:
-        raise HTTPException(status_code=400, detail="Format must be 'csv' or 'json'")
-    
-    # Build query
-    query = db.query(Task).filter(
-        Task.owner_id == current_user.id,
-        Task.is_deleted == False
-    )
-    
-    # Single source of truth: filter by status, not completed
-    if completed is not None:
-        if completed:
-            query = query.filter(Task.status == "done")
-        else:
-            query = query.filter(Task.status != "done")
-    
-    if priority:
-        query = query.filter(Task.priority == priority)
-    
-    tasks = query.order_by(Task.created_at.asc()).offset(offset).limit(limit).all()
+        raise HTTPException(status_code=400, detail="Format is required (csv, json or ndjson)")
+    if format not in ["csv", "json", "ndjson"]:
+        raise HTTPException(status_code=400, detail="Format must be 'csv', 'json' or 'ndjson'")
+
+    def filters_for(model):
+        conditions = [task_service.scope_filter(scope, current_user.id, model), model.is_deleted == False]
+        # Single source of truth: filter by status, not completed
+        if completed is not None:
+            conditions.append(model.status == "done" if completed else model.status != "done")
+        if priority:
+            conditions.append(model.priority == priority if priority in TASK_PRIORITIES else false())
+        return conditions
+
+    try:
+        conditions = filters_for(Task)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
+    if include_archived:
+        combined = archive_service.select_with_archived(filters_for)
+        stmt = select(*[combined.c[c] for c in export_service.EXPORT_COLUMNS]).order_by(combined.c.created_at.asc())
+    else:
+        stmt = select(*[getattr(Task, c) for c in export_service.EXPORT_COLUMNS]).where(
+            *conditions
+        ).order_by(Task.created_at.asc())
+    stmt = stmt.offset(offset).limit(limit)
+    chunks = export_service.stream_rows(db.get_bind(), stmt)
+
     if format == "csv":
-        csv_content = export_service.export_tasks_csv(tasks)
         return StreamingResponse(
-            iter([csv_content]),
+            export_service.stream_tasks_csv(chunks),
             media_type="text/csv",
             headers={"Content-Disposition": "attachment; filename=tasks_export.csv"}
         )
+    elif format == "ndjson":
+        return StreamingResponse(
+            export_service.stream_tasks_ndjson(chunks),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": "attachment; filename=tasks_export.ndjson"}
+        )
     else:  # json
-        json_content = export_service.export_tasks_json(tasks)
         return StreamingResponse(
-            iter([json_content]),
+            export_service.stream_tasks_json(chunks, compact),
             media_type="application/json",
             headers={"Content-Disposition": "attachment; filename=tasks_export.json"}
         )
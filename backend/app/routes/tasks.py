@@ -4,13 +4,15 @@ import logging
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, status, BackgroundTasks
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.database import get_db
+from app.models.archive import ArchivedTask
 from app.models.task import Task
 from app.models.user import User
-from app.schemas.task import TaskCreate, TaskResponse, TaskUpdate, BulkTaskCreate, BulkTaskResponse, _normalize_status as normalize_status
-from app.services import task_service
+from app.schemas.task import TaskCreate, TaskResponse, TaskUpdate, BulkTaskCreate, BulkTaskResponse, TaskChangesResponse, _normalize_status as normalize_status
+from app.services import archive_service, task_service
 from app.services.background_jobs import send_task_assigned_email, send_task_completed_email
 from app.services.websocket_manager import manager
 from app.utils.auth import get_current_user
@@ -29,6 +31,8 @@ def run_async(coro):
 
 router = APIRouter(prefix="/api/v1/tasks", tags=["Tasks"], redirect_slashes=False)
 
+SORT_FIELDS = ("created_at", "updated_at", "due_date", "priority", "title")
+
 
 @router.post(
     "/bulk",
@@ -142,25 +146,35 @@ def list_tasks(
         "created_at", description="Sort field: created_at, updated_at, due_date, priority, title"
     ),
     sort_order: Optional[str] = Query("desc", description="Sort order: asc or desc"),
+    scope: str = Query(
+        "owned", description="Which tasks to list: owned, assigned (to me) or all (either)"
+    ),
+    include_archived: bool = Query(False, description="Also include tasks moved to the archive"),
 ):
     """Retrieve tasks for the authenticated user with optional filtering, search, sorting and pagination."""
-    logger.info("GET /tasks params: status=%r priority=%r", status, priority)
-
-    query = db.query(Task).filter(Task.owner_id == current_user.id, Task.is_deleted == False)
-
-    if q and q.strip():
-        from sqlalchemy import or_
-        term = f"%{q.strip()}%"
-        query = query.filter(or_(Task.title.ilike(term), Task.description.ilike(term)))
-    if priority and priority.strip():
-        query = query.filter(Task.priority == priority.strip().lower())
-    if status and status.strip():
-        status_val = normalize_status(status.strip())
-        if status_val in ("todo", "in_progress", "done"):
-            query = query.filter(Task.status == status_val)
-
-    sort_columns = {"created_at": Task.created_at, "updated_at": Task.updated_at, "due_date": Task.due_date, "priority": Task.priority, "title": Task.title}
-    sort_col = sort_columns.get(sort_by, Task.created_at)
+    logger.info("GET /tasks params: status=%r priority=%r scope=%r", status, priority, scope)
+
+    def filters_for(model):
+        return task_service.task_list_filters(model, current_user.id, scope, q, priority, status)
+
+    try:
+        conditions = filters_for(Task)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if sort_by not in SORT_FIELDS:
+        sort_by = "created_at"
+
+    if include_archived:
+        combined = archive_service.select_with_archived(filters_for)
+        sort_col = combined.c[sort_by]
+        order = sort_col.asc() if sort_order == "asc" else sort_col.desc()
+        rows = db.execute(select(combined).order_by(order).offset(offset).limit(limit)).mappings().all()
+        return [dict(row) for row in rows]
+
+    query = db.query(Task).filter(*conditions)
+
+    sort_col = getattr(Task, sort_by)
     if sort_order == "asc":
         query = query.order_by(sort_col.asc())
     else:
@@ -170,6 +184,32 @@ def list_tasks(
     return tasks
 
 
+@router.get(
+    "/changes",
+    response_model=TaskChangesResponse,
+    status_code=status.HTTP_200_OK,
+)
+def get_task_changes(
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+    since: Optional[str] = Query(None, description="Cursor from a previous sync; omit for a full sync"),
+    limit: int = Query(100, ge=1, le=500, description="Maximum number of changes to return"),
+):
+    """
+    Delta sync: tasks created, updated, deleted, archived or purged since `since`. Returns a new
+    cursor to resume from. 410 if the client last caught up more than GC_RETENTION_DAYS ago:
+    sync again without it.
+    """
+    try:
+        updated, deleted, cursor, has_more = task_service.get_task_changes(db, current_user.id, since, limit)
+    except task_service.ChangeCursorExpired as e:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return TaskChangesResponse(updated=updated, deleted=deleted, cursor=cursor, has_more=has_more)
+
+
 @router.get(
     "/{task_id}",
     response_model=TaskResponse,
@@ -179,13 +219,18 @@ def get_task(
     task_id: int,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
+    include_archived: bool = Query(False, description="Also look the task up in the archive"),
 ):
-    """Retrieve a single task by id. Returns 404 if missing, 403 if not owned by user."""
+    """Retrieve a single task by id. Returns 404 if missing, 403 if neither owned by nor assigned to user."""
     task = db.query(Task).filter(Task.id == task_id, Task.is_deleted == False).first()
+    if task is None and include_archived:
+        task = db.query(ArchivedTask).filter(
+            ArchivedTask.id == task_id, ArchivedTask.is_deleted == False
+        ).first()
     if task is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
 
-    if task.owner_id != current_user.id:
+    if current_user.id not in (task.owner_id, task.assigned_to):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view this task")
 
     return task
@@ -25,13 +25,67 @@ class UserPerformance(BaseModel):
 
 
 class DailyTrend(BaseModel):
-    """Daily trend data (one per day; date as YYYY-MM-DD)."""
+    """Trend data for one bucket (a day by default; date as YYYY-MM-DD, start with UTC offset)."""
     date: date
+    start: Optional[datetime] = None
     tasks_created: int
     tasks_completed: int
+    tasks_deleted: int = 0
+    tasks_due_open: int = 0  # not-done tasks due that day (overdue once the day has passed)
 
 
 class TaskTrends(BaseModel):
     """Trend data for tasks."""
     daily_trends: List[DailyTrend]
+    granularity: str = "day"
+    tz: str = "UTC"
+    generated_at: Optional[datetime] = None  # when the numbers were computed (UTC)
 
+
+
+class HistogramBucket(BaseModel):
+    """Completed tasks whose time-to-complete falls in [min_hours, max_hours)."""
+    min_hours: float
+    max_hours: Optional[float] = None  # None for the open-ended last bucket
+    count: int
+
+
+class CompletionTimeStats(BaseModel):
+    """Time-to-complete distribution for one user, priority or tag."""
+    group: str
+    count: int
+    p50_hours: Optional[float] = None
+    p90_hours: Optional[float] = None
+    p99_hours: Optional[float] = None
+    histogram: List[HistogramBucket]
+
+
+class CompletionTimeDistribution(BaseModel):
+    """Completion-time percentiles and histograms grouped by user, priority or tag."""
+    group_by: str
+    groups: List[CompletionTimeStats]
+
+
+class FlowDay(BaseModel):
+    """Tasks in each status at the end of one UTC day (one column of a cumulative flow chart)."""
+    date: date
+    todo: int
+    in_progress: int
+    done: int
+
+
+class TaskFlow(BaseModel):
+    """Cumulative flow: tasks per status per day."""
+    days: List[FlowDay]
+
+
+class BurndownDay(BaseModel):
+    """Open (todo + in progress) and done tasks at the end of one UTC day."""
+    date: date
+    remaining: int
+    completed: int
+
+
+class TaskBurndown(BaseModel):
+    """Burndown: open and done tasks per day."""
+    days: List[BurndownDay]
@@ -4,11 +4,13 @@ from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, field_validator
 
+from app.models.task import TASK_PRIORITIES, TASK_STATUSES
 from app.utils.sanitize import sanitize_text
 
 
-ALLOWED_PRIORITIES = {"low", "medium", "high"}
-ALLOWED_STATUSES = {"todo", "in_progress", "done"}
+# Stored as small-integer codes (see app.models.task.CodedString); the API speaks strings
+ALLOWED_PRIORITIES = set(TASK_PRIORITIES)
+ALLOWED_STATUSES = set(TASK_STATUSES)
 
 
 def _normalize_status(value: str) -> str:
@@ -105,6 +107,7 @@ class TaskResponse(BaseModel):
     completed_at: Optional[datetime] = None
     owner_id: int
     assigned_to: Optional[int] = None
+    archived: bool = False
 
     @field_validator("tags", mode="before")
     @classmethod
@@ -123,6 +126,14 @@ class TaskResponse(BaseModel):
         return None
 
 
+class TaskChangesResponse(BaseModel):
+    """Schema for delta sync: tasks changed since a cursor, plus the cursor to resume from."""
+    updated: List[TaskResponse]
+    deleted: List[int]
+    cursor: str
+    has_more: bool
+
+
 class BulkTaskResponse(BaseModel):
     """Schema for bulk task creation response."""
     created: int
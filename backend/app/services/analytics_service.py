@@ -1,189 +1,536 @@
 """Analytics service for reporting."""
 import logging
 from collections import defaultdict
-from datetime import date, datetime, timedelta
-from typing import List
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from sqlalchemy import func, or_, and_
+from sqlalchemy import JSON, Date, and_, case, cast, func, literal, select, true, union_all
 from sqlalchemy.orm import Session
 
-from app.models.task import Task
+from app.models.stats import TaskCounters, TaskDailyStats
+from app.models.task import TASK_PRIORITIES, TASK_STATUSES, Task
 from app.models.user import User
-from app.schemas.analytics import TaskSummary, UserPerformance, DailyTrend
+from app.schemas.analytics import (
+    CompletionTimeDistribution,
+    CompletionTimeStats,
+    DailyTrend,
+    HistogramBucket,
+    TaskSummary,
+    UserPerformance,
+)
+from app.services.task_service import scope_filter, tag_filter
 
 
-def generate_date_range(start: date, end: date):
-    current = start
-    while current <= end:
-        yield current
-        current += timedelta(days=1)
-
 logger = logging.getLogger(__name__)
 
 
-def get_task_summary(db: Session, user_id: int) -> TaskSummary:
-    """Get task summary for a user."""
-    # Total tasks
-    total = db.query(func.count(Task.id)).filter(
-        Task.owner_id == user_id,
-        Task.is_deleted == False
-    ).scalar() or 0
+def count_where(condition):
+    """Conditional count for one-pass aggregation: SUM(CASE WHEN condition THEN 1 ELSE 0 END)."""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
 
-    # Completed tasks
-    completed = db.query(func.count(Task.id)).filter(
-        Task.owner_id == user_id,
-        Task.is_deleted == False,
-        Task.status == "done"
-    ).scalar() or 0
 
-    # Pending tasks
-    pending = total - completed
+def get_task_summary(
+    db: Session,
+    user_id: int,
+    scope: str = "owned",
+    tag: Optional[str] = None,
+) -> TaskSummary:
+    """
+    Get task summary for a user's owned, assigned or all tasks (see task_service.TASK_SCOPES),
+    optionally limited to one tag. The default owned view reads the user's task_counters row;
+    other views take a single scan with conditional aggregates.
+    """
+    if scope == "owned" and not tag:
+        return _summary_from_counters(db, user_id)
+
+    conditions = [scope_filter(scope, user_id), Task.is_deleted == False]
+    if tag:
+        conditions.append(tag_filter(tag))
+    return _summary_from_scan(db, conditions)
+
+
+def _summary_from_scan(db: Session, conditions) -> TaskSummary:
+    """Summary of the tasks matching conditions, every count from one conditional-aggregate scan."""
+    is_done = Task.status == "done"
+    is_overdue = and_(Task.status != "done", Task.due_date != None, Task.due_date < datetime.utcnow())
+    columns = [
+        func.count(Task.id).label("total"),
+        count_where(is_done).label("completed"),
+        count_where(is_overdue).label("overdue"),
+    ]
+    columns += [count_where(Task.priority == p).label(f"priority_{p}") for p in TASK_PRIORITIES]
+    columns += [count_where(Task.status == s).label(f"status_{s}") for s in TASK_STATUSES]
+
+    row = db.query(*columns).filter(*conditions).one()
 
-    # Overdue tasks (not done and past due date)
-    overdue = db.query(func.count(Task.id)).filter(
-        Task.owner_id == user_id,
-        Task.is_deleted == False,
-        Task.status != "done",
-        Task.due_date != None,
-        Task.due_date < datetime.utcnow()
-    ).scalar() or 0
-    
-    # By priority (string: "low" | "medium" | "high")
-    priority_counts = db.query(
-        Task.priority,
-        func.count(Task.id)
-    ).filter(
-        Task.owner_id == user_id,
-        Task.is_deleted == False
-    ).group_by(Task.priority).all()
-    
-    by_priority = {"low": 0, "medium": 0, "high": 0}
-    for p, count in priority_counts:
-        if p in by_priority:
-            by_priority[p] = count
-
-    status_counts = db.query(
-        Task.status,
-        func.count(Task.id)
-    ).filter(
-        Task.owner_id == user_id,
-        Task.is_deleted == False
-    ).group_by(Task.status).all()
-
-    by_status = {"todo": 0, "in_progress": 0, "done": 0}
-    for s, count in status_counts:
-        if s in by_status:
-            by_status[s] = count
-    
     return TaskSummary(
-        total=total,
-        completed=completed,
-        pending=pending,
-        overdue=overdue,
-        by_priority=by_priority,
-        by_status=by_status
+        total=row.total,
+        completed=row.completed,
+        pending=row.total - row.completed,
+        overdue=row.overdue,
+        by_priority={p: getattr(row, f"priority_{p}") for p in TASK_PRIORITIES},
+        by_status={s: getattr(row, f"status_{s}") for s in TASK_STATUSES},
     )
 
 
-def get_user_performance(db: Session) -> List[UserPerformance]:
-    """Get performance metrics for all users."""
-    users = db.query(User).all()
-    performance_list = []
-    
-    for user in users:
-        # Tasks assigned
-        total_assigned = db.query(func.count(Task.id)).filter(
-            Task.owner_id == user.id,
-            Task.is_deleted == False
-        ).scalar() or 0
-        
-        # Tasks completed
-        completed = db.query(func.count(Task.id)).filter(
-            Task.owner_id == user.id,
-            Task.is_deleted == False,
-            Task.status == "done"
-        ).scalar() or 0
-        
-        # Completion rate
-        completion_rate = (completed / total_assigned * 100) if total_assigned > 0 else 0
-        
-        # Average completion time
-        completed_tasks = db.query(Task.completed_at, Task.created_at).filter(
-            Task.owner_id == user.id,
+def _summary_from_counters(db: Session, user_id: int) -> TaskSummary:
+    """Owned-task summary from one primary-key lookup; overdue is an index range count."""
+    counters = db.get(TaskCounters, user_id)
+    if counters is None:
+        # No row yet (no tasks written since counters existed, or not backfilled): count instead
+        # of reporting zeros, which would then be cached
+        return _summary_from_scan(db, [Task.owner_id == user_id, Task.is_deleted == False])
+
+    overdue = 0
+    if counters.due_open:
+        # Uses ix_tasks_owner_id_due_date: only this owner's already-due rows are visited
+        overdue = db.query(func.count(Task.id)).filter(
+            Task.owner_id == user_id,
+            Task.due_date < datetime.utcnow(),
             Task.is_deleted == False,
-            Task.status == "done",
-            Task.completed_at != None
-        ).all()
-        
-        avg_hours = None
-        if completed_tasks:
-            total_seconds = sum(
-                (task[0] - task[1]).total_seconds()
-                for task in completed_tasks
-            )
-            avg_hours = (total_seconds / len(completed_tasks)) / 3600
-        
-        performance_list.append(
-            UserPerformance(
-                user_id=user.id,
-                email=user.email,
-                tasks_assigned=total_assigned,
-                tasks_completed=completed,
-                completion_rate=round(completion_rate, 2),
-                avg_completion_time_hours=round(avg_hours, 2) if avg_hours else None
-            )
+            Task.status != "done",
+        ).scalar()
+
+    return TaskSummary(
+        total=counters.total,
+        completed=counters.status_done,
+        pending=counters.total - counters.status_done,
+        overdue=overdue,
+        by_priority={p: getattr(counters, f"priority_{p}") for p in TASK_PRIORITIES},
+        by_status={s: getattr(counters, f"status_{s}") for s in TASK_STATUSES},
+    )
+
+
+# Sort keys accepted by get_user_performance(order_by=...)
+PERFORMANCE_ORDER_FIELDS = ("user_id", "completion_rate", "tasks_completed", "tasks_assigned")
+
+
+def seconds_between(db: Session, start, end):
+    """SQL expression for (end - start) in seconds on the session's dialect."""
+    if db.get_bind().dialect.name == "postgresql":
+        return func.extract("epoch", end - start)
+    return (func.julianday(end) - func.julianday(start)) * 86400.0
+
+
+def get_user_performance(
+    db: Session,
+    limit: int = 100,
+    offset: int = 0,
+    order_by: str = "user_id",
+    sort_order: str = "asc",
+) -> List[UserPerformance]:
+    """Get performance metrics for all users in one grouped aggregate query (users without tasks included)."""
+    if order_by not in PERFORMANCE_ORDER_FIELDS:
+        raise ValueError(f"order_by must be one of: {', '.join(PERFORMANCE_ORDER_FIELDS)}")
+
+    is_done = Task.status == "done"
+    total_assigned = func.count(Task.id)
+    completed = count_where(is_done)
+    completion_rate = case(
+        (total_assigned > 0, completed * 100.0 / total_assigned),
+        else_=0.0,
+    )
+    # AVG ignores NULLs, so only done tasks with a completion time contribute
+    avg_seconds = func.avg(case(
+        (and_(is_done, Task.completed_at != None), seconds_between(db, Task.created_at, Task.completed_at)),
+        else_=None,
+    ))
+
+    sort_columns = {
+        "user_id": User.id,
+        "completion_rate": completion_rate,
+        "tasks_completed": completed,
+        "tasks_assigned": total_assigned,
+    }
+    sort_col = sort_columns[order_by]
+    order = sort_col.asc() if sort_order == "asc" else sort_col.desc()
+
+    rows = db.query(
+        User.id,
+        User.email,
+        total_assigned.label("tasks_assigned"),
+        completed.label("tasks_completed"),
+        completion_rate.label("completion_rate"),
+        avg_seconds.label("avg_seconds"),
+    ).outerjoin(
+        Task, and_(Task.owner_id == User.id, Task.is_deleted == False)
+    ).group_by(User.id, User.email).order_by(order, User.id.asc()).offset(offset).limit(limit).all()
+
+    return [
+        UserPerformance(
+            user_id=row.id,
+            email=row.email,
+            tasks_assigned=row.tasks_assigned,
+            tasks_completed=row.tasks_completed,
+            completion_rate=round(float(row.completion_rate), 2),
+            avg_completion_time_hours=round(float(row.avg_seconds) / 3600, 2) if row.avg_seconds else None,
         )
-    
-    return performance_list
+        for row in rows
+    ]
+
+
+# Groupings and buckets accepted by get_completion_time_distribution
+COMPLETION_GROUPS = ("user", "priority", "tag")
+COMPLETION_PERCENTILES = (0.5, 0.9, 0.99)
+HISTOGRAM_EDGES_HOURS = (1, 4, 24, 72, 168, 720)  # hour, half day, day, 3 days, week, month
+
+
+def _completion_group_key(db: Session, group_by: str):
+    """(group key expression, extra FROM item or None, extra conditions) for a completion grouping."""
+    if group_by == "user":
+        return Task.owner_id, None, []
+    if group_by == "priority":
+        return Task.priority, None, []
+    # One row per (task, tag): expand the JSON array string in SQL
+    if db.get_bind().dialect.name == "postgresql":
+        # Legacy comma-separated strings are not JSON, and one failed cast fails the whole
+        # query; inside the CASE they expand to nothing, however the planner orders things
+        json_tags = case((Task.tags.like("[%"), Task.tags), else_=literal("[]"))
+        tags = func.json_array_elements_text(cast(json_tags, JSON)).table_valued("value")
+        tags = tags.render_derived(name="tag")
+        return tags.c.value, tags, [Task.tags != None]
+    tags = func.json_each(Task.tags).table_valued("value").alias("tag")
+    return tags.c.value, tags, [Task.tags != None, func.json_valid(Task.tags) == 1]
 
 
-def get_task_trends(db: Session, days: int = 30) -> List[DailyTrend]:
-    """Get daily task creation and completion trends (one entry per day, zeros included)."""
-    # Use UTC so range is consistent regardless of server timezone
-    end_date = datetime.utcnow().date()
-    start_date = end_date - timedelta(days=days - 1)  # Include today
+def _stream_percentiles(db: Session, select_from, key, seconds, conditions, counts: dict) -> dict:
+    """
+    {group: [p50, p90, p99]} by linear interpolation (same as percentile_cont), from one
+    scan ordered by (group, seconds). Knowing each group's count up front, only the two
+    ranks around each percentile are kept, so memory stays O(groups) however many tasks.
+    """
+    wanted = {}
+    for group, n in counts.items():
+        positions = [(n - 1) * p for p in COMPLETION_PERCENTILES]
+        wanted[group] = (positions, {rank for h in positions for rank in (int(h), min(int(h) + 1, n - 1))})
 
-    start_dt = datetime.combine(start_date, datetime.min.time())
-    end_dt = datetime.combine(end_date, datetime.min.time())
+    stmt = select(key, seconds).select_from(select_from).where(*conditions).order_by(key, seconds)
+    values = defaultdict(dict)
+    current, rank = None, 0
+    for group, value in db.execute(stmt.execution_options(yield_per=5000)):
+        if group != current:
+            current, rank = group, 0
+        if group in wanted and rank in wanted[group][1]:
+            values[group][rank] = float(value)
+        rank += 1
 
-    # Fetch tasks that were either created in range OR completed in range
-    # (so we count completions for tasks created before the range)
-    tasks = db.query(Task).filter(
+    result = {}
+    for group, (positions, _) in wanted.items():
+        at = values[group]
+        result[group] = [
+            at[int(h)] + (at[min(int(h) + 1, counts[group] - 1)] - at[int(h)]) * (h - int(h))
+            for h in positions
+        ]
+    return result
+
+
+def get_completion_time_distribution(
+    db: Session,
+    group_by: str = "user",
+    limit: int = 100,
+    offset: int = 0,
+) -> CompletionTimeDistribution:
+    """
+    p50/p90/p99 time-to-complete (created_at to completed_at) and a histogram over
+    HISTOGRAM_EDGES_HOURS for done, non-deleted tasks, grouped by owner, priority or tag.
+    Histograms are conditional counts in SQL; percentiles use percentile_cont on Postgres
+    and an ordered streaming scan elsewhere. No ORM objects are loaded.
+    """
+    if group_by not in COMPLETION_GROUPS:
+        raise ValueError(f"group_by must be one of: {', '.join(COMPLETION_GROUPS)}")
+
+    key, extra_from, extra_conditions = _completion_group_key(db, group_by)
+    seconds = seconds_between(db, Task.created_at, Task.completed_at)
+    conditions = [
         Task.is_deleted == False,
-        or_(
-            and_(
-                Task.created_at >= start_dt,
-                Task.created_at < end_dt + timedelta(days=1),
-            ),
-            and_(
-                Task.completed_at.isnot(None),
-                Task.completed_at >= start_dt,
-                Task.completed_at < end_dt + timedelta(days=1),
-            ),
-        ),
+        Task.status == "done",
+        Task.completed_at != None,
+        *extra_conditions,
+    ]
+    select_from = Task.__table__ if extra_from is None else Task.__table__.join(extra_from, true())
+
+    edges = [0] + [h * 3600 for h in HISTOGRAM_EDGES_HOURS] + [None]
+    bucket_columns = [
+        count_where(seconds >= low if high is None else and_(seconds >= low, seconds < high))
+        for low, high in zip(edges, edges[1:])
+    ]
+    is_postgres = db.get_bind().dialect.name == "postgresql"
+    percentile_columns = [
+        func.percentile_cont(p).within_group(seconds) for p in COMPLETION_PERCENTILES
+    ] if is_postgres else []
+
+    rows = db.execute(
+        select(key, func.count(), *bucket_columns, *percentile_columns)
+        .select_from(select_from)
+        .where(*conditions)
+        .group_by(key)
+        .order_by(key)
+        .offset(offset)
+        .limit(limit)
     ).all()
 
-    # Aggregate by date (use .date() for timezone-naive UTC dates)
-    created_map = defaultdict(int)
-    completed_map = defaultdict(int)
-
-    for task in tasks:
-        created_day = task.created_at.date()
-        if start_date <= created_day <= end_date:
-            created_map[created_day] += 1
-        if task.completed_at:
-            completed_day = task.completed_at.date()
-            if start_date <= completed_day <= end_date:
-                completed_map[completed_day] += 1
-
-    # Build continuous series: one entry per day, including zeros
-    trends = []
-    for day in generate_date_range(start_date, end_date):
-        trends.append(
-            DailyTrend(
-                date=day,
-                tasks_created=created_map.get(day, 0),
-                tasks_completed=completed_map.get(day, 0),
-            )
+    n_buckets = len(bucket_columns)
+    if is_postgres:
+        percentiles = {row[0]: row[2 + n_buckets:] for row in rows}
+    elif rows:
+        page_keys = [row[0] for row in rows]
+        percentiles = _stream_percentiles(
+            db, select_from, key, seconds, [*conditions, key.in_(page_keys)], {row[0]: row[1] for row in rows}
+        )
+    else:
+        percentiles = {}
+
+    def hours(value):
+        return round(max(float(value), 0.0) / 3600, 2) if value is not None else None
+
+    groups = []
+    for row in rows:
+        group, count = row[0], row[1]
+        p50, p90, p99 = percentiles.get(group, (None, None, None))
+        groups.append(CompletionTimeStats(
+            group=str(group),
+            count=count,
+            p50_hours=hours(p50),
+            p90_hours=hours(p90),
+            p99_hours=hours(p99),
+            histogram=[
+                HistogramBucket(
+                    min_hours=(low or 0) / 3600,
+                    max_hours=high / 3600 if high is not None else None,
+                    count=row[2 + i],
+                )
+                for i, (low, high) in enumerate(zip(edges, edges[1:]))
+            ],
+        ))
+    return CompletionTimeDistribution(group_by=group_by, groups=groups)
+
+
+def day_bucket(db: Session, column):
+    """SQL expression truncating a timestamp column to its UTC calendar day."""
+    if db.get_bind().dialect.name == "postgresql":
+        return cast(column, Date)
+    return func.date(column)
+
+
+def _as_date(value) -> date:
+    """Normalize a day bucket from the driver (date, datetime or 'YYYY-MM-DD') to a date."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+# Bucket sizes accepted by get_task_trends(granularity=...)
+TREND_GRANULARITIES = ("hour", "day", "week", "month")
+MAX_TREND_BUCKETS = 10000
+# Series reported per bucket: (DailyTrend field, rollup column)
+TREND_SERIES = (
+    ("tasks_created", "created"),
+    ("tasks_completed", "completed"),
+    ("tasks_deleted", "deleted"),
+    ("tasks_due_open", "overdue"),
+)
+_SQLITE_BUCKET_FORMATS = {"hour": "%Y-%m-%d %H:00:00", "day": "%Y-%m-%d", "month": "%Y-%m-01"}
+
+
+def _floor_bucket(value: datetime, granularity: str) -> datetime:
+    """Start of the bucket containing a (naive, local) datetime; weeks start on Monday."""
+    if granularity == "hour":
+        return value.replace(minute=0, second=0, microsecond=0)
+    day = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _next_bucket(value: datetime, granularity: str) -> datetime:
+    if granularity == "hour":
+        return value + timedelta(hours=1)
+    if granularity == "week":
+        return value + timedelta(weeks=1)
+    if granularity == "month":
+        return value.replace(year=value.year + value.month // 12, month=value.month % 12 + 1)
+    return value + timedelta(days=1)
+
+
+def _to_utc(local: datetime, zone: ZoneInfo) -> datetime:
+    """Naive local time in zone -> naive UTC (how timestamps are stored)."""
+    return local.replace(tzinfo=zone).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _utc_offset_segments(zone: ZoneInfo, start_utc: datetime, end_utc: datetime) -> List[tuple]:
+    """[(segment end in UTC or None for the last one, UTC offset in seconds)] covering the range."""
+    def offset(at: datetime) -> int:
+        return int(at.replace(tzinfo=timezone.utc).astimezone(zone).utcoffset().total_seconds())
+
+    segments = []
+    current = offset(start_utc)
+    probe = start_utc
+    while probe < end_utc:
+        step = min(probe + timedelta(days=1), end_utc)
+        if offset(step) != current:
+            # Bisect the day down to the second the offset changes (DST transition)
+            low, high = probe, step
+            while high - low > timedelta(seconds=1):
+                mid = low + (high - low) / 2
+                low, high = (mid, high) if offset(mid) == current else (low, mid)
+            segments.append((high, current))
+            current = offset(high)
+        probe = step
+    segments.append((None, current))
+    return segments
+
+
+def trend_bucket(db: Session, column, granularity: str, tz: str, start_utc: datetime, end_utc: datetime):
+    """
+    SQL expression for the local-time bucket start of a UTC timestamp column. Postgres converts
+    with the IANA zone directly; SQLite shifts by the zone's UTC offset for each DST segment.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return func.date_trunc(granularity, func.timezone(tz, func.timezone("UTC", column)))
+    segments = _utc_offset_segments(ZoneInfo(tz), start_utc, end_utc)
+    shift = literal(f"{segments[-1][1]:+d} seconds")
+    if len(segments) > 1:
+        shift = case(
+            *[(column < until, f"{seconds:+d} seconds") for until, seconds in segments[:-1]],
+            else_=shift,
+        )
+    if granularity == "week":
+        return func.datetime(column, shift, "start of day", "-6 days", "weekday 1")
+    return func.strftime(_SQLITE_BUCKET_FORMATS[granularity], column, shift)
+
+
+def _rollup_bucket(db: Session, granularity: str):
+    """Bucket expression over task_daily_stats.day for day/week/month in UTC."""
+    if granularity == "day":
+        return TaskDailyStats.day
+    if db.get_bind().dialect.name == "postgresql":
+        return func.date_trunc(granularity, TaskDailyStats.day)
+    if granularity == "week":
+        return func.date(TaskDailyStats.day, "-6 days", "weekday 1")
+    return func.strftime(_SQLITE_BUCKET_FORMATS["month"], TaskDailyStats.day)
+
+
+def _as_datetime(value) -> datetime:
+    """Normalize a bucket from the driver (datetime, date or ISO string) to a naive datetime."""
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time())
+    return datetime.fromisoformat(str(value))
+
+
+def _trend_counts_from_rollup(db: Session, user_id: Optional[int], granularity: str,
+                              start_local: datetime, end_local: datetime) -> dict:
+    """{bucket: (created, completed, deleted, due_open)} summed from task_daily_stats."""
+    bucket = _rollup_bucket(db, granularity)
+    conditions = [TaskDailyStats.day >= start_local.date(), TaskDailyStats.day < end_local.date()]
+    if user_id is not None:
+        conditions.append(TaskDailyStats.owner_id == user_id)
+    rows = db.query(
+        bucket, *[func.sum(getattr(TaskDailyStats, column)) for _, column in TREND_SERIES]
+    ).filter(*conditions).group_by(bucket).all()
+    return {_as_datetime(row[0]): tuple(n or 0 for n in row[1:]) for row in rows}
+
+
+def _trend_counts_from_tasks(db: Session, filters_for, granularity: str, tz: str,
+                             start_utc: datetime, end_utc: datetime) -> dict:
+    """
+    {bucket: (created, completed, deleted, due_open)} from one UNION ALL of grouped scans of live
+    and archived tasks (each side filtered by filters_for(model)), like the rollup counts them.
+    """
+    from app.services.archive_service import select_with_archived  # archive_service imports this module
+
+    tasks = select_with_archived(filters_for).c
+    series = [
+        (tasks.created_at, [tasks.is_deleted == False]),
+        (tasks.completed_at, [tasks.is_deleted == False]),
+        (tasks.updated_at, [tasks.is_deleted == True]),
+        (tasks.due_date, [tasks.is_deleted == False, tasks.status != "done"]),
+    ]
+    selects = []
+    for index, (column, series_conditions) in enumerate(series):
+        bucket = trend_bucket(db, column, granularity, tz, start_utc, end_utc)
+        selects.append(
+            select(bucket.label("bucket"), literal(index).label("series"), func.count().label("n"))
+            .where(*series_conditions, column >= start_utc, column < end_utc)
+            .group_by(bucket)
+        )
+    counts = defaultdict(lambda: [0] * len(series))
+    for bucket, index, n in db.execute(union_all(*selects)):
+        counts[_as_datetime(bucket)][index] += n
+    return {bucket: tuple(values) for bucket, values in counts.items()}
+
+
+def get_task_trends(
+    db: Session,
+    days: int = 30,
+    user_id: Optional[int] = None,
+    scope: str = "owned",
+    granularity: str = "day",
+    tz: str = "UTC",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> List[DailyTrend]:
+    """
+    Task creation, completion, deletion and due counts per hour, day, week or month in the
+    IANA zone tz, one entry per bucket with zeros included. The range is start..end (naive
+    values are local to tz; end defaults to now), or the last `days` days when start is omitted.
+    Counts cover one user's tasks (see task_service.TASK_SCOPES), or everyone's when user_id is None.
+
+    Bucketing happens in the database. UTC day/week/month trends of owned tasks read the
+    task_daily_stats rollup; other combinations take one grouped scan of live and archived tasks.
+    """
+    if granularity not in TREND_GRANULARITIES:
+        raise ValueError(f"granularity must be one of: {', '.join(TREND_GRANULARITIES)}")
+    try:
+        zone = ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown time zone: {tz}")
+
+    def local(value: datetime) -> datetime:
+        if value.tzinfo is not None:
+            return value.astimezone(zone).replace(tzinfo=None)
+        return value
+
+    end_local = local(end) if end else datetime.now(zone).replace(tzinfo=None)
+    if start:
+        start_local = local(start)
+    else:
+        start_local = _floor_bucket(end_local, "day") - timedelta(days=days - 1)  # Include today
+    if start_local > end_local:
+        raise ValueError("start must not be after end")
+
+    # Continuous series: every bucket from the one holding start to the one holding end
+    buckets = []
+    bucket = _floor_bucket(start_local, granularity)
+    while bucket <= end_local:
+        buckets.append(bucket)
+        if len(buckets) > MAX_TREND_BUCKETS:
+            raise ValueError(f"Range spans more than {MAX_TREND_BUCKETS} {granularity} buckets")
+        bucket = _next_bucket(bucket, granularity)
+    range_start, range_end = buckets[0], bucket
+
+    if tz == "UTC" and granularity != "hour" and (user_id is None or scope == "owned"):
+        counts = _trend_counts_from_rollup(db, user_id, granularity, range_start, range_end)
+    else:
+        def filters_for(model):
+            return [scope_filter(scope, user_id, model)] if user_id is not None else []
+
+        counts = _trend_counts_from_tasks(
+            db, filters_for, granularity, tz, _to_utc(range_start, zone), _to_utc(range_end, zone)
+        )
+
+    zero = (0,) * len(TREND_SERIES)
+    return [
+        DailyTrend(
+            date=bucket.date(),
+            start=bucket.replace(tzinfo=zone),
+            **{field: n for (field, _), n in zip(TREND_SERIES, counts.get(bucket, zero))},
         )
-    return trends
+        for bucket in buckets
+    ]
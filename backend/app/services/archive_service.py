@@ -0,0 +1,120 @@
+"""Archive service: moves old done and soft-deleted tasks (with comments and files) to cold storage."""
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+
+from sqlalchemy import and_, insert, literal, or_, select, union_all
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.archive import ArchivedComment, ArchivedFile, ArchivedTask
+from app.models.comment import Comment
+from app.models.file import File
+from app.models.task import Task
+from app.services.stats_service import remove_from_counters
+from app.services.task_service import record_tombstones
+from app.utils.cache import mark_users_stale
+
+logger = logging.getLogger(__name__)
+
+# Columns shared by Task and ArchivedTask (archive rows keep their original id)
+TASK_COLUMNS = [
+    "id", "title", "description", "completed", "is_deleted", "priority", "status",
+    "due_date", "tags", "created_at", "updated_at", "completed_at", "owner_id", "assigned_to",
+]
+COMMENT_COLUMNS = ["id", "content", "task_id", "user_id", "is_deleted", "created_at", "updated_at"]
+FILE_COLUMNS = [
+    "id", "filename", "filepath", "size", "content_type", "task_id", "uploaded_by",
+    "is_deleted", "created_at",
+]
+
+
+def archivable_task_ids(db: Session, cutoff: datetime, limit: int) -> List[int]:
+    """Ids of tasks completed, or soft-deleted and untouched, before cutoff (oldest ids first)."""
+    rows = db.query(Task.id).filter(
+        or_(
+            and_(Task.is_deleted == True, Task.updated_at < cutoff),
+            and_(Task.status == "done", Task.completed_at != None, Task.completed_at < cutoff),
+        )
+    ).order_by(Task.id.asc()).limit(limit).all()
+    return [row[0] for row in rows]
+
+
+def _copy_rows(db: Session, source, target, columns: List[str], condition, extra=None) -> None:
+    """INSERT INTO target SELECT columns FROM source WHERE condition (server-side copy)."""
+    source_cols = [getattr(source, c) for c in columns]
+    target_cols = list(columns)
+    if extra:
+        for name, value in extra.items():
+            source_cols.append(literal(value))
+            target_cols.append(name)
+    db.execute(insert(target).from_select(target_cols, select(*source_cols).where(condition)))
+
+
+def move_tasks_to_archive(db: Session, task_ids: List[int]) -> None:
+    """Copy tasks and their comments/files to the archive tables, then delete the live rows. Caller commits."""
+    now = datetime.utcnow()
+    _copy_rows(db, Task, ArchivedTask, TASK_COLUMNS, Task.id.in_(task_ids), extra={"archived_at": now})
+    _copy_rows(db, Comment, ArchivedComment, COMMENT_COLUMNS, Comment.task_id.in_(task_ids))
+    _copy_rows(db, File, ArchivedFile, FILE_COLUMNS, File.task_id.in_(task_ids))
+
+    # Live counters only cover the tasks table; the daily rollup keeps archived history
+    remove_from_counters(db, Task.id.in_(task_ids))
+    # Delta sync reports archived tasks as deleted: they left the live set
+    record_tombstones(db, task_ids)
+    mark_users_stale(db, {
+        user_id for row in db.query(Task.owner_id, Task.assigned_to).filter(Task.id.in_(task_ids))
+        for user_id in row
+    })
+    db.query(Comment).filter(Comment.task_id.in_(task_ids)).delete(synchronize_session=False)
+    db.query(File).filter(File.task_id.in_(task_ids)).delete(synchronize_session=False)
+    db.query(Task).filter(Task.id.in_(task_ids)).delete(synchronize_session=False)
+
+
+def archive_tasks(
+    db: Session,
+    older_than_days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None,
+) -> int:
+    """
+    Move archivable tasks to cold storage in batches, committing after each batch so
+    locks stay short. Returns the number of tasks archived.
+    """
+    older_than_days = settings.ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+
+    archived = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        task_ids = archivable_task_ids(db, cutoff, batch_size)
+        if not task_ids:
+            break
+        try:
+            move_tasks_to_archive(db, task_ids)
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.error("Archiving batch of %s tasks failed", len(task_ids), exc_info=True)
+            raise
+        archived += len(task_ids)
+        batches += 1
+        logger.info("Archived batch of %s tasks (total %s)", len(task_ids), archived)
+
+    logger.info("Archived %s tasks older than %s days", archived, older_than_days)
+    return archived
+
+
+def select_with_archived(filters_for: Callable):
+    """
+    UNION ALL of live and archived task rows, each side filtered by filters_for(model).
+    Returns a subquery with TASK_COLUMNS plus a boolean `archived` column.
+    """
+    live = select(
+        *[getattr(Task, c) for c in TASK_COLUMNS], literal(False).label("archived")
+    ).where(*filters_for(Task))
+    cold = select(
+        *[getattr(ArchivedTask, c) for c in TASK_COLUMNS], literal(True).label("archived")
+    ).where(*filters_for(ArchivedTask))
+    return union_all(live, cold).subquery()
@@ -0,0 +1,93 @@
+"""
+Cache pre-warming: compute a user's dashboard analytics (the summary cache entry and the
+default trends snapshots) before they ask for it, after login or after a deploy or Redis
+flush, so the first dashboard load is a cache hit instead of a synchronous computation.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.concurrency import run_in_threadpool
+from fastapi_cache import FastAPICache
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.stats import TaskDailyStats
+from app.models.user import User
+from app.routes import analytics
+from app.services import snapshot_service
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_user(db: Session, user: User) -> int:
+    """Warm the user's default summary entry and trends snapshots. Returns the number computed."""
+    warmed = 0
+    if await analytics.get_task_summary.warm(db=db, current_user=user):
+        warmed += 1
+    if await run_in_threadpool(snapshot_service.warm_user_trends, db, user.id):
+        warmed += 1
+    return warmed
+
+
+async def warm_user_caches(bind, user_id: int) -> None:
+    """
+    BackgroundTasks job run after login: warm_user in a session of its own on bind (the
+    request's session is closed by then). Failures are logged; login never depends on them.
+    """
+    try:
+        FastAPICache.get_backend()
+    except AssertionError:  # cache never initialized
+        return
+    db = Session(bind=bind, autoflush=False)
+    try:
+        user = await run_in_threadpool(db.get, User, user_id)
+        if user is not None:
+            warmed = await warm_user(db, user)
+            logger.debug("Warmed %s cache entries for user %s", warmed, user_id)
+    except Exception:
+        logger.warning("Cache warming for user %s failed", user_id, exc_info=True)
+    finally:
+        await run_in_threadpool(db.close)
+
+
+def most_active_users(db: Session, limit: int, days: int = 30) -> List[int]:
+    """Ids of the owners with the most tasks created plus completed in the last days (UTC)."""
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    activity = func.sum(TaskDailyStats.created + TaskDailyStats.completed)
+    rows = db.query(TaskDailyStats.owner_id).filter(
+        TaskDailyStats.day >= since
+    ).group_by(TaskDailyStats.owner_id).order_by(activity.desc(), TaskDailyStats.owner_id).limit(limit).all()
+    return [row[0] for row in rows]
+
+
+async def warm_users(bind, user_ids: List[int], workers: int) -> int:
+    """
+    Warm each user's caches with at most workers users in flight, each worker with its own
+    session on bind (used from worker threads only, like the rest of the warm path's DB work).
+    A failing user is logged and skipped. Returns the number of entries computed.
+    """
+    queue = asyncio.Queue()
+    for user_id in user_ids:
+        queue.put_nowait(user_id)
+    warmed = 0
+
+    async def worker():
+        nonlocal warmed
+        db = Session(bind=bind, autoflush=False)
+        try:
+            while not queue.empty():
+                user_id = queue.get_nowait()
+                try:
+                    user = await run_in_threadpool(db.get, User, user_id)
+                    if user is not None:
+                        warmed += await warm_user(db, user)
+                except Exception:
+                    logger.warning("Cache warming for user %s failed", user_id, exc_info=True)
+                    await run_in_threadpool(db.rollback)
+        finally:
+            await run_in_threadpool(db.close)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, min(workers, len(user_ids))))))
+    return warmed
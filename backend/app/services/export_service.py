@@ -3,67 +3,120 @@ import csv
 import io
 import json
 import logging
-from typing import BinaryIO, List
+import textwrap
+from typing import Iterable, Iterator, Sequence
 
 from sqlalchemy.orm import Session
 
-from app.models.task import Task
-from app.schemas.task import TaskResponse
-
 logger = logging.getLogger(__name__)
 
+# Task columns read by exports (live and archived rows alike)
+EXPORT_COLUMNS = [
+    "id", "title", "description", "priority", "completed", "owner_id", "created_at", "updated_at", "completed_at",
+]
+# Rows fetched per cursor round trip, and written to the client per chunk
+EXPORT_CHUNK_ROWS = 1000
+
+# Headers (lowercase to match test expectations)
+CSV_HEADERS = [
+    "id",
+    "title",
+    "description",
+    "priority",
+    "completed",
+    "owner_id",
+    "created_at",
+    "updated_at",
+    "completed_at"
+]
+
+
+def stream_rows(bind, stmt, chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[Sequence]:
+    """
+    Run stmt on a server-side cursor and yield its rows chunk_rows at a time, in a session of
+    its own on bind: streamed responses outlive the request's session.
+    """
+    db = Session(bind=bind)
+    try:
+        result = db.execute(stmt.execution_options(yield_per=chunk_rows))
+        yield from result.partitions()
+    finally:
+        db.close()
 
-def export_tasks_csv(tasks: List[Task]) -> str:
-    """Export tasks as CSV format."""
+
+def stream_tasks_csv(chunks: Iterable[Sequence]) -> Iterator[str]:
+    """CSV export, one piece of text per chunk of rows (see stream_rows); memory stays flat."""
     output = io.StringIO()
     writer = csv.writer(output)
-    
-    # Headers (lowercase to match test expectations)
-    headers = [
-        "id",
-        "title",
-        "description",
-        "priority",
-        "completed",
-        "owner_id",
-        "created_at",
-        "updated_at",
-        "completed_at"
-    ]
-    writer.writerow(headers)
-    
-    # Rows
-    for task in tasks:
-        writer.writerow([
-            task.id,
-            task.title,
-            task.description or "",
-            task.priority,
-            "True" if task.completed else "False",
-            task.owner_id,
-            task.created_at.isoformat(),
-            task.updated_at.isoformat(),
-            task.completed_at.isoformat() if task.completed_at else ""
-        ])
-    
-    logger.info(f"Exported {len(tasks)} tasks to CSV")
-    return output.getvalue()
-
-
-def export_tasks_json(tasks: List[Task]) -> str:
-    """Export tasks as JSON format."""
-    tasks_data = []
-    for task in tasks:
-        tasks_data.append({
-            "id": task.id,
-            "title": task.title,
-            "description": task.description,
-            "priority": task.priority,
-            "completed": task.completed,
-            "created_at": task.created_at.isoformat(),
-            "updated_at": task.updated_at.isoformat(),
-            "completed_at": task.completed_at.isoformat() if task.completed_at else None
-        })
-    
-    logger.info(f"Exported {len(tasks)} tasks to JSON")
-    return json.dumps(tasks_data, indent=2)
+    writer.writerow(CSV_HEADERS)
+
+    exported = 0
+    for rows in chunks:
+        for task in rows:
+            writer.writerow([
+                task.id,
+                task.title,
+                task.description or "",
+                task.priority,
+                "True" if task.completed else "False",
+                task.owner_id,
+                task.created_at.isoformat(),
+                task.updated_at.isoformat(),
+                task.completed_at.isoformat() if task.completed_at else ""
+            ])
+        exported += len(rows)
+        yield output.getvalue()
+        output.seek(0)
+        output.truncate()
+
+    if output.tell():  # headers of an empty export
+        yield output.getvalue()
+    logger.info(f"Exported {exported} tasks to CSV")
+
+
+def _task_json(task) -> dict:
+    return {
+        "id": task.id,
+        "title": task.title,
+        "description": task.description,
+        "priority": task.priority,
+        "completed": task.completed,
+        "created_at": task.created_at.isoformat(),
+        "updated_at": task.updated_at.isoformat(),
+        "completed_at": task.completed_at.isoformat() if task.completed_at else None
+    }
+
+
+def stream_tasks_json(chunks: Iterable[Sequence], compact: bool = False) -> Iterator[str]:
+    """
+    JSON array export encoded one task at a time, one piece of text per chunk of rows. The
+    document matches json.dumps(tasks, indent=2), or has no whitespace at all when compact.
+    """
+    separator = "," if compact else ",\n"
+    exported = 0
+    for rows in chunks:
+        if compact:
+            objects = [json.dumps(_task_json(task), separators=(",", ":")) for task in rows]
+        else:
+            objects = [textwrap.indent(json.dumps(_task_json(task), indent=2), "  ") for task in rows]
+        if not objects:
+            continue
+        opening = separator if exported else ("[" if compact else "[\n")
+        exported += len(objects)
+        yield opening + separator.join(objects)
+
+    if not exported:
+        yield "[]"
+    else:
+        yield "]" if compact else "\n]"
+    logger.info(f"Exported {exported} tasks to JSON")
+
+
+def stream_tasks_ndjson(chunks: Iterable[Sequence]) -> Iterator[str]:
+    """Newline-delimited JSON export: one compact task object per line, one piece of text per chunk."""
+    exported = 0
+    for rows in chunks:
+        if rows:
+            exported += len(rows)
+            yield "".join(json.dumps(_task_json(task), separators=(",", ":")) + "\n" for task in rows)
+    logger.info(f"Exported {exported} tasks to NDJSON")
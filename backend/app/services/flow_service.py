@@ -0,0 +1,135 @@
+"""
+Burndown and cumulative flow: tasks per status at the end of each UTC day, from a running
+sum over task_status_transitions. Finished days are checkpointed in task_flow_checkpoints,
+so a query reads one row per day plus today's transitions instead of replaying history.
+"""
+import logging
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.stats import TaskFlowCheckpoint
+from app.models.task import TASK_STATUSES
+from app.models.task_history import TaskStatusTransition
+from app.schemas.analytics import BurndownDay, FlowDay
+from app.services.analytics_service import _as_date, day_bucket
+
+logger = logging.getLogger(__name__)
+
+MAX_FLOW_DAYS = 366
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, datetime.min.time())
+
+
+def _transition_deltas(db: Session, owner_id: int, first_day: Optional[date], last_day: date) -> Dict[date, Dict[str, int]]:
+    """{day: {status: net change}} from transitions in [first_day, last_day] (from the beginning if first_day is None)."""
+    bucket = day_bucket(db, TaskStatusTransition.changed_at)
+    query = db.query(
+        bucket, TaskStatusTransition.from_status, TaskStatusTransition.to_status, func.count(TaskStatusTransition.id)
+    ).filter(
+        TaskStatusTransition.owner_id == owner_id,
+        TaskStatusTransition.changed_at < _day_start(last_day + timedelta(days=1)),
+    )
+    if first_day is not None:
+        query = query.filter(TaskStatusTransition.changed_at >= _day_start(first_day))
+    deltas = defaultdict(lambda: dict.fromkeys(TASK_STATUSES, 0))
+    for day, from_status, to_status, count in query.group_by(
+        bucket, TaskStatusTransition.from_status, TaskStatusTransition.to_status
+    ).all():
+        if from_status is not None:
+            deltas[_as_date(day)][from_status] -= count
+        if to_status is not None:
+            deltas[_as_date(day)][to_status] += count
+    return deltas
+
+
+def _counts(checkpoint: Optional[TaskFlowCheckpoint]) -> Dict[str, int]:
+    if checkpoint is None:
+        return dict.fromkeys(TASK_STATUSES, 0)
+    return {s: getattr(checkpoint, s) for s in TASK_STATUSES}
+
+
+def _last_checkpoint(db: Session, owner_id: int, before: date) -> Optional[TaskFlowCheckpoint]:
+    return db.query(TaskFlowCheckpoint).filter(
+        TaskFlowCheckpoint.owner_id == owner_id, TaskFlowCheckpoint.day < before
+    ).order_by(TaskFlowCheckpoint.day.desc()).first()
+
+
+def extend_checkpoints(db: Session, owner_id: int, through: date) -> int:
+    """
+    Write checkpoints for every day after the owner's last one up to through (a finished day),
+    scanning only the transitions in between. Returns the number of checkpoints written.
+    """
+    last = _last_checkpoint(db, owner_id, through + timedelta(days=1))
+    if last is not None and last.day >= through:
+        return 0
+    first_day = last.day + timedelta(days=1) if last is not None else None
+    deltas = _transition_deltas(db, owner_id, first_day, through)
+    if first_day is None:
+        if not deltas:
+            return 0
+        first_day = min(deltas)
+
+    counts = _counts(last)
+    rows = []
+    day = first_day
+    while day <= through:
+        for status, n in deltas.get(day, {}).items():
+            counts[status] += n
+        rows.append({"owner_id": owner_id, "day": day, **counts})
+        day += timedelta(days=1)
+    try:
+        db.execute(insert(TaskFlowCheckpoint), rows)
+        db.commit()
+    except IntegrityError:
+        # A concurrent request wrote the same days; its rows are identical
+        db.rollback()
+        return 0
+    return len(rows)
+
+
+def get_flow(db: Session, owner_id: int, start: date, end: date) -> List[FlowDay]:
+    """Tasks per status at the end of each day in [start, end] (UTC days, end clamped to today)."""
+    today = datetime.utcnow().date()
+    end = min(end, today)
+    if start > end:
+        raise ValueError("start must not be after end")
+    if (end - start).days + 1 > MAX_FLOW_DAYS:
+        raise ValueError(f"Range too large: at most {MAX_FLOW_DAYS} days")
+
+    yesterday = today - timedelta(days=1)
+    extend_checkpoints(db, owner_id, min(end, yesterday))
+    by_day = {
+        checkpoint.day: _counts(checkpoint)
+        for checkpoint in db.query(TaskFlowCheckpoint).filter(
+            TaskFlowCheckpoint.owner_id == owner_id,
+            TaskFlowCheckpoint.day >= start,
+            TaskFlowCheckpoint.day <= end,
+        ).all()
+    }
+    if end == today:
+        counts = _counts(_last_checkpoint(db, owner_id, today))
+        for status, n in _transition_deltas(db, owner_id, today, today).get(today, {}).items():
+            counts[status] += n
+        by_day[today] = counts
+
+    # Days without a checkpoint come before the owner's first transition
+    zero = dict.fromkeys(TASK_STATUSES, 0)
+    return [
+        FlowDay(date=start + timedelta(days=i), **by_day.get(start + timedelta(days=i), zero))
+        for i in range((end - start).days + 1)
+    ]
+
+
+def get_burndown(db: Session, owner_id: int, start: date, end: date) -> List[BurndownDay]:
+    """Open (todo + in progress) and done tasks at the end of each day in [start, end]."""
+    return [
+        BurndownDay(date=day.date, remaining=day.todo + day.in_progress, completed=day.done)
+        for day in get_flow(db, owner_id, start, end)
+    ]
@@ -0,0 +1,193 @@
+"""Garbage collector: hard-deletes soft-deleted rows past a retention window and removes orphaned blobs."""
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.archive import ArchivedComment, ArchivedFile, ArchivedTask
+from app.models.comment import Comment
+from app.models.file import File
+from app.models.task import Task
+from app.models.task_history import TaskTombstone
+from app.services.file_service import UPLOAD_DIR
+from app.services.task_service import record_tombstones
+from app.utils.cache import mark_users_stale
+
+logger = logging.getLogger(__name__)
+
+# (task model, comment model, file model): purging a task purges all of its children
+TASK_FAMILIES = [
+    (Task, Comment, File),
+    (ArchivedTask, ArchivedComment, ArchivedFile),
+]
+# Soft-deleted children whose task is still alive. File has no updated_at, so upload time is used.
+CHILD_TARGETS = [
+    (Comment, Comment.updated_at),
+    (File, File.created_at),
+    (ArchivedComment, ArchivedComment.updated_at),
+    (ArchivedFile, ArchivedFile.created_at),
+]
+# Blobs younger than this are never treated as orphans (upload may not have saved its row yet)
+ORPHAN_GRACE_SECONDS = 3600
+
+
+def _remove_blobs(upload_dir: Path, filepaths: List[str]) -> int:
+    """Delete blobs for purged file rows; paths outside upload_dir are ignored."""
+    removed = 0
+    base = upload_dir.resolve()
+    for filepath in filepaths:
+        full_path = (upload_dir / filepath).resolve()
+        if base not in full_path.parents:
+            logger.warning("Refusing to remove blob outside upload dir: %s", filepath)
+            continue
+        try:
+            full_path.unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+def _purge_tasks(db: Session, family, cutoff: datetime, batch_size: int, sleep_seconds: float,
+                 upload_dir: Path, counts: Dict[str, int]) -> None:
+    task_model, comment_model, file_model = family
+    while True:
+        task_ids = [row[0] for row in db.query(task_model.id).filter(
+            task_model.is_deleted == True,
+            task_model.updated_at < cutoff,
+        ).order_by(task_model.id.asc()).limit(batch_size).all()]
+        if not task_ids:
+            return
+        filepaths = [row[0] for row in db.query(file_model.filepath).filter(
+            file_model.task_id.in_(task_ids)
+        ).all()]
+        try:
+            if task_model is Task:
+                # Clients whose sync cursor predates the soft delete still hold these tasks
+                record_tombstones(db, task_ids)
+            mark_users_stale(db, {
+                user_id for row in db.query(task_model.owner_id, task_model.assigned_to).filter(
+                    task_model.id.in_(task_ids)
+                ) for user_id in row
+            })
+            counts["comments"] += db.query(comment_model).filter(
+                comment_model.task_id.in_(task_ids)
+            ).delete(synchronize_session=False)
+            counts["files"] += db.query(file_model).filter(
+                file_model.task_id.in_(task_ids)
+            ).delete(synchronize_session=False)
+            counts["tasks"] += db.query(task_model).filter(
+                task_model.id.in_(task_ids)
+            ).delete(synchronize_session=False)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        # Only touch disk once the rows are gone for good
+        counts["blobs"] += _remove_blobs(upload_dir, filepaths)
+        if sleep_seconds:
+            time.sleep(sleep_seconds)
+
+
+def _purge_children(db: Session, model, deleted_at, cutoff: datetime, batch_size: int,
+                    sleep_seconds: float, upload_dir: Path, counts: Dict[str, int]) -> None:
+    key = "files" if hasattr(model, "filepath") else "comments"
+    columns = [model.id, model.filepath] if key == "files" else [model.id]
+    while True:
+        rows = db.query(*columns).filter(
+            model.is_deleted == True,
+            deleted_at < cutoff,
+        ).order_by(model.id.asc()).limit(batch_size).all()
+        if not rows:
+            return
+        ids = [row[0] for row in rows]
+        filepaths = [row[1] for row in rows] if key == "files" else []
+        try:
+            counts[key] += db.query(model).filter(model.id.in_(ids)).delete(synchronize_session=False)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        counts["blobs"] += _remove_blobs(upload_dir, filepaths)
+        if sleep_seconds:
+            time.sleep(sleep_seconds)
+
+
+def purge_tombstones(db: Session, batch_size: int) -> int:
+    """
+    Delete tombstones older than GC_RETENTION_DAYS (whatever retention the purge used), the
+    age beyond which sync cursors are rejected anyway. Returns the number deleted.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=settings.GC_RETENTION_DAYS)
+    purged = 0
+    while True:
+        task_ids = [row[0] for row in db.query(TaskTombstone.task_id).filter(
+            TaskTombstone.removed_at < cutoff
+        ).limit(batch_size).all()]
+        if not task_ids:
+            return purged
+        try:
+            purged += db.query(TaskTombstone).filter(
+                TaskTombstone.task_id.in_(task_ids)
+            ).delete(synchronize_session=False)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+
+def remove_orphaned_blobs(db: Session, upload_dir: Path = UPLOAD_DIR) -> int:
+    """Delete blobs under upload_dir/task_files that no file row (live or archived) references."""
+    blob_dir = upload_dir / "task_files"
+    if not blob_dir.is_dir():
+        return 0
+    referenced = {row[0] for row in db.query(File.filepath).yield_per(1000)}
+    referenced.update(row[0] for row in db.query(ArchivedFile.filepath).yield_per(1000))
+
+    removed = 0
+    now = time.time()
+    for entry in os.scandir(blob_dir):
+        if not entry.is_file():
+            continue
+        if f"task_files/{entry.name}" in referenced:
+            continue
+        if now - entry.stat().st_mtime < ORPHAN_GRACE_SECONDS:
+            continue
+        os.remove(entry.path)
+        removed += 1
+    return removed
+
+
+def purge_deleted(
+    db: Session,
+    retention_days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    sleep_seconds: Optional[float] = None,
+    upload_dir: Path = UPLOAD_DIR,
+) -> Dict[str, int]:
+    """
+    Hard-delete soft-deleted tasks (with all their comments and files), then soft-deleted
+    comments and files, older than the retention window. Works in small committed batches
+    with a pause between them, then sweeps orphaned blobs and expired sync tombstones.
+    Returns counts per kind.
+    """
+    retention_days = settings.GC_RETENTION_DAYS if retention_days is None else retention_days
+    batch_size = batch_size or settings.GC_BATCH_SIZE
+    sleep_seconds = settings.GC_BATCH_SLEEP_SECONDS if sleep_seconds is None else sleep_seconds
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+
+    counts = {"tasks": 0, "comments": 0, "files": 0, "blobs": 0, "tombstones": 0}
+    for family in TASK_FAMILIES:
+        _purge_tasks(db, family, cutoff, batch_size, sleep_seconds, upload_dir, counts)
+    for model, deleted_at in CHILD_TARGETS:
+        _purge_children(db, model, deleted_at, cutoff, batch_size, sleep_seconds, upload_dir, counts)
+    counts["blobs"] += remove_orphaned_blobs(db, upload_dir)
+    counts["tombstones"] += purge_tombstones(db, batch_size)
+
+    logger.info("Purged soft-deleted rows older than %s days: %s", retention_days, counts)
+    return counts
@@ -0,0 +1,161 @@
+"""
+Analytics snapshots: user performance and 7/30/90-day trends precomputed by a Celery beat
+job into analytics_snapshots, so requests read one row instead of running the aggregates.
+"""
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.stats import AnalyticsSnapshot, TaskDailyStats
+from app.models.user import User
+from app.schemas.analytics import DailyTrend, UserPerformance
+from app.services import analytics_service
+
+logger = logging.getLogger(__name__)
+
+PERFORMANCE_SNAPSHOT = "performance"
+SNAPSHOT_TREND_DAYS = (7, 30, 90)
+
+# Requests finding no fresh performance snapshot compute it one at a time per worker; the
+# others wait and read the snapshot the first one stored instead of repeating the aggregates
+_performance_lock = threading.Lock()
+
+
+def trends_snapshot_name(user_id: int, days: int) -> str:
+    return f"trends:{days}:user:{user_id}"
+
+
+def save_snapshot(db: Session, name: str, items: list, generated_at: datetime) -> None:
+    """
+    Insert or replace a snapshot of pydantic models. Caller commits. An upsert, so workers (or a
+    worker and the beat job) storing the same missing snapshot at once don't collide on insert.
+    """
+    payload = json.dumps([item.model_dump(mode="json") for item in items])
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        table = AnalyticsSnapshot.__table__
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = dialect_insert(table).values(name=name, payload=payload, generated_at=generated_at)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[table.c.name],
+            set_={"payload": stmt.excluded.payload, "generated_at": stmt.excluded.generated_at},
+        ))
+        return
+    db.merge(AnalyticsSnapshot(name=name, payload=payload, generated_at=generated_at))
+
+
+def load_snapshot(db: Session, name: str) -> Optional[Tuple[list, datetime]]:
+    """(decoded payload, generated_at) if the snapshot exists and is not older than the max age."""
+    # populate_existing: another session may have replaced the row since this one loaded it
+    snapshot = db.get(AnalyticsSnapshot, name, populate_existing=True)
+    if snapshot is None:
+        return None
+    max_age = timedelta(minutes=settings.ANALYTICS_SNAPSHOT_MAX_AGE_MINUTES)
+    if datetime.utcnow() - snapshot.generated_at > max_age:
+        return None
+    return json.loads(snapshot.payload), snapshot.generated_at
+
+
+def _compute_performance(db: Session) -> List[UserPerformance]:
+    user_count = db.query(func.count(User.id)).scalar() or 0
+    return analytics_service.get_user_performance(db, limit=max(user_count, 1))
+
+
+def _sort_performance(rows: List[UserPerformance], limit: int, offset: int, order_by: str,
+                      sort_order: str) -> List[UserPerformance]:
+    """Same ordering as get_user_performance: the sort field, then user_id ascending."""
+    if order_by not in analytics_service.PERFORMANCE_ORDER_FIELDS:
+        raise ValueError(
+            f"order_by must be one of: {', '.join(analytics_service.PERFORMANCE_ORDER_FIELDS)}"
+        )
+    rows = sorted(rows, key=lambda row: row.user_id)
+    rows.sort(key=lambda row: getattr(row, order_by), reverse=sort_order != "asc")
+    return rows[offset:offset + limit]
+
+
+def get_user_performance(
+    db: Session,
+    limit: int = 100,
+    offset: int = 0,
+    order_by: str = "user_id",
+    sort_order: str = "asc",
+) -> Tuple[List[UserPerformance], datetime]:
+    """Performance page from the latest snapshot, computing (and storing) it if missing or too old."""
+    snapshot = load_snapshot(db, PERFORMANCE_SNAPSHOT)
+    if snapshot is None:
+        with _performance_lock:
+            snapshot = load_snapshot(db, PERFORMANCE_SNAPSHOT)
+            if snapshot is None:
+                generated_at = datetime.utcnow()
+                rows = _compute_performance(db)
+                save_snapshot(db, PERFORMANCE_SNAPSHOT, rows, generated_at)
+                db.commit()
+                return _sort_performance(rows, limit, offset, order_by, sort_order), generated_at
+    payload, generated_at = snapshot
+    rows = [UserPerformance(**row) for row in payload]
+    return _sort_performance(rows, limit, offset, order_by, sort_order), generated_at
+
+
+def get_task_trends(db: Session, user_id: int, days: int) -> Tuple[List[DailyTrend], datetime]:
+    """Default (UTC, daily, owned) trends from the user's snapshot when days is a snapshot window."""
+    if days in SNAPSHOT_TREND_DAYS:
+        snapshot = load_snapshot(db, trends_snapshot_name(user_id, days))
+        if snapshot is not None:
+            payload, generated_at = snapshot
+            return [DailyTrend(**row) for row in payload], generated_at
+    # Cheap without a snapshot: UTC daily trends of owned tasks read the daily rollup
+    return analytics_service.get_task_trends(db, days, user_id), datetime.utcnow()
+
+
+def save_user_trends(db: Session, user_id: int) -> int:
+    """Recompute the user's 7/30/90-day trends snapshots. Caller commits. Returns the number written."""
+    generated_at = datetime.utcnow()
+    for days in SNAPSHOT_TREND_DAYS:
+        trends = analytics_service.get_task_trends(db, days, user_id)
+        save_snapshot(db, trends_snapshot_name(user_id, days), trends, generated_at)
+    return len(SNAPSHOT_TREND_DAYS)
+
+
+def warm_user_trends(db: Session, user_id: int, days: int = 30) -> bool:
+    """Store the user's trends snapshots unless the days window has a fresh one. Returns whether it did."""
+    if load_snapshot(db, trends_snapshot_name(user_id, days)) is not None:
+        return False
+    try:
+        save_user_trends(db, user_id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return True
+
+
+def refresh_snapshots(db: Session) -> int:
+    """
+    Recompute the performance snapshot and 7/30/90-day trends for every user with task
+    activity in the last 90 days. Commits once per user. Returns the number of snapshots written.
+    """
+    written = 0
+    try:
+        save_snapshot(db, PERFORMANCE_SNAPSHOT, _compute_performance(db), datetime.utcnow())
+        db.commit()
+        written += 1
+
+        since = datetime.utcnow().date() - timedelta(days=max(SNAPSHOT_TREND_DAYS) - 1)
+        user_ids = [row[0] for row in db.query(TaskDailyStats.owner_id).filter(
+            TaskDailyStats.day >= since
+        ).distinct().all()]
+        for user_id in user_ids:
+            written += save_user_trends(db, user_id)
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    logger.info("Refreshed %s analytics snapshots", written)
+    return written
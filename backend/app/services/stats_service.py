@@ -0,0 +1,351 @@
+"""
+Derived task statistics: the task_daily_stats rollup, the task_counters row per owner and
+the task_status_transitions history. All are kept in step with every ORM write to tasks (same
+transaction, via a Session after_flush hook); rebuild_daily_stats, reconcile_task_counters and
+backfill_status_transitions recompute them from tasks.
+"""
+import logging
+from collections import defaultdict, namedtuple
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import and_, delete, event, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, attributes
+
+from app.models.archive import ArchivedTask
+from app.models.stats import TaskCounters, TaskDailyStats, TaskFlowCheckpoint
+from app.models.task import TASK_PRIORITIES, TASK_STATUSES, Task
+from app.models.task_history import TaskStatusTransition
+from app.services.analytics_service import _as_date, count_where, day_bucket
+from app.utils.cache import mark_users_stale
+
+logger = logging.getLogger(__name__)
+
+STAT_COLUMNS = ("created", "completed", "deleted", "overdue")
+COUNTER_COLUMNS = (
+    ("total",)
+    + tuple(f"status_{s}" for s in TASK_STATUSES)
+    + tuple(f"priority_{p}" for p in TASK_PRIORITIES)
+    + ("due_open",)
+)
+
+# The task fields the rollup, counters and status history depend on
+TaskState = namedtuple(
+    "TaskState",
+    ["owner_id", "is_deleted", "status", "priority", "created_at", "completed_at", "due_date", "updated_at", "id"],
+)
+
+
+def _contributions(state: Optional[TaskState]) -> Dict[Tuple[int, object, str], int]:
+    """{(owner_id, day, column): 1} for each rollup cell this task state counts towards."""
+    cells = {}
+    if state is None or state.owner_id is None:
+        return cells
+    if state.is_deleted:
+        deleted_at = state.updated_at or state.created_at
+        if deleted_at is not None:
+            cells[(state.owner_id, deleted_at.date(), "deleted")] = 1
+        return cells
+    if state.created_at is not None:
+        cells[(state.owner_id, state.created_at.date(), "created")] = 1
+    if state.completed_at is not None:
+        cells[(state.owner_id, state.completed_at.date(), "completed")] = 1
+    if state.due_date is not None and state.status != "done":
+        cells[(state.owner_id, state.due_date.date(), "overdue")] = 1
+    return cells
+
+
+def _counter_contributions(state: Optional[TaskState]) -> Dict[Tuple[int, str], int]:
+    """{(owner_id, column): 1} for each task_counters column this task state counts towards."""
+    if state is None or state.owner_id is None or state.is_deleted:
+        return {}
+    cells = {
+        (state.owner_id, "total"): 1,
+        (state.owner_id, f"status_{state.status}"): 1,
+        (state.owner_id, f"priority_{state.priority}"): 1,
+    }
+    if state.due_date is not None and state.status != "done":
+        cells[(state.owner_id, "due_open")] = 1
+    return cells
+
+
+def _current_state(task: Task) -> TaskState:
+    return TaskState(*(getattr(task, field) for field in TaskState._fields))
+
+
+def _committed_value(task: Task, field: str):
+    """Value of field as last flushed, read from attribute history."""
+    history = attributes.get_history(task, field)
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    # Attribute was not loaded before being set; the pending value is the best we have
+    return history.added[0] if history.added else None
+
+
+def _committed_state(task: Task) -> TaskState:
+    return TaskState(*(_committed_value(task, field) for field in TaskState._fields))
+
+
+def _upsert(connection, table, key: Dict[str, object], columns, deltas: Dict[str, int]) -> None:
+    """Add deltas to the row identified by key atomically, creating it if missing."""
+    values = {column: deltas.get(column, 0) for column in columns}
+    dialect = connection.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = dialect_insert(table).values(**key, **values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c[name] for name in key],
+            set_={column: table.c[column] + stmt.excluded[column] for column in columns},
+        )
+        connection.execute(stmt)
+        return
+    result = connection.execute(
+        update(table)
+        .where(*[table.c[name] == value for name, value in key.items()])
+        .values({column: table.c[column] + values[column] for column in columns})
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(table).values(**key, **values))
+
+
+def apply_task_changes(connection, changes) -> None:
+    """Apply (before, after) TaskState pairs to the rollup and counters; None means no such task."""
+    daily = defaultdict(lambda: defaultdict(int))
+    counters = defaultdict(lambda: defaultdict(int))
+    for before, after in changes:
+        for sign, state in ((1, after), (-1, before)):
+            for (owner_id, day, column), n in _contributions(state).items():
+                daily[(owner_id, day)][column] += sign * n
+            for (owner_id, column), n in _counter_contributions(state).items():
+                counters[owner_id][column] += sign * n
+    for (owner_id, day), columns in daily.items():
+        columns = {column: n for column, n in columns.items() if n}
+        if columns:
+            _upsert(connection, TaskDailyStats.__table__, {"owner_id": owner_id, "day": day},
+                    STAT_COLUMNS, columns)
+    for owner_id, columns in counters.items():
+        columns = {column: n for column, n in columns.items() if n}
+        if columns:
+            _upsert(connection, TaskCounters.__table__, {"owner_id": owner_id}, COUNTER_COLUMNS, columns)
+
+
+def _board_status(state: Optional[TaskState]) -> Optional[str]:
+    """Status the task is counted under in the flow charts; None if it is deleted or does not exist."""
+    if state is None or state.owner_id is None or state.is_deleted:
+        return None
+    return state.status
+
+
+def _transitions(before: Optional[TaskState], after: Optional[TaskState], now: datetime) -> list:
+    """task_status_transitions rows for one task write (two if the task changed owner)."""
+    old_status, new_status = _board_status(before), _board_status(after)
+    task = after or before
+    if before is None and after is not None:
+        # New tasks enter the board when they were created (imports may backdate created_at)
+        now = after.created_at or now
+    if before is not None and after is not None and before.owner_id != after.owner_id:
+        pairs = [(before.owner_id, old_status, None), (after.owner_id, None, new_status)]
+    else:
+        pairs = [(task.owner_id, old_status, new_status)]
+    return [
+        {"task_id": task.id, "owner_id": owner_id, "from_status": from_status,
+         "to_status": to_status, "changed_at": now}
+        for owner_id, from_status, to_status in pairs
+        if owner_id is not None and from_status != to_status
+    ]
+
+
+def record_status_transitions(connection, changes) -> None:
+    """
+    Append a transition for every (before, after) pair that moves a task between board
+    columns. Flow checkpoints from a backdated transition's day on are dropped to be rebuilt.
+    """
+    now = datetime.utcnow()
+    rows = [row for before, after in changes for row in _transitions(before, after, now)]
+    if not rows:
+        return
+    connection.execute(insert(TaskStatusTransition), rows)
+    stale = {}
+    for row in rows:
+        day = row["changed_at"].date()
+        if day < now.date() and day < stale.get(row["owner_id"], now.date()):
+            stale[row["owner_id"]] = day
+    for owner_id, day in stale.items():
+        connection.execute(delete(TaskFlowCheckpoint).where(
+            TaskFlowCheckpoint.owner_id == owner_id, TaskFlowCheckpoint.day >= day
+        ))
+
+
+def _counter_aggregates(model, *conditions):
+    """SELECT owner_id, <one conditional count per COUNTER_COLUMNS> over non-deleted rows of model."""
+    columns = [func.count(model.id).label("total")]
+    columns += [count_where(model.status == s).label(f"status_{s}") for s in TASK_STATUSES]
+    columns += [count_where(model.priority == p).label(f"priority_{p}") for p in TASK_PRIORITIES]
+    columns.append(count_where(and_(model.status != "done", model.due_date != None)).label("due_open"))
+    return select(model.owner_id, *columns).where(model.is_deleted == False, *conditions).group_by(model.owner_id)
+
+
+def remove_from_counters(db: Session, condition) -> None:
+    """Subtract the tasks matching condition from task_counters; call before a bulk delete. Caller commits."""
+    connection = db.connection()
+    for row in connection.execute(_counter_aggregates(Task, condition)).mappings():
+        _upsert(connection, TaskCounters.__table__, {"owner_id": row["owner_id"]}, COUNTER_COLUMNS,
+                {column: -row[column] for column in COUNTER_COLUMNS})
+
+
+@event.listens_for(Session, "after_flush")
+def _track_task_writes(session: Session, flush_context) -> None:
+    """Runs inside the flush, so rollup updates commit or roll back with the task rows."""
+    changes = []
+    for obj in session.new:
+        if isinstance(obj, Task):
+            changes.append((None, _current_state(obj)))
+    for obj in session.dirty:
+        if isinstance(obj, Task) and session.is_modified(obj, include_collections=False):
+            changes.append((_committed_state(obj), _current_state(obj)))
+    for obj in session.deleted:
+        if isinstance(obj, Task):
+            changes.append((_committed_state(obj), None))
+    if changes:
+        apply_task_changes(session.connection(), changes)
+        record_status_transitions(session.connection(), changes)
+
+
+def rebuild_daily_stats(db: Session, owner_id: Optional[int] = None) -> int:
+    """
+    Recompute task_daily_stats (for one owner, or everyone) from live and archived tasks.
+    Tasks already purged by the garbage collector no longer count as deleted. Returns rows written.
+    """
+    totals = defaultdict(lambda: dict.fromkeys(STAT_COLUMNS, 0))
+    for model in (Task, ArchivedTask):
+        owner_filter = [model.owner_id == owner_id] if owner_id is not None else []
+        series = [
+            ("created", model.created_at, [model.is_deleted == False]),
+            ("completed", model.completed_at, [model.is_deleted == False, model.completed_at != None]),
+            ("deleted", model.updated_at, [model.is_deleted == True]),
+            ("overdue", model.due_date,
+             [model.is_deleted == False, model.status != "done", model.due_date != None]),
+        ]
+        for column, timestamp, conditions in series:
+            bucket = day_bucket(db, timestamp)
+            rows = db.query(model.owner_id, bucket, func.count(model.id)).filter(
+                *owner_filter, *conditions
+            ).group_by(model.owner_id, bucket).all()
+            for row_owner, day, count in rows:
+                totals[(row_owner, _as_date(day))][column] += count
+
+    try:
+        query = db.query(TaskDailyStats)
+        if owner_id is not None:
+            query = query.filter(TaskDailyStats.owner_id == owner_id)
+        stale = {row[0] for row in query.with_entities(TaskDailyStats.owner_id).distinct()}
+        mark_users_stale(db, stale | {row_owner for row_owner, _ in totals})
+        query.delete(synchronize_session=False)
+        if totals:
+            db.execute(insert(TaskDailyStats), [
+                {"owner_id": row_owner, "day": day, **counts}
+                for (row_owner, day), counts in totals.items()
+            ])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    logger.info("Rebuilt task daily stats: %s rows", len(totals))
+    return len(totals)
+
+
+def reconcile_task_counters(db: Session, owner_id: Optional[int] = None) -> int:
+    """
+    Recompute task_counters (for one owner, or everyone) from live tasks and correct any
+    row that drifted. Returns the number of owners whose counters were wrong or missing.
+    """
+    conditions = [Task.owner_id == owner_id] if owner_id is not None else []
+    expected = {
+        row["owner_id"]: {column: row[column] for column in COUNTER_COLUMNS}
+        for row in db.execute(_counter_aggregates(Task, *conditions)).mappings()
+    }
+    query = db.query(TaskCounters)
+    if owner_id is not None:
+        query = query.filter(TaskCounters.owner_id == owner_id)
+    zero = dict.fromkeys(COUNTER_COLUMNS, 0)
+
+    corrected = 0
+    try:
+        for counters in query.all():
+            actual = {column: getattr(counters, column) for column in COUNTER_COLUMNS}
+            wanted = expected.pop(counters.owner_id, zero)
+            if actual != wanted:
+                logger.warning("Task counters drifted for owner %s: %s != %s", counters.owner_id, actual, wanted)
+                for column, value in wanted.items():
+                    setattr(counters, column, value)
+                mark_users_stale(db, [counters.owner_id])
+                corrected += 1
+        for missing_owner, wanted in expected.items():
+            if wanted != zero:
+                db.add(TaskCounters(owner_id=missing_owner, **wanted))
+                mark_users_stale(db, [missing_owner])
+                corrected += 1
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    logger.info("Reconciled task counters: %s owner(s) corrected", corrected)
+    return corrected
+
+
+def backfill_status_transitions(db: Session, owner_id: Optional[int] = None) -> int:
+    """
+    Give tasks a creation transition where their history lacks one: live tasks without any
+    history enter their current status at created_at (written by bulk inserts, or before the
+    history existed), and tasks whose earliest transition leaves a status (changed after the
+    history started, but created before) enter that status at created_at. Clears the affected
+    flow checkpoints. Returns the number of transitions written.
+    """
+    conditions = [Task.owner_id == owner_id] if owner_id is not None else []
+    has_history = select(TaskStatusTransition.id).where(TaskStatusTransition.task_id == Task.id).exists()
+    rows = [
+        {"task_id": task_id, "owner_id": row_owner, "from_status": None, "to_status": task_status,
+         "changed_at": created_at or datetime.utcnow()}
+        for task_id, row_owner, task_status, created_at in db.query(
+            Task.id, Task.owner_id, Task.status, Task.created_at
+        ).filter(Task.is_deleted == False, ~has_history, *conditions).all()
+    ]
+
+    first = select(
+        TaskStatusTransition.task_id, TaskStatusTransition.owner_id, TaskStatusTransition.from_status,
+        TaskStatusTransition.changed_at,
+        func.row_number().over(
+            partition_by=TaskStatusTransition.task_id,
+            order_by=(TaskStatusTransition.changed_at, TaskStatusTransition.id),
+        ).label("position"),
+    )
+    if owner_id is not None:
+        first = first.where(TaskStatusTransition.owner_id == owner_id)
+    first = first.subquery()
+    # The task may since have been archived (purged ones only have their history left)
+    created_at = func.coalesce(Task.created_at, ArchivedTask.created_at)
+    for task_id, row_owner, entered, changed_at, created in db.query(
+        first.c.task_id, first.c.owner_id, first.c.from_status, first.c.changed_at, created_at
+    ).outerjoin(Task, Task.id == first.c.task_id).outerjoin(
+        ArchivedTask, ArchivedTask.id == first.c.task_id
+    ).filter(first.c.position == 1, first.c.from_status != None).all():
+        rows.append({"task_id": task_id, "owner_id": row_owner, "from_status": None, "to_status": entered,
+                     "changed_at": min(created, changed_at) if created else changed_at})
+
+    try:
+        if rows:
+            owners = {row["owner_id"] for row in rows}
+            db.execute(insert(TaskStatusTransition), rows)
+            mark_users_stale(db, owners)
+            db.query(TaskFlowCheckpoint).filter(
+                TaskFlowCheckpoint.owner_id.in_(owners)
+            ).delete(synchronize_session=False)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    logger.info("Backfilled %s task status transitions", len(rows))
+    return len(rows)
@@ -1,17 +1,66 @@
 """Task service for business logic."""
+import base64
+import binascii
 import json
 import logging
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
 
+from sqlalchemy import and_, false, insert, literal, or_, select
 from sqlalchemy.orm import Session
 
-from app.models.task import Task
+from app.config import settings
+from app.models.task import TASK_PRIORITIES, TASK_STATUSES, Task
+from app.models.task_history import TaskTombstone
 from app.models.user import User
 from app.schemas.task import TaskCreate, BulkTaskCreate, _normalize_status as normalize_status
 
 logger = logging.getLogger(__name__)
 
+# Which of the user's tasks a list/export/analytics request covers
+TASK_SCOPES = ("owned", "assigned", "all")
+
+
+def scope_filter(scope: str, user_id: int, model=Task):
+    """SQL condition for the user's tasks in a scope: owned, assigned to them, or either.
+    `model` may be Task or ArchivedTask (same columns)."""
+    if scope == "owned":
+        return model.owner_id == user_id
+    if scope == "assigned":
+        return model.assigned_to == user_id
+    if scope == "all":
+        return or_(model.owner_id == user_id, model.assigned_to == user_id)
+    raise ValueError(f"scope must be one of: {', '.join(TASK_SCOPES)}")
+
+
+def tag_filter(tag: str, model=Task):
+    """SQL condition for tasks carrying `tag` (tags are stored as a JSON array string)."""
+    return model.tags.contains(json.dumps(tag.strip()), autoescape=True)
+
+
+def task_list_filters(
+    model,
+    user_id: int,
+    scope: str = "owned",
+    q: Optional[str] = None,
+    priority: Optional[str] = None,
+    status: Optional[str] = None,
+) -> list:
+    """SQL conditions for list/search filters on Task or ArchivedTask. Raises ValueError for a bad scope."""
+    conditions = [scope_filter(scope, user_id, model), model.is_deleted == False]
+    if q and q.strip():
+        term = f"%{q.strip()}%"
+        conditions.append(or_(model.title.ilike(term), model.description.ilike(term)))
+    if priority and priority.strip():
+        priority_val = priority.strip().lower()
+        # Unknown values match nothing rather than failing to bind to the coded column
+        conditions.append(model.priority == priority_val if priority_val in TASK_PRIORITIES else false())
+    if status and status.strip():
+        status_val = normalize_status(status.strip())
+        if status_val in TASK_STATUSES:
+            conditions.append(model.status == status_val)
+    return conditions
+
 
 def create_bulk_tasks(
     db: Session, 
@@ -98,3 +147,100 @@ def get_completed_tasks_for_date_range(
         Task.completed_at >= start_date,
         Task.completed_at <= end_date
     ).all()
+
+
+# Cursor used when a client syncs for the first time (no `since`): everything is newer.
+INITIAL_SYNC_POSITION = (datetime(1970, 1, 1), 0)
+
+
+def encode_change_cursor(updated_at: datetime, task_id: int, synced_at: Optional[datetime] = None) -> str:
+    """
+    Encode an (updated_at, id) position as an opaque URL-safe cursor, with the server time
+    since which the client has seen every change (cursors expire by it, not by data age).
+    """
+    raw = f"{updated_at.isoformat()}|{task_id}"
+    if synced_at is not None:
+        raw = f"{raw}|{synced_at.isoformat()}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_change_cursor(cursor: str) -> Tuple[datetime, int, datetime]:
+    """
+    Decode a cursor from encode_change_cursor into (updated_at, id, synced_at). Cursors
+    without a sync time count as synced at their position. Raises ValueError if malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        ts, task_id, *synced = raw.split("|", 2)
+        updated_at = datetime.fromisoformat(ts)
+        return updated_at, int(task_id), datetime.fromisoformat(synced[0]) if synced else updated_at
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError("Invalid sync cursor") from e
+
+
+class ChangeCursorExpired(Exception):
+    """The sync cursor predates the kept tombstones: the client must do a full sync."""
+
+
+def record_tombstones(db: Session, task_ids: List[int]) -> None:
+    """Record tasks about to leave the tasks table (archive, purge) for delta sync. Caller commits."""
+    now = datetime.utcnow()
+    db.execute(insert(TaskTombstone).from_select(
+        ["task_id", "owner_id", "removed_at"],
+        select(Task.id, Task.owner_id, literal(now)).where(Task.id.in_(task_ids)),
+    ))
+
+
+def get_task_changes(
+    db: Session,
+    user_id: int,
+    since: Optional[str],
+    limit: int = 100
+) -> Tuple[List[Task], List[int], str, bool]:
+    """
+    Keyset scan of the user's tasks changed after `since`, ordered by (updated_at, id), merged
+    with tombstones of tasks archived or purged since then (by removal time). Soft-deleted and
+    removed tasks are reported as deleted. Served by ix_tasks_owner_updated_at_id and
+    ix_task_tombstones_owner_removed_at_task_id.
+    Returns (updated tasks, deleted ids, next_cursor, has_more). Raises ChangeCursorExpired
+    when the client last caught up more than GC_RETENTION_DAYS ago, so tombstones it has not
+    seen may be gone. How old its newest change is does not matter.
+    """
+    now = datetime.utcnow()
+    if since:
+        since_at, since_id, synced_at = decode_change_cursor(since)
+        if synced_at < now - timedelta(days=settings.GC_RETENTION_DAYS):
+            raise ChangeCursorExpired("Sync cursor expired; do a full sync without `since`")
+    else:
+        # Tombstones written from now on are all newer than anything a full sync returns
+        (since_at, since_id), synced_at = INITIAL_SYNC_POSITION, now
+
+    tasks = db.query(Task).filter(
+        Task.owner_id == user_id,
+        or_(
+            Task.updated_at > since_at,
+            and_(Task.updated_at == since_at, Task.id > since_id),
+        ),
+    ).order_by(Task.updated_at.asc(), Task.id.asc()).limit(limit + 1).all()
+    changes = [(task.updated_at, task.id, task) for task in tasks]
+    if since:
+        # A full sync has nothing to drop
+        tombstones = db.query(TaskTombstone).filter(
+            TaskTombstone.owner_id == user_id,
+            or_(
+                TaskTombstone.removed_at > since_at,
+                and_(TaskTombstone.removed_at == since_at, TaskTombstone.task_id > since_id),
+            ),
+        ).order_by(TaskTombstone.removed_at.asc(), TaskTombstone.task_id.asc()).limit(limit + 1).all()
+        changes.extend((tombstone.removed_at, tombstone.task_id, None) for tombstone in tombstones)
+        changes.sort(key=lambda change: change[:2])
+
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    position = changes[-1][:2] if changes else (since_at, since_id)
+    # A caught-up client has seen every change up to now; one still paging, up to its last sync
+    next_cursor = encode_change_cursor(*position, synced_at if has_more else now)
+    updated = [task for _, _, task in changes if task is not None and not task.is_deleted]
+    deleted = [task_id for _, task_id, task in changes if task is None or task.is_deleted]
+    return updated, deleted, next_cursor, has_more
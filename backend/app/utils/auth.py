@@ -82,3 +82,13 @@ def get_current_user(
         raise credentials_exception
 
     return user
+
+
+def get_current_admin(current_user=Depends(get_current_user)):
+    """Return the authenticated user if their email is listed in ADMIN_EMAILS. Raises 403 otherwise."""
+    from app.config import settings
+
+    admins = {email.strip().lower() for email in settings.ADMIN_EMAILS.split(",") if email.strip()}
+    if current_user.email.lower() not in admins:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
@@ -1,16 +1,589 @@
-from fastapi_cache.key_builder import default_key_builder
-
-
-def user_key_builder(func, namespace: str = "", request=None, response=None, args=None, kwargs=None):
-    """Cache key builder that scopes entries by user id when available."""
-    args = args or ()
-    kwargs = kwargs or {}
-    base_key = default_key_builder(func, namespace, request, response, args, kwargs)
-    user = kwargs.get("current_user") or kwargs.get("user")
-    user_id = getattr(user, "id", "anon")
-    key = f"{base_key}:user:{user_id}"
-    # Trends endpoint: include `days` so each range gets its own cache entry (avoids stale 1-point response)
-    if request and hasattr(request, "url") and request.url and "trends" in request.url.path:
-        days = request.query_params.get("days", "30") if hasattr(request, "query_params") else kwargs.get("days", "30")
-        key = f"{key}:days:{days}"
-    return key
+"""
+Tagged response caching for analytics routes.
+
+Every entry key embeds the current version of its tag (e.g. one user's analytics, or
+the global performance table). Invalidating a tag stores a new version, so old entries
+are never read again and simply expire; no key scans are needed on Redis or in memory.
+
+@cached is fastapi-cache's @cache with stale-while-revalidate: an entry past its TTL is
+still served for a grace period while one background refresh recomputes it. Misses are
+single-flight: one caller per key computes (across workers via a Redis lock) and the rest
+wait for its result. Endpoints also get warm(), which fills their entry ahead of a request.
+"""
+import asyncio
+import fnmatch
+import inspect
+import logging
+import os
+import time
+import uuid
+import zlib
+from functools import wraps
+from typing import Iterable, List, Optional
+
+import anyio.from_thread
+import redis as sync_redis
+from fastapi import BackgroundTasks, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.params import Depends
+from fastapi_cache import FastAPICache
+from sqlalchemy import event
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import Session, attributes
+from sqlalchemy.orm.state import InstanceState
+
+from app.config import settings
+from app.core.cache import CACHE_PREFIX
+from app.models.task import Task
+from app.utils import cache_metrics
+
+logger = logging.getLogger(__name__)
+
+PERFORMANCE_TAG = "performance"
+# Outlives any entry, so an expired version key can never bring back entries from before a bump
+TAG_VERSION_TTL_SECONDS = 2 * settings.ANALYTICS_CACHE_TTL_SECONDS + 60
+
+# Sender id on invalidations published by processes without a cache backend
+_SYNC_SENDER_ID = f"sync-{uuid.uuid4().hex}"
+
+# Endpoint arguments that are request plumbing rather than part of the cached answer
+_IGNORED_KWARGS = {"db", "current_user", "request", "response", "background_tasks"}
+# Response headers of @cached endpoints: HIT, STALE or MISS, and seconds since computed
+CACHE_STATUS_HEADER = "X-Cache-Status"
+AGE_HEADER = "Age"
+
+# Cache keys with a stale-while-revalidate refresh running in this process
+_refreshing = set()
+# Misses being computed in this process: cache key -> future of (value, encoded entry)
+_inflight = {}
+# How often a caller waiting on another worker's computation rechecks the cache
+SINGLE_FLIGHT_POLL_SECONDS = 0.05
+# Deletes the lock only if it still holds our token (it may have expired and been retaken)
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('DEL', KEYS[1]) end
+return 0
+"""
+
+
+def user_tag(user_id) -> str:
+    return f"user:{user_id}"
+
+
+def _tag_key(tag: str) -> str:
+    return f"{FastAPICache.get_prefix()}:tag:{tag}"
+
+
+async def tag_version(tag: str) -> str:
+    """Current version of tag ("0" until first invalidated or if the backend is unreachable)."""
+    try:
+        with cache_metrics.timed("tag", "get"):
+            version = await FastAPICache.get_backend().get(_tag_key(tag))
+    except Exception:
+        logger.warning("Could not read cache tag %s", tag, exc_info=True)
+        cache_metrics.record("tag", errors=1)
+        return "0"
+    if isinstance(version, bytes):
+        version = version.decode()
+    return version or "0"
+
+
+def tagged_key_builder(tag: Optional[str] = None, per_user: bool = True):
+    """
+    Key builder for @cache: prefix, namespace, tag version, user (if per_user) and the
+    endpoint's own arguments. Routes sharing a namespace (aliases) share entries.
+    tag=None tags each entry with the requesting user's tag.
+    """
+
+    async def build(func, namespace: str = "", request=None, response=None, args=None, kwargs=None):
+        kwargs = kwargs or {}
+        user_id = getattr(kwargs.get("current_user"), "id", "anon")
+        entry_tag = tag or user_tag(user_id)
+        params = "&".join(
+            f"{name}={value}" for name, value in sorted(kwargs.items()) if name not in _IGNORED_KWARGS
+        )
+        key = f"{FastAPICache.get_prefix()}:{namespace}:{entry_tag}@{await tag_version(entry_tag)}"
+        if per_user:
+            key = f"{key}:user:{user_id}"
+        return f"{key}:{params}"
+
+    return build
+
+
+async def invalidate_tags(tags: Iterable[str]) -> None:
+    """Start a new version of each tag, orphaning every entry cached under the old one."""
+    backend = FastAPICache.get_backend()
+    version = str(time.time_ns())
+    for tag in tags:
+        try:
+            await backend.set(_tag_key(tag), version, expire=TAG_VERSION_TTL_SECONDS)
+        except Exception:
+            logger.warning("Could not invalidate cache tag %s", tag, exc_info=True)
+
+
+def invalidate_tags_from_thread(tags: Iterable[str]) -> None:
+    """
+    Invalidate from sync code. In the app's worker threads (sync routes) this goes through the
+    cache backend on the event loop; in processes without one (Celery jobs, scripts) the tag
+    versions are bumped straight in Redis.
+    """
+    tags = sorted(set(tags))
+    if not tags:
+        return
+    try:
+        backend = FastAPICache.get_backend()
+    except AssertionError:  # cache never initialized in this process
+        bump_tags_in_redis(tags)
+        return
+    try:
+        anyio.from_thread.run(invalidate_tags, tags)
+    except RuntimeError:
+        if _redis_client(backend) is None:
+            logger.debug("No cache event loop here; cache tags %s expire by TTL", tags)
+        else:
+            bump_tags_in_redis(tags)
+
+
+def bump_tags_in_redis(tags: Iterable[str]) -> None:
+    """
+    Start a new version of each tag with a synchronous INCR on its key (any new value orphans
+    the old entries), and publish the change so API workers drop their local copy of the tag.
+    """
+    client = sync_redis.Redis.from_url(
+        os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT_SECONDS,
+    )
+    try:
+        with client.pipeline() as pipe:
+            for tag in tags:
+                key = f"{CACHE_PREFIX}:tag:{tag}"
+                pipe.incr(key)
+                pipe.expire(key, TAG_VERSION_TTL_SECONDS)
+                pipe.publish(settings.CACHE_INVALIDATION_CHANNEL, f"{_SYNC_SENDER_ID} key {key}")
+            pipe.execute()
+    except sync_redis.RedisError:
+        logger.warning("Could not invalidate cache tags %s in Redis; they expire by TTL", list(tags), exc_info=True)
+    finally:
+        client.close()
+
+
+def mark_users_stale(session: Session, user_ids: Iterable[int]) -> None:
+    """
+    Invalidate the users' analytics (and the performance table) once session commits. For bulk
+    writes that bypass the ORM unit of work, which the flush hook below cannot see.
+    """
+    session.info.setdefault("analytics_stale_users", set()).update(u for u in user_ids if u is not None)
+
+
+def _now() -> float:
+    return time.time()
+
+
+def _call_detached(func, kwargs: dict):
+    """
+    Call a sync endpoint after its request has finished: the request's Session is closed by
+    then, so Session arguments get a new session on the same engine and ORM instances
+    (e.g. current_user) are reloaded into it.
+    """
+    session = None
+    call_kwargs = dict(kwargs)
+    for name, value in kwargs.items():
+        if isinstance(value, Session):
+            session = session or Session(bind=value.get_bind(), autoflush=False)
+            call_kwargs[name] = session
+    try:
+        for name, value in kwargs.items():
+            state = sa_inspect(value, raiseerr=False)
+            if session is not None and isinstance(state, InstanceState) and state.identity:
+                call_kwargs[name] = session.get(state.mapper.class_, state.identity)
+        return func(**call_kwargs)
+    finally:
+        if session is not None:
+            session.close()
+
+
+def _redis_client(backend):
+    """The asyncio Redis client behind a backend (RedisBackend or TwoTierBackend), if any."""
+    return getattr(backend, "redis", None)
+
+
+async def _acquire_lock(cache_key: str) -> Optional[str]:
+    """
+    Take the cross-worker lock for computing cache_key: a token to release it with, "" when
+    there is no Redis to lock on (or it fails; computing twice beats failing), None if held.
+    """
+    client = _redis_client(FastAPICache.get_backend())
+    if client is None:
+        return ""
+    token = uuid.uuid4().hex
+    try:
+        acquired = await client.set(f"{cache_key}:lock", token, nx=True, ex=settings.CACHE_LOCK_TTL_SECONDS)
+    except Exception:
+        logger.warning("Could not take cache lock for %s", cache_key, exc_info=True)
+        return ""
+    return token if acquired else None
+
+
+async def _release_lock(cache_key: str, token: str) -> None:
+    if not token:
+        return
+    try:
+        await _redis_client(FastAPICache.get_backend()).eval(
+            _RELEASE_LOCK_SCRIPT, 1, f"{cache_key}:lock", token
+        )
+    except Exception:
+        logger.warning("Could not release cache lock for %s; it expires by TTL", cache_key, exc_info=True)
+
+
+async def _decode_entry(cache_key: str, encoded, namespace: str = "", route: Optional[str] = None) -> Optional[dict]:
+    """
+    The decoded entry, or None if it cannot be decoded (e.g. msgpack-packed by a worker that
+    has msgpack, read by one without). Such an entry is deleted so the caller recomputes it.
+    """
+    try:
+        return FastAPICache.get_coder().decode(encoded)
+    except Exception:
+        logger.warning("Dropping undecodable cache entry %s", cache_key, exc_info=True)
+        cache_metrics.record(namespace, route, errors=1)
+    try:
+        await FastAPICache.get_backend().clear(key=cache_key)
+    except Exception:
+        logger.warning("Could not delete cache key %s", cache_key, exc_info=True)
+    return None
+
+
+async def _compute_locked(cache_key: str, compute, timeout: float):
+    """compute() under the cross-worker lock, or the entry another worker stores within timeout."""
+    token = await _acquire_lock(cache_key)
+    if token is not None:
+        try:
+            return await compute()
+        finally:
+            await _release_lock(cache_key, token)
+
+    backend = FastAPICache.get_backend()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        await asyncio.sleep(SINGLE_FLIGHT_POLL_SECONDS)
+        try:
+            encoded = await backend.get(cache_key)
+        except Exception:
+            break
+        if encoded is not None:
+            entry = await _decode_entry(cache_key, encoded)
+            if entry is None:
+                break
+            return entry["value"], encoded
+    logger.warning("Gave up waiting %.1fs for another worker to compute %s", timeout, cache_key)
+    return await compute()
+
+
+async def single_flight(cache_key: str, compute, timeout: float):
+    """
+    Run compute() (which stores the entry and returns (value, encoded)) once per key: callers
+    in this process share one future, other workers wait on the Redis lock. A caller that has
+    waited timeout seconds, or whose leader was cancelled, computes for itself. The computing
+    caller's errors (e.g. HTTPException for bad parameters) reach all waiters.
+    """
+    future = _inflight.get(cache_key)
+    if future is not None:
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Gave up waiting %.1fs for %s; computing it here", timeout, cache_key)
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise  # this caller was cancelled, not the computation
+        return await compute()
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[cache_key] = future
+    try:
+        result = await _compute_locked(cache_key, compute, timeout)
+    except asyncio.CancelledError:
+        future.cancel()  # waiters compute for themselves
+        raise
+    except BaseException as exc:
+        future.set_exception(exc)
+        future.exception()  # retrieved, even if no caller was waiting
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        _inflight.pop(cache_key, None)
+
+
+def _encode_entry(value) -> tuple:
+    """(encoded entry, size before compression) with the configured coder."""
+    coder = FastAPICache.get_coder()
+    entry = {"cached_at": _now(), "value": value}
+    if hasattr(coder, "encode_measured"):
+        return coder.encode_measured(entry)
+    encoded = coder.encode(entry)
+    return encoded, len(encoded)
+
+
+def _record_set(namespace: str, route: Optional[str], encoded, raw_size: int) -> None:
+    cache_metrics.record(
+        namespace, route, sets=1, value_bytes=len(encoded), max_value_bytes=len(encoded), raw_value_bytes=raw_size
+    )
+
+
+async def _refresh(func, kwargs: dict, cache_key: str, ttl: int, namespace: str = "") -> None:
+    token = await _acquire_lock(cache_key)
+    if token is None:
+        # Another worker is refreshing this key
+        _refreshing.discard(cache_key)
+        return
+    try:
+        if inspect.iscoroutinefunction(func):
+            value = await func(**kwargs)
+        else:
+            value = await run_in_threadpool(_call_detached, func, kwargs)
+        encoded, raw_size = _encode_entry(value)
+        with cache_metrics.timed(namespace, "set"):
+            await FastAPICache.get_backend().set(cache_key, encoded, ttl)
+        _record_set(namespace, None, encoded, raw_size)
+    except Exception:
+        logger.warning("Background refresh of cache key %s failed", cache_key, exc_info=True)
+    finally:
+        await _release_lock(cache_key, token)
+        _refreshing.discard(cache_key)
+
+
+def cached(expire: int, namespace: str = "", key_builder=None, stale_ttl: int = 0, bypass=None):
+    """
+    Like fastapi_cache.decorator.cache for GET endpoints, plus stale-while-revalidate.
+
+    Entries are fresh for expire seconds and kept stale_ttl seconds longer. A stale hit is
+    answered from the cache at once and schedules one refresh per key and process, which runs
+    after the response is sent. A miss is computed by one caller per key (see single_flight).
+    Responses carry X-Cache-Status (HIT, STALE or MISS), Age
+    (seconds since the value was computed), Cache-Control and a weak ETag.
+    Invalidated tags change the key, so writes never surface as stale entries.
+    Calls for which bypass(**endpoint kwargs) is true skip the cache (e.g. snapshot-backed ones).
+
+    The decorated endpoint has an async warm(**kwargs) that stores the entry a request with
+    those arguments (the endpoint's defaults for the rest) would read, unless it is cached.
+    """
+
+    cache_metrics.register_namespace(namespace)
+
+    def wrapper(func):
+        signature = inspect.signature(func)
+        own_params = set(signature.parameters)
+        extra = [
+            inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, annotation=annotation)
+            for name, annotation in (
+                ("request", Request), ("response", Response), ("background_tasks", BackgroundTasks)
+            )
+            if name not in own_params
+        ]
+        func.__signature__ = signature.replace(parameters=[*signature.parameters.values(), *extra])
+        # What a request without query parameters passes, so warm() builds the same key
+        defaults = {
+            name: getattr(param.default, "default", param.default)
+            for name, param in signature.parameters.items()
+            if param.default is not inspect.Parameter.empty and not isinstance(param.default, Depends)
+        }
+
+        @wraps(func)
+        async def inner(**kwargs):
+            request = kwargs.get("request")
+            response = kwargs.get("response")
+            background_tasks = kwargs.get("background_tasks")
+            func_kwargs = {name: value for name, value in kwargs.items() if name in own_params}
+
+            async def call():
+                if inspect.iscoroutinefunction(func):
+                    return await func(**func_kwargs)
+                return await run_in_threadpool(func, **func_kwargs)
+
+            if (
+                request is not None and request.headers.get("Cache-Control") in ("no-store", "no-cache")
+            ) or not FastAPICache.get_enable() or (bypass is not None and bypass(**func_kwargs)):
+                return await call()
+
+            backend = FastAPICache.get_backend()
+            build_key = key_builder or FastAPICache.get_key_builder()
+            key_kwargs = {name: value for name, value in kwargs.items() if name not in ("request", "response")}
+            cache_key = build_key(func, namespace, request=request, response=response, args=(), kwargs=key_kwargs)
+            if inspect.isawaitable(cache_key):
+                cache_key = await cache_key
+
+            route = getattr(request.scope.get("route"), "path", None) if request is not None else None
+            try:
+                with cache_metrics.timed(namespace, "get", route):
+                    encoded = await backend.get(cache_key)
+            except Exception:
+                logger.warning("Error retrieving cache key %s from backend", cache_key, exc_info=True)
+                cache_metrics.record(namespace, route, errors=1)
+                encoded = None
+
+            entry = None if encoded is None else await _decode_entry(cache_key, encoded, namespace, route)
+            if entry is not None:
+                age = max(0, int(_now() - entry["cached_at"]))
+                if age < expire:
+                    cache_status, cache_control = "HIT", f"max-age={expire - age}"
+                    cache_metrics.record(namespace, route, hits=1)
+                else:
+                    cache_status, cache_control = "STALE", f"max-age=0, stale-while-revalidate={stale_ttl}"
+                    cache_metrics.record(namespace, route, stale_hits=1)
+                    if cache_key not in _refreshing and background_tasks is not None:
+                        _refreshing.add(cache_key)
+                        background_tasks.add_task(
+                            _refresh, func, func_kwargs, cache_key, expire + stale_ttl, namespace
+                        )
+                value = entry["value"]
+            else:
+                async def compute():
+                    value = await call()
+                    encoded, raw_size = _encode_entry(value)
+                    try:
+                        with cache_metrics.timed(namespace, "set", route):
+                            await backend.set(cache_key, encoded, expire + stale_ttl)
+                        _record_set(namespace, route, encoded, raw_size)
+                    except Exception:
+                        logger.warning("Error setting cache key %s in backend", cache_key, exc_info=True)
+                        cache_metrics.record(namespace, route, errors=1)
+                    return value, encoded
+
+                age, cache_status, cache_control = 0, "MISS", f"max-age={expire}"
+                cache_metrics.record(namespace, route, misses=1)
+                value, encoded = await single_flight(cache_key, compute, settings.CACHE_SINGLE_FLIGHT_TIMEOUT_SECONDS)
+
+            if response is not None:
+                etag = f'W/"{zlib.crc32(encoded.encode() if isinstance(encoded, str) else encoded):08x}"'
+                response.headers.update({
+                    CACHE_STATUS_HEADER: cache_status, AGE_HEADER: str(age),
+                    "Cache-Control": cache_control, "ETag": etag,
+                })
+                if request is not None and request.headers.get("if-none-match") == etag:
+                    response.status_code = 304
+                    return response
+            return value
+
+        async def warm(**kwargs) -> bool:
+            """
+            Compute and store the entry for kwargs (endpoint arguments such as db and current_user)
+            unless it is cached. Returns whether it was computed here. Sync endpoints run in a
+            worker thread with the given Session, so it must not be used meanwhile.
+            """
+            func_kwargs = {**defaults, **kwargs}
+            build_key = key_builder or FastAPICache.get_key_builder()
+            cache_key = build_key(func, namespace, request=None, response=None, args=(), kwargs=func_kwargs)
+            if inspect.isawaitable(cache_key):
+                cache_key = await cache_key
+            backend = FastAPICache.get_backend()
+            encoded = await backend.get(cache_key)
+            if encoded is not None and await _decode_entry(cache_key, encoded, namespace) is not None:
+                return False
+
+            async def compute():
+                if inspect.iscoroutinefunction(func):
+                    value = await func(**func_kwargs)
+                else:
+                    value = await run_in_threadpool(func, **func_kwargs)
+                encoded, raw_size = _encode_entry(value)
+                with cache_metrics.timed(namespace, "set"):
+                    await backend.set(cache_key, encoded, expire + stale_ttl)
+                _record_set(namespace, None, encoded, raw_size)
+                cache_metrics.record(namespace, warmed=1)
+                return value, encoded
+
+            await single_flight(cache_key, compute, settings.CACHE_SINGLE_FLIGHT_TIMEOUT_SECONDS)
+            return True
+
+        inner.warm = warm
+        return inner
+
+    return wrapper
+
+
+def key_pattern(namespace: Optional[str] = None, user_id: Optional[int] = None) -> str:
+    """Glob matching cached entries of one namespace and/or user (entries only, never tag versions)."""
+    pattern = f"{FastAPICache.get_prefix()}:{namespace}:*" if namespace else f"{FastAPICache.get_prefix()}:*"
+    if user_id is not None:
+        # Keys embed "user:<id>@<version>" (user tag) and/or ":user:<id>:" (per-user entries)
+        pattern += f"user:{user_id}[@:]*"
+    return pattern
+
+
+async def find_keys(pattern: str, limit: Optional[int] = None) -> List[str]:
+    """Up to limit backend keys matching pattern: SCAN on Redis, a walk of the store in memory."""
+    backend = FastAPICache.get_backend()
+    client = _redis_client(backend)
+    keys = []
+    if client is not None:
+        async for key in client.scan_iter(match=pattern, count=500):
+            keys.append(key.decode() if isinstance(key, bytes) else key)
+            if limit is not None and len(keys) >= limit:
+                break
+    else:
+        store = getattr(getattr(backend, "remote", backend), "_store", {})
+        keys = [key for key in list(store) if fnmatch.fnmatchcase(key, pattern)][:limit]
+    return [key for key in keys if cache_metrics.namespace_of(key) != "tag"]
+
+
+async def describe_keys(keys: Iterable[str]) -> List[dict]:
+    """Namespace, remaining TTL and stored size of each key, read from the shared tier."""
+    backend = FastAPICache.get_backend()
+    shared = getattr(backend, "remote", backend)
+    described = []
+    for key in keys:
+        ttl, value = await shared.get_with_ttl(key)
+        if value is None:
+            continue
+        described.append({
+            "key": key, "namespace": cache_metrics.namespace_of(key), "ttl": ttl, "bytes": len(value),
+        })
+    return described
+
+
+async def purge_keys(namespace: Optional[str] = None, user_id: Optional[int] = None) -> int:
+    """
+    Delete cached entries of a namespace and/or user from every tier (other workers hear of it
+    via pub/sub). Purging a user also starts a new version of their tag. Returns entries deleted.
+    """
+    backend = FastAPICache.get_backend()
+    purged = 0
+    for key in await find_keys(key_pattern(namespace, user_id)):
+        try:
+            await backend.clear(key=key)
+        except KeyError:  # expired meanwhile
+            continue
+        cache_metrics.record(cache_metrics.namespace_of(key), purged=1)
+        purged += 1
+    if user_id is not None:
+        await invalidate_tags([user_tag(user_id)])
+    logger.info("Purged %s cache entries (namespace=%s, user=%s)", purged, namespace, user_id)
+    return purged
+
+
+def _task_user_ids(task: Task) -> set:
+    """Owner and assignee ids of a task, before and after the pending change."""
+    user_ids = set()
+    for field in ("owner_id", "assigned_to"):
+        history = attributes.get_history(task, field)
+        user_ids.update(v for v in (*history.added, *history.unchanged, *history.deleted) if v is not None)
+    return user_ids
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_stale_users(session: Session, flush_context) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Task):
+            session.info.setdefault("analytics_stale_users", set()).update(_task_user_ids(obj))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    user_ids = session.info.pop("analytics_stale_users", None)
+    if user_ids:
+        invalidate_tags_from_thread([PERFORMANCE_TAG, *(user_tag(u) for u in user_ids)])
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_stale_users(session: Session) -> None:
+    session.info.pop("analytics_stale_users", None)
@@ -0,0 +1,360 @@
+"""
+Cache backends.
+
+TwoTierBackend: a bounded in-process LRU in front of a shared backend (Redis).
+
+Hot keys such as a user's summary entry and its tag version are answered from local memory.
+Every set or clear is published on a Redis pub/sub channel, and other workers drop the key
+from their LRU, so a tag bump in one worker reaches the rest within one message. Local
+entries also expire after a short TTL, which bounds staleness if a message is ever lost.
+
+FailoverBackend: a circuit breaker that serves from an in-memory backend while Redis fails
+its health probe (or requests to it fail), and switches back once Redis answers again.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from fastapi_cache.backends import Backend
+
+from app.utils import cache_metrics
+
+logger = logging.getLogger(__name__)
+
+# Listener reconnect backoff: doubles per failed attempt up to the max
+_RECONNECT_DELAY_SECONDS = 1.0
+_MAX_RECONNECT_DELAY_SECONDS = 30.0
+
+
+class LocalLRU:
+    """Bounded LRU of (expires_at, value) with a per-entry TTL. Not thread-safe; used from the event loop."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Tuple[float, str]]:
+        """(expires_at, value), or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, value: str, expire: Optional[float] = None) -> None:
+        """Keep value for the local TTL, or less if the shared entry expires sooner."""
+        ttl = self.ttl_seconds if not expire or expire < 0 else min(self.ttl_seconds, expire)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self.evictions += 1
+            cache_metrics.record_eviction(evicted)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        if namespace is None:
+            self._entries.clear()
+            return
+        for key in [k for k in self._entries if k.startswith(namespace)]:
+            del self._entries[key]
+
+
+class TwoTierBackend(Backend):
+    """
+    fastapi-cache backend reading through a LocalLRU to remote. redis (an asyncio client) carries
+    invalidations between workers; without it the backend only keeps its own LRU coherent.
+    Call start() once the event loop runs and stop() on shutdown.
+    """
+
+    def __init__(self, remote: Backend, redis=None, channel: str = "cache-invalidate",
+                 max_entries: int = 10000, local_ttl_seconds: float = 30, subscriber=None):
+        self.remote = remote
+        self.redis = redis
+        # Client for the pub/sub listener; it idles between messages, so it should have no read timeout
+        self.subscriber = subscriber or redis
+        self.channel = channel
+        self.local = LocalLRU(max_entries, local_ttl_seconds)
+        self.sender_id = uuid.uuid4().hex
+        self.local_hits = 0
+        self.remote_hits = 0
+        self.misses = 0
+        self._listener = None
+
+    # --- Backend -----------------------------------------------------------------------------
+
+    async def get_with_ttl(self, key: str) -> Tuple[int, Optional[str]]:
+        entry = self.local.get(key)
+        if entry is not None:
+            self.local_hits += 1
+            return max(0, int(entry[0] - time.monotonic())), entry[1]
+        ttl, value = await self.remote.get_with_ttl(key)
+        if value is None:
+            self.misses += 1
+            return 0, None
+        self.remote_hits += 1
+        self.local.set(key, value, ttl)
+        return ttl, value
+
+    async def get(self, key: str) -> Optional[str]:
+        return (await self.get_with_ttl(key))[1]
+
+    async def set(self, key: str, value: str, expire: Optional[int] = None) -> None:
+        await self.remote.set(key, value, expire)
+        self.local.set(key, value, expire)
+        await self._publish("key", key)
+
+    async def clear(self, namespace: Optional[str] = None, key: Optional[str] = None) -> int:
+        count = await self.remote.clear(namespace, key)
+        if namespace:
+            self.local.clear(namespace)
+            await self._publish("ns", namespace)
+        elif key:
+            self.local.delete(key)
+            await self._publish("key", key)
+        return count
+
+    # --- invalidation ------------------------------------------------------------------------
+
+    async def _publish(self, op: str, target: str) -> None:
+        if self.redis is None:
+            return
+        try:
+            await self.redis.publish(self.channel, f"{self.sender_id} {op} {target}")
+        except Exception:
+            logger.warning("Could not publish cache invalidation for %s", target, exc_info=True)
+
+    def handle_message(self, message) -> None:
+        """Apply one invalidation from the channel: "<sender id> key <key>" or "<sender id> ns <namespace>"."""
+        if isinstance(message, bytes):
+            message = message.decode()
+        sender, op, target = message.split(" ", 2)
+        if sender == self.sender_id:
+            return
+        if op == "ns":
+            self.local.clear(target)
+        else:
+            self.local.delete(target)
+
+    async def _listen(self) -> None:
+        delay = _RECONNECT_DELAY_SECONDS
+        while True:
+            try:
+                async with self.subscriber.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    # Messages may have been missed while unsubscribed
+                    self.local.clear()
+                    delay = _RECONNECT_DELAY_SECONDS
+                    async for message in pubsub.listen():
+                        if message.get("type") == "message":
+                            self.handle_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Cache invalidation listener lost Redis (%s); resubscribing in %.0fs", exc, delay)
+                self.local.clear()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, _MAX_RECONNECT_DELAY_SECONDS)
+
+    def start(self) -> None:
+        if self.redis is not None and self._listener is None:
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    # --- reporting ---------------------------------------------------------------------------
+
+    def stats(self) -> dict:
+        """Lookups served by each tier; ratios are fractions of all lookups."""
+        lookups = self.local_hits + self.remote_hits + self.misses
+        return {
+            "lookups": lookups,
+            "local_hits": self.local_hits,
+            "remote_hits": self.remote_hits,
+            "misses": self.misses,
+            "local_hit_ratio": self.local_hits / lookups if lookups else 0.0,
+            "remote_hit_ratio": self.remote_hits / lookups if lookups else 0.0,
+            "local_entries": len(self.local),
+            "local_evictions": self.local.evictions,
+        }
+
+
+class FailoverBackend(Backend):
+    """
+    Circuit breaker between primary (Redis-backed) and fallback (in-memory). The breaker opens
+    after failure_threshold consecutive failed health probes or primary calls; while open, all
+    calls go to fallback and only the probe touches Redis. The first successful probe closes it.
+
+    Tag versions that could not be written to primary are replayed by the next successful probe,
+    so entries cached in Redis before an outage cannot outlive invalidations made during it.
+    """
+
+    def __init__(self, primary: Backend, fallback: Backend, redis, failure_threshold: int = 3,
+                 probe_interval_seconds: float = 5, probe_timeout_seconds: float = 1):
+        self.primary = primary
+        self.fallback = fallback
+        self.probe_client = redis
+        self.failure_threshold = failure_threshold
+        self.probe_interval_seconds = probe_interval_seconds
+        self.probe_timeout_seconds = probe_timeout_seconds
+        self.is_open = False
+        self.consecutive_failures = 0
+        self.trips = 0
+        self._pending_tags = {}
+        self._prober = None
+
+    @property
+    def active(self) -> Backend:
+        return self.fallback if self.is_open else self.primary
+
+    @property
+    def redis(self):
+        """Redis client for locks and key scans, only while Redis is in use."""
+        return getattr(self.active, "redis", None)
+
+    @property
+    def remote(self) -> Backend:
+        """The shared tier of the backend in use (see app.utils.cache.describe_keys)."""
+        return getattr(self.active, "remote", self.active)
+
+    # --- breaker -----------------------------------------------------------------------------
+
+    def _record_failure(self, trip: bool = False) -> None:
+        self.consecutive_failures += 1
+        if not self.is_open and (trip or self.consecutive_failures >= self.failure_threshold):
+            self.is_open = True
+            self.trips += 1
+            self._clear_fallback()
+            logger.error("Redis unhealthy after %s failures; caching in memory", self.consecutive_failures)
+
+    async def _flush_pending_tags(self) -> None:
+        while self._pending_tags:
+            key, (value, expire) = next(iter(self._pending_tags.items()))
+            await self.primary.set(key, value, expire)
+            del self._pending_tags[key]
+
+    async def _close(self) -> None:
+        local = getattr(self.primary, "local", None)
+        if local is not None:
+            local.clear()
+        self._clear_fallback()
+        self.is_open = False
+        logger.warning("Redis healthy again; caching in Redis")
+
+    def _clear_fallback(self) -> None:
+        store = getattr(self.fallback, "_store", None)
+        if store is not None:
+            store.clear()
+
+    async def probe(self, open_on_failure: bool = False) -> bool:
+        """
+        Ping Redis once; close the breaker on success, count a failure otherwise (open it at
+        once with open_on_failure, e.g. at startup). Returns whether Redis answered.
+        """
+        try:
+            await asyncio.wait_for(self.probe_client.ping(), self.probe_timeout_seconds)
+        except Exception as exc:
+            logger.debug("Redis health probe failed: %s", exc)
+            self._record_failure(trip=open_on_failure)
+            return False
+        self.consecutive_failures = 0
+        try:
+            await self._flush_pending_tags()
+            if self.is_open:
+                await self._close()
+        except Exception:
+            logger.warning("Could not restore cache tags to Redis", exc_info=True)
+            self._record_failure()
+            return False
+        return True
+
+    async def _probe_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.probe_interval_seconds)
+            await self.probe()
+
+    def start(self) -> None:
+        start = getattr(self.primary, "start", None)
+        if start is not None:
+            start()
+        if self._prober is None:
+            self._prober = asyncio.get_running_loop().create_task(self._probe_forever())
+
+    async def stop(self) -> None:
+        if self._prober is not None:
+            self._prober.cancel()
+            try:
+                await self._prober
+            except asyncio.CancelledError:
+                pass
+            self._prober = None
+        stop = getattr(self.primary, "stop", None)
+        if stop is not None:
+            await stop()
+
+    async def _call(self, operation: str, *args):
+        if not self.is_open:
+            try:
+                result = await getattr(self.primary, operation)(*args)
+            except Exception as exc:
+                logger.warning("Redis cache %s failed: %s", operation, exc)
+                self._record_failure()
+            else:
+                self.consecutive_failures = 0
+                return result
+        return await getattr(self.fallback, operation)(*args)
+
+    # --- Backend -----------------------------------------------------------------------------
+
+    async def get_with_ttl(self, key: str) -> Tuple[int, Optional[str]]:
+        return await self._call("get_with_ttl", key)
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._call("get", key)
+
+    async def set(self, key: str, value: str, expire: Optional[int] = None) -> None:
+        if not self.is_open:
+            try:
+                await self.primary.set(key, value, expire)
+            except Exception as exc:
+                logger.warning("Redis cache set failed: %s", exc)
+                self._record_failure()
+            else:
+                self.consecutive_failures = 0
+                return
+        if cache_metrics.namespace_of(key) == "tag":
+            # Written to Redis by the next successful probe
+            self._pending_tags[key] = (value, expire)
+        await self.fallback.set(key, value, expire)
+
+    async def clear(self, namespace: Optional[str] = None, key: Optional[str] = None) -> int:
+        return await self._call("clear", namespace, key)
+
+    def stats(self) -> dict:
+        primary_stats = self.primary.stats() if hasattr(self.primary, "stats") else {}
+        return {
+            "redis_healthy": not self.is_open,
+            "breaker_trips": self.trips,
+            "consecutive_failures": self.consecutive_failures,
+            **primary_stats,
+        }
@@ -0,0 +1,63 @@
+"""
+Compact cache coder: values are made JSON-compatible (jsonable_encoder), packed with msgpack
+when it is installed (JSON otherwise), and zlib-compressed once the packed form reaches
+CACHE_COMPRESS_MIN_BYTES. Large trends or performance payloads shrink several times over, so
+Redis holds less and every hit moves fewer bytes; small entries skip the compression cost.
+
+Encoded values are bytes starting with a two-byte header: format ("m" msgpack, "j" JSON) and
+compression ("z" zlib, "-" none). The Redis client must therefore not decode responses.
+Values written by fastapi-cache's JsonCoder (text starting with "{", "[" or '"') still decode.
+"""
+import json
+import zlib
+from typing import Any, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from fastapi_cache.coder import Coder, JsonCoder
+
+from app.config import settings
+
+try:
+    import msgpack
+except ImportError:  # optional: JSON is used without it
+    msgpack = None
+
+
+def _pack(data) -> Tuple[bytes, bytes]:
+    if msgpack is not None:
+        return b"m", msgpack.packb(data, use_bin_type=True)
+    return b"j", json.dumps(data, separators=(",", ":")).encode()
+
+
+def _unpack(fmt: bytes, payload: bytes):
+    if fmt == b"m":
+        if msgpack is None:
+            raise ValueError("Cached value is msgpack-encoded but msgpack is not installed")
+        return msgpack.unpackb(payload, raw=False)
+    return json.loads(payload)
+
+
+class CompactCoder(Coder):
+    @classmethod
+    def encode_measured(cls, value: Any) -> Tuple[bytes, int]:
+        """(encoded bytes, size before compression)."""
+        fmt, payload = _pack(jsonable_encoder(value))
+        raw_size = len(payload)
+        if raw_size >= settings.CACHE_COMPRESS_MIN_BYTES:
+            compressed = zlib.compress(payload, settings.CACHE_COMPRESSION_LEVEL)
+            if len(compressed) < raw_size:
+                return fmt + b"z" + compressed, raw_size
+        return fmt + b"-" + payload, raw_size
+
+    @classmethod
+    def encode(cls, value: Any) -> bytes:
+        return cls.encode_measured(value)[0]
+
+    @classmethod
+    def decode(cls, value) -> Any:
+        if isinstance(value, str) or value[:1] in (b"{", b"[", b'"'):
+            return JsonCoder.decode(value)
+        fmt, compression, payload = value[:1], value[1:2], value[2:]
+        if compression == b"z":
+            payload = zlib.decompress(payload)
+        return _unpack(fmt, payload)
@@ -0,0 +1,95 @@
+"""
+In-process cache metrics: hits, stale hits, misses, sets, warmed entries, evictions, value
+sizes (stored and before compression) and backend latency, per cache namespace and per route.
+Counters cover this worker since it started.
+"""
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Optional
+
+# Namespaces of @cached endpoints, so backend keys can be attributed to one (see namespace_of)
+_namespaces = set()
+_lock = threading.Lock()
+_by_namespace = defaultdict(lambda: defaultdict(float))
+_by_route = defaultdict(lambda: defaultdict(float))
+
+# Counters reported as integers; the rest are sums of seconds
+_COUNT_FIELDS = (
+    "hits", "stale_hits", "misses", "sets", "warmed", "evictions", "purged", "errors",
+    "value_bytes", "raw_value_bytes", "max_value_bytes", "get_calls", "set_calls",
+)
+
+
+def register_namespace(namespace: str) -> None:
+    _namespaces.add(namespace)
+
+
+def namespace_of(key: str) -> str:
+    """Namespace of a backend key ("<prefix>:<namespace>:..."); "tag" for tag versions, "other" if unknown."""
+    rest = key.split(":", 1)[1] if ":" in key else key
+    matches = [ns for ns in _namespaces if rest.startswith(f"{ns}:")]
+    if matches:
+        return max(matches, key=len)
+    if rest.startswith("tag:"):
+        return "tag"
+    return "other"
+
+
+def record(namespace: str, route: Optional[str] = None, **increments) -> None:
+    """Add increments to the namespace's (and route's) counters; max_value_bytes keeps the maximum."""
+    with _lock:
+        for bucket in (_by_namespace[namespace], _by_route[route] if route else None):
+            if bucket is None:
+                continue
+            for field, amount in increments.items():
+                if field == "max_value_bytes":
+                    bucket[field] = max(bucket[field], amount)
+                else:
+                    bucket[field] += amount
+
+
+def record_eviction(key: str) -> None:
+    record(namespace_of(key), evictions=1)
+
+
+@contextmanager
+def timed(namespace: str, operation: str, route: Optional[str] = None):
+    """Time one backend call: adds to <operation>_seconds and <operation>_calls."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(namespace, route, **{f"{operation}_seconds": time.perf_counter() - start, f"{operation}_calls": 1})
+
+
+def _summary(counters: dict) -> dict:
+    summary = {field: int(counters.get(field, 0)) for field in _COUNT_FIELDS}
+    lookups = summary["hits"] + summary["stale_hits"] + summary["misses"]
+    summary["hit_ratio"] = (summary["hits"] + summary["stale_hits"]) / lookups if lookups else 0.0
+    summary["avg_value_bytes"] = summary["value_bytes"] / summary["sets"] if summary["sets"] else 0.0
+    # Bytes before compression per byte stored (1.0 when nothing was compressed)
+    summary["compression_ratio"] = (
+        summary["raw_value_bytes"] / summary["value_bytes"] if summary["value_bytes"] else 1.0
+    )
+    for operation in ("get", "set"):
+        calls = summary[f"{operation}_calls"]
+        seconds = counters.get(f"{operation}_seconds", 0.0)
+        summary[f"avg_{operation}_ms"] = seconds * 1000 / calls if calls else 0.0
+    return summary
+
+
+def snapshot() -> dict:
+    """{"namespaces": {namespace: summary}, "routes": {route: summary}}."""
+    with _lock:
+        return {
+            "namespaces": {ns: _summary(c) for ns, c in sorted(_by_namespace.items())},
+            "routes": {route: _summary(c) for route, c in sorted(_by_route.items())},
+        }
+
+
+def reset() -> None:
+    with _lock:
+        _by_namespace.clear()
+        _by_route.clear()
@@ -10,3 +10,55 @@ def send_email_task(email_to: str, subject: str, body: str):
     Since send_simple_email is async, we need to run it synchronously here.
     """
     async_to_sync(send_simple_email)(subject, email_to, body)
+
+
+@celery_app.task(acks_late=True)
+def archive_tasks_task(older_than_days: int = None, batch_size: int = None):
+    """Celery task: move old done and soft-deleted tasks to the archive tables."""
+    from app.database import SessionLocal
+    from app.services.archive_service import archive_tasks
+
+    db = SessionLocal()
+    try:
+        return archive_tasks(db, older_than_days=older_than_days, batch_size=batch_size)
+    finally:
+        db.close()
+
+
+@celery_app.task(acks_late=True)
+def purge_deleted_task(retention_days: int = None, batch_size: int = None):
+    """Celery task: hard-delete soft-deleted rows past retention and remove orphaned blobs."""
+    from app.database import SessionLocal
+    from app.services.gc_service import purge_deleted
+
+    db = SessionLocal()
+    try:
+        return purge_deleted(db, retention_days=retention_days, batch_size=batch_size)
+    finally:
+        db.close()
+
+
+@celery_app.task(acks_late=True)
+def reconcile_task_counters_task():
+    """Celery task: recompute per-owner task counters and correct any drift."""
+    from app.database import SessionLocal
+    from app.services.stats_service import reconcile_task_counters
+
+    db = SessionLocal()
+    try:
+        return reconcile_task_counters(db)
+    finally:
+        db.close()
+
+
+@celery_app.task(acks_late=True)
+def refresh_analytics_snapshots_task():
+    """Celery task: precompute user performance and 7/30/90-day trends snapshots."""
+    from app.database import SessionLocal
+    from app.services.snapshot_service import refresh_snapshots
+
+    db = SessionLocal()
+    try:
+        return refresh_snapshots(db)
+    finally:
+        db.close()
@@ -1,60 +1,64 @@
 """One-time migration to sync completed field with status field.
 
 This script ensures data consistency after implementing the single-source-of-truth status model.
-Run this once during deployment.
+Run this once during deployment, from the backend dir: python migrations/sync_completed_field.py
+
+Status is stored as a small-integer code, so the updates go through the Task columns (which
+encode "done") rather than raw SQL. Bulk updates skip the ORM hooks that maintain
+task_daily_stats and task_counters, so both are rebuilt afterwards.
 """
-from sqlalchemy import text
-from app.database import SessionLocal
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+load_dotenv()
 
 
 def sync_completed_field():
     """Sync completed field based on status field for all existing tasks."""
+    from sqlalchemy import func, update
+
+    from app.database import SessionLocal
+    from app.models import user, task, comment, file, archive, stats, task_history  # noqa: F401
+    from app.models.task import Task
+    from app.services.stats_service import rebuild_daily_stats, reconcile_task_counters
+
     db = SessionLocal()
     try:
+        done = Task.status == "done"
         # Update completed field based on status
-        db.execute(text("""
-            UPDATE tasks
-            SET completed = (status = 'done')
-        """))
-        
+        db.execute(update(Task).values(completed=done))
+
         # Update completed_at for tasks that are done but don't have completed_at set
-        db.execute(text("""
-            UPDATE tasks
-            SET completed_at = updated_at
-            WHERE status = 'done' 
-              AND completed_at IS NULL
-        """))
-        
+        db.execute(update(Task).where(done, Task.completed_at == None).values(completed_at=Task.updated_at))
+
         # Clear completed_at for tasks that are not done
-        db.execute(text("""
-            UPDATE tasks
-            SET completed_at = NULL
-            WHERE status != 'done' 
-              AND completed_at IS NOT NULL
-        """))
-        
+        db.execute(update(Task).where(Task.status != "done", Task.completed_at != None).values(completed_at=None))
+
         db.commit()
-        
+
+        # completed_at moved, so the daily rollup and counters are recomputed from the tasks
+        rebuild_daily_stats(db)
+        reconcile_task_counters(db)
+
         # Verify the migration
-        result = db.execute(text("""
-            SELECT 
-                status,
-                COUNT(*) as total,
-                SUM(CASE WHEN completed = true THEN 1 ELSE 0 END) as completed_count,
-                SUM(CASE WHEN completed_at IS NOT NULL THEN 1 ELSE 0 END) as has_completed_at
-            FROM tasks
-            WHERE is_deleted = false
-            GROUP BY status
-        """))
-        
+        result = db.query(
+            Task.status,
+            func.count(Task.id).label("total"),
+            func.count(Task.id).filter(Task.completed == True).label("completed_count"),
+            func.count(Task.completed_at).label("has_completed_at"),
+        ).filter(Task.is_deleted == False).group_by(Task.status).all()
+
         print("\nMigration verification:")
         print("Status | Total | Completed | Has completed_at")
         print("-" * 50)
         for row in result:
             print(f"{row.status:12} | {row.total:5} | {row.completed_count:9} | {row.has_completed_at:16}")
-        
+
         print("\nMigration completed successfully!")
-        
+
     except Exception as e:
         db.rollback()
         print(f"Migration failed: {e}")
@@ -0,0 +1,42 @@
+"""
+Move done tasks (and soft-deleted tasks) older than N days, with their comments and files,
+into the archived_* tables. Runs in committed batches; safe to re-run.
+
+Run from backend dir: python scripts/archive_tasks.py [--days 180] [--batch-size 500] [--max-batches N]
+Uses app database (DATABASE_URL from .env or default app.db).
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive old done and soft-deleted tasks.")
+    parser.add_argument("--days", type=int, default=None, help="Age threshold (default: ARCHIVE_AFTER_DAYS)")
+    parser.add_argument("--batch-size", type=int, default=None, help="Tasks per commit (default: ARCHIVE_BATCH_SIZE)")
+    parser.add_argument("--max-batches", type=int, default=None, help="Stop after this many batches")
+    args = parser.parse_args()
+
+    from app.database import SessionLocal
+    from app.services.archive_service import archive_tasks
+
+    db = SessionLocal()
+    try:
+        archived = archive_tasks(
+            db,
+            older_than_days=args.days,
+            batch_size=args.batch_size,
+            max_batches=args.max_batches,
+        )
+        print(f"Archived {archived} task(s).")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
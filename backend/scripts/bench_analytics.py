@@ -0,0 +1,209 @@
+"""
+Benchmark: analytics for a large tenant computed three ways, with latency and peak Python memory.
+
+  orm       load Task objects and count in Python (the original approach)
+  columnar  stream five columns from a server-side cursor into NumPy arrays and use
+            bincount/searchsorted (only if numpy is installed; it is not a dependency)
+  sql       analytics_service as shipped: counters row, daily rollup, grouped aggregates
+
+Seeds a throwaway SQLite database (never touches DATABASE_URL).
+Run from backend dir: python scripts/bench_analytics.py [--tasks 1000000] [--users 50] [--runs 3]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import SmallInteger, create_engine, insert, select, type_coerce
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import user, task, comment, file, archive, stats, task_history  # noqa: F401
+from app.models.task import TASK_PRIORITIES, TASK_STATUSES, Task
+from app.models.user import User
+from app.services import analytics_service
+from app.services.stats_service import rebuild_daily_stats, reconcile_task_counters
+
+try:
+    import numpy as np
+except ImportError:  # optional: only the columnar strategy needs it
+    np = None
+
+DONE = TASK_STATUSES.index("done")
+TREND_DAYS = 30
+
+
+def seed(db, n_tasks, n_users):
+    owners = [User(email=f"bench{i}@example.com", hashed_password="x") for i in range(n_users)]
+    db.add_all(owners)
+    db.commit()
+    owner_ids = [o.id for o in owners]
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    rows = []
+    for i in range(n_tasks):
+        created = now - timedelta(minutes=rng.randint(0, 60 * 24 * 365))
+        status = rng.choice(TASK_STATUSES)
+        rows.append({
+            "title": f"Task {i}",
+            "priority": rng.choice(TASK_PRIORITIES),
+            "status": status,
+            "due_date": now + timedelta(days=rng.randint(-30, 30)) if rng.random() < 0.5 else None,
+            "created_at": created,
+            "updated_at": created,
+            "completed_at": created + timedelta(hours=rng.randint(1, 500)) if status == "done" else None,
+            "owner_id": rng.choice(owner_ids),
+        })
+        if len(rows) == 20_000:
+            db.execute(insert(Task), rows)
+            rows = []
+    if rows:
+        db.execute(insert(Task), rows)
+    db.commit()
+    # Bulk inserts bypass the ORM hook; build the derived tables the way a backfill would
+    rebuild_daily_stats(db)
+    reconcile_task_counters(db)
+    return owner_ids
+
+
+# --- orm: materialize Task objects ---------------------------------------------------------
+
+def orm_summary(db, user_id):
+    tasks = db.query(Task).filter(Task.owner_id == user_id, Task.is_deleted == False).all()
+    return len(tasks), Counter(t.status for t in tasks), Counter(t.priority for t in tasks)
+
+
+def orm_trends(db, user_id):
+    start = datetime.utcnow().date() - timedelta(days=TREND_DAYS - 1)
+    tasks = db.query(Task).filter(Task.owner_id == user_id, Task.is_deleted == False).all()
+    created = Counter(t.created_at.date() for t in tasks if t.created_at.date() >= start)
+    completed = Counter(t.completed_at.date() for t in tasks if t.completed_at and t.completed_at.date() >= start)
+    return created, completed
+
+
+def orm_performance(db, user_ids):
+    tasks = db.query(Task).filter(Task.is_deleted == False).all()
+    assigned = Counter(t.owner_id for t in tasks)
+    done = Counter(t.owner_id for t in tasks if t.status == "done")
+    return {u: (assigned[u], done[u]) for u in user_ids}
+
+
+# --- columnar: NumPy arrays from a server-side cursor -------------------------------------
+
+def load_columns(db, *conditions):
+    """created/completed as epoch seconds (NaN for none), status/priority codes, owner ids."""
+    stmt = select(
+        Task.created_at, Task.completed_at,
+        type_coerce(Task.status, SmallInteger), type_coerce(Task.priority, SmallInteger), Task.owner_id,
+    ).where(Task.is_deleted == False, *conditions)
+    chunks = []
+    for partition in db.execute(stmt.execution_options(yield_per=50_000)).partitions():
+        created, completed, status, priority, owner = zip(*partition)
+        chunks.append((
+            np.array([c.timestamp() for c in created], dtype=np.float64),
+            np.array([c.timestamp() if c else np.nan for c in completed], dtype=np.float64),
+            np.array(status, dtype=np.int8),
+            np.array(priority, dtype=np.int8),
+            np.array(owner, dtype=np.int32),
+        ))
+    if not chunks:
+        return [np.empty(0)] * 5
+    return [np.concatenate(parts) for parts in zip(*chunks)]
+
+
+def columnar_summary(db, user_id):
+    _, _, status, priority, _ = load_columns(db, Task.owner_id == user_id)
+    return len(status), np.bincount(status, minlength=3), np.bincount(priority, minlength=3)
+
+
+def columnar_trends(db, user_id):
+    created, completed, _, _, _ = load_columns(db, Task.owner_id == user_id)
+    today = datetime.combine(datetime.utcnow().date(), datetime.min.time())
+    edges = np.array([(today - timedelta(days=d)).timestamp() for d in range(TREND_DAYS - 1, -2, -1)])
+    created_per_day = np.bincount(np.searchsorted(edges, created, side="right"), minlength=TREND_DAYS + 2)
+    done = completed[~np.isnan(completed)]
+    completed_per_day = np.bincount(np.searchsorted(edges, done, side="right"), minlength=TREND_DAYS + 2)
+    return created_per_day[1:TREND_DAYS + 1], completed_per_day[1:TREND_DAYS + 1]
+
+
+def columnar_performance(db, user_ids):
+    _, _, status, _, owner = load_columns(db)
+    assigned = np.bincount(owner)
+    done = np.bincount(owner[status == DONE], minlength=len(assigned))
+    return {u: (int(assigned[u]), int(done[u])) for u in user_ids}
+
+
+# --- sql: what the API runs ----------------------------------------------------------------
+
+def sql_summary(db, user_id):
+    return analytics_service.get_task_summary(db, user_id)
+
+
+def sql_trends(db, user_id):
+    return analytics_service.get_task_trends(db, TREND_DAYS, user_id)
+
+
+def sql_performance(db, user_ids):
+    return analytics_service.get_user_performance(db, limit=len(user_ids))
+
+
+def measure(fn, runs):
+    """(median ms, peak MiB of Python allocations during one run)."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(samples), peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark analytics strategies on a large tenant.")
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.TemporaryDirectory()
+    engine = create_engine(f"sqlite:///{os.path.join(tmpdir.name, 'bench.db')}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        print(f"Seeding {args.tasks} tasks across {args.users} users...")
+        user_ids = seed(db, args.tasks, args.users)
+        user_id = user_ids[0]
+
+        strategies = {"orm": (orm_summary, orm_trends, orm_performance)}
+        if np is not None:
+            strategies["columnar"] = (columnar_summary, columnar_trends, columnar_performance)
+        else:
+            print("numpy not installed: skipping the columnar strategy")
+        strategies["sql"] = (sql_summary, sql_trends, sql_performance)
+
+        print(f"{'metric':<14}{'strategy':<10}{'median ms':>12}{'peak MiB':>12}")
+        for index, metric in enumerate(("summary", "trends", "performance")):
+            for name, fns in strategies.items():
+                arg = user_ids if metric == "performance" else user_id
+                ms, mib = measure(lambda: fns[index](db, arg), args.runs)
+                print(f"{metric:<14}{name:<10}{ms:>12.1f}{mib:>12.1f}")
+                db.expunge_all()
+    finally:
+        db.close()
+        engine.dispose()
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Benchmark: exporting a large tenant's tasks buffered (the original approach) and streamed,
+with latency, peak Python memory and output size per format.
+
+  buffered   .all() then the whole document in memory (CSV in a StringIO, JSON via a list of
+             dicts and json.dumps(indent=2))
+  streamed   export_service as shipped: server-side cursor, one chunk per batch of rows
+
+Streamed output is counted and dropped chunk by chunk, as a client connection would.
+Seeds a throwaway SQLite database (never touches DATABASE_URL).
+Run from backend dir: python scripts/bench_exports.py [--tasks 1000000] [--runs 1]
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import user, task, comment, file, archive, stats, task_history  # noqa: F401
+from app.models.task import TASK_PRIORITIES, TASK_STATUSES, Task
+from app.models.user import User
+from app.services import export_service
+
+
+def seed(db, n_tasks):
+    owner = User(email="bench@example.com", hashed_password="x")
+    db.add(owner)
+    db.commit()
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    rows = []
+    for i in range(n_tasks):
+        created = now - timedelta(minutes=rng.randint(0, 60 * 24 * 365))
+        status = rng.choice(TASK_STATUSES)
+        rows.append({
+            "title": f"Task {i}",
+            "description": f"Description of task {i}" if rng.random() < 0.5 else None,
+            "priority": rng.choice(TASK_PRIORITIES),
+            "status": status,
+            "completed": status == "done",
+            "created_at": created,
+            "updated_at": created,
+            "completed_at": created + timedelta(hours=rng.randint(1, 500)) if status == "done" else None,
+            "owner_id": owner.id,
+        })
+        if len(rows) == 20_000:
+            db.execute(insert(Task), rows)
+            rows = []
+    if rows:
+        db.execute(insert(Task), rows)
+    db.commit()
+    return owner.id
+
+
+# --- buffered: the original export ---------------------------------------------------------
+
+def buffered_csv(db, owner_id):
+    tasks = db.query(Task).filter(Task.owner_id == owner_id).order_by(Task.created_at.asc()).all()
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(export_service.CSV_HEADERS)
+    for t in tasks:
+        writer.writerow([
+            t.id, t.title, t.description or "", t.priority, "True" if t.completed else "False", t.owner_id,
+            t.created_at.isoformat(), t.updated_at.isoformat(),
+            t.completed_at.isoformat() if t.completed_at else "",
+        ])
+    return [output.getvalue()]
+
+
+def buffered_json(db, owner_id):
+    tasks = db.query(Task).filter(Task.owner_id == owner_id).order_by(Task.created_at.asc()).all()
+    return [json.dumps([export_service._task_json(t) for t in tasks], indent=2)]
+
+
+# --- streamed: what the API runs -----------------------------------------------------------
+
+def _chunks(db, owner_id):
+    stmt = select(*[getattr(Task, c) for c in export_service.EXPORT_COLUMNS]).where(
+        Task.owner_id == owner_id
+    ).order_by(Task.created_at.asc())
+    return export_service.stream_rows(db.get_bind(), stmt)
+
+
+STRATEGIES = {
+    "csv": {
+        "buffered": buffered_csv,
+        "streamed": lambda db, owner_id: export_service.stream_tasks_csv(_chunks(db, owner_id)),
+    },
+    "json": {
+        "buffered": buffered_json,
+        "streamed": lambda db, owner_id: export_service.stream_tasks_json(_chunks(db, owner_id)),
+        "compact": lambda db, owner_id: export_service.stream_tasks_json(_chunks(db, owner_id), compact=True),
+    },
+    "ndjson": {
+        "streamed": lambda db, owner_id: export_service.stream_tasks_ndjson(_chunks(db, owner_id)),
+    },
+}
+
+
+def drain(chunks) -> int:
+    """Bytes of output, dropping each chunk once counted."""
+    return sum(len(chunk.encode()) for chunk in chunks)
+
+
+def measure(fn, runs):
+    """(median ms, peak MiB of Python allocations during one run, output MiB)."""
+    samples = []
+    size = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        size = drain(fn())
+        samples.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    drain(fn())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(samples), peak / (1024 * 1024), size / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark buffered vs streamed task exports.")
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=1)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.TemporaryDirectory()
+    engine = create_engine(f"sqlite:///{os.path.join(tmpdir.name, 'bench.db')}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        print(f"Seeding {args.tasks} tasks...")
+        owner_id = seed(db, args.tasks)
+
+        print(f"{'format':<10}{'strategy':<10}{'median ms':>12}{'peak MiB':>12}{'output MiB':>12}")
+        for fmt, strategies in STRATEGIES.items():
+            for name, fn in strategies.items():
+                ms, mib, out = measure(lambda: fn(db, owner_id), args.runs)
+                print(f"{fmt:<10}{name:<10}{ms:>12.1f}{mib:>12.1f}{out:>12.1f}")
+                db.expunge_all()
+    finally:
+        db.close()
+        engine.dispose()
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
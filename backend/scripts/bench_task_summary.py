@@ -0,0 +1,117 @@
+"""
+Benchmark: task summary as five separate queries (original implementation), as one
+conditional-aggregate scan, and from the task_counters row that get_task_summary now reads.
+
+Seeds a throwaway SQLite database with --tasks tasks for one user (never touches DATABASE_URL).
+Run from backend dir: python scripts/bench_task_summary.py [--tasks 100000] [--runs 20]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import user, task, comment, file, archive, stats, task_history  # noqa: F401
+from app.models.task import TASK_PRIORITIES, TASK_STATUSES, Task
+from app.models.user import User
+from app.services.analytics_service import _summary_from_scan, get_task_summary
+from app.services.stats_service import reconcile_task_counters
+
+
+def legacy_task_summary(db, user_id):
+    """The previous implementation: total, completed, overdue, by-priority, by-status as five queries."""
+    base = [Task.owner_id == user_id, Task.is_deleted == False]
+    total = db.query(func.count(Task.id)).filter(*base).scalar() or 0
+    completed = db.query(func.count(Task.id)).filter(*base, Task.status == "done").scalar() or 0
+    overdue = db.query(func.count(Task.id)).filter(
+        *base, Task.status != "done", Task.due_date != None, Task.due_date < datetime.utcnow()
+    ).scalar() or 0
+    by_priority = dict(db.query(Task.priority, func.count(Task.id)).filter(*base).group_by(Task.priority).all())
+    by_status = dict(db.query(Task.status, func.count(Task.id)).filter(*base).group_by(Task.status).all())
+    return total, completed, overdue, by_priority, by_status
+
+
+def seed(db, n_tasks):
+    owner = User(email="bench@example.com", hashed_password="x")
+    db.add(owner)
+    db.commit()
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    rows = []
+    for i in range(n_tasks):
+        created = now - timedelta(minutes=rng.randint(0, 60 * 24 * 365))
+        rows.append({
+            "title": f"Task {i}",
+            "priority": rng.choice(TASK_PRIORITIES),
+            "status": rng.choice(TASK_STATUSES),
+            "is_deleted": rng.random() < 0.05,
+            "due_date": now + timedelta(days=rng.randint(-30, 30)) if rng.random() < 0.5 else None,
+            "created_at": created,
+            "updated_at": created,
+            "owner_id": owner.id,
+        })
+        if len(rows) == 10_000:
+            db.execute(insert(Task), rows)
+            rows = []
+    if rows:
+        db.execute(insert(Task), rows)
+    db.commit()
+    return owner.id
+
+
+def time_it(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), min(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark task summary query strategies.")
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.TemporaryDirectory()
+    engine = create_engine(f"sqlite:///{os.path.join(tmpdir.name, 'bench.db')}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        print(f"Seeding {args.tasks} tasks...")
+        user_id = seed(db, args.tasks)
+        # Bulk inserts bypass the ORM hook, so build the counters row the way a backfill would
+        reconcile_task_counters(db, owner_id=user_id)
+        scan_conditions = [Task.owner_id == user_id, Task.is_deleted == False]
+
+        legacy = legacy_task_summary(db, user_id)
+        for summary in (_summary_from_scan(db, scan_conditions), get_task_summary(db, user_id)):
+            assert (summary.total, summary.completed, summary.overdue) == legacy[:3], "results differ"
+
+        results = [
+            ("five queries", time_it(lambda: legacy_task_summary(db, user_id), args.runs)),
+            ("single pass", time_it(lambda: _summary_from_scan(db, scan_conditions), args.runs)),
+            ("counters row", time_it(lambda: get_task_summary(db, user_id), args.runs)),
+        ]
+        print(f"{'strategy':<22}{'median ms':>12}{'min ms':>12}")
+        for name, (median_ms, min_ms) in results:
+            print(f"{name:<22}{median_ms:>12.1f}{min_ms:>12.1f}")
+        print(f"speedup vs five queries: {results[0][1][0] / results[-1][1][0]:.2f}x")
+    finally:
+        db.close()
+        engine.dispose()
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Hard-delete soft-deleted tasks, comments and files older than the retention window
+(tasks take all their comments and files with them), then remove orphaned blobs
+under uploads/task_files. Runs in small committed batches; safe to re-run.
+
+Run from backend dir: python scripts/purge_deleted.py [--days 30] [--batch-size 500] [--sleep 0.1]
+Uses app database (DATABASE_URL from .env or default app.db).
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Purge soft-deleted rows past retention.")
+    parser.add_argument("--days", type=int, default=None, help="Retention window (default: GC_RETENTION_DAYS)")
+    parser.add_argument("--batch-size", type=int, default=None, help="Rows per commit (default: GC_BATCH_SIZE)")
+    parser.add_argument("--sleep", type=float, default=None, help="Seconds between batches (default: GC_BATCH_SLEEP_SECONDS)")
+    args = parser.parse_args()
+
+    from app.database import SessionLocal
+    from app.services.gc_service import purge_deleted
+
+    db = SessionLocal()
+    try:
+        counts = purge_deleted(
+            db,
+            retention_days=args.days,
+            batch_size=args.batch_size,
+            sleep_seconds=args.sleep,
+        )
+        print(
+            f"Purged {counts['tasks']} task(s), {counts['comments']} comment(s), "
+            f"{counts['files']} file(s); removed {counts['blobs']} blob(s)."
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
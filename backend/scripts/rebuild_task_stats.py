@@ -0,0 +1,44 @@
+"""
+Rebuild the task_daily_stats rollup from live and archived tasks, reconcile the
+task_counters rows with live tasks, and give tasks without status history a creation
+transition (for burndown and cumulative flow). Run once after the migration that adds status
+history (backfill), or any time the tables are suspected to have drifted.
+
+Run from backend dir: python scripts/rebuild_task_stats.py [--owner-id N]
+Uses app database (DATABASE_URL from .env or default app.db).
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild derived task statistics (daily rollup, counters, status history).")
+    parser.add_argument("--owner-id", type=int, default=None, help="Only rebuild this owner's rows")
+    args = parser.parse_args()
+
+    from app.database import SessionLocal
+    from app.models import user, task, comment, file, archive, stats, task_history  # noqa: F401
+    from app.services.stats_service import (
+        backfill_status_transitions, rebuild_daily_stats, reconcile_task_counters,
+    )
+
+    db = SessionLocal()
+    try:
+        rows = rebuild_daily_stats(db, owner_id=args.owner_id)
+        print(f"Wrote {rows} daily stats row(s).")
+        corrected = reconcile_task_counters(db, owner_id=args.owner_id)
+        print(f"Corrected task counters for {corrected} owner(s).")
+        transitions = backfill_status_transitions(db, owner_id=args.owner_id)
+        print(f"Backfilled {transitions} status transition(s).")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
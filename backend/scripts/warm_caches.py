@@ -0,0 +1,55 @@
+"""
+Warm analytics caches (summary entry and default trends snapshots) for the most active users,
+e.g. after a deploy or a Redis flush, so their first dashboard load is a cache hit.
+Users are warmed by a bounded pool of workers to cap the load on the database.
+
+Run from backend dir: python scripts/warm_caches.py [--users 200] [--workers 4] [--days 30]
+Uses app database (DATABASE_URL) and cache (REDIS_URL) from .env or defaults.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+
+async def warm(args) -> None:
+    from app.core.cache import init_cache
+    from app.database import SessionLocal, engine
+    from app.models import user, task, comment, file, archive, stats, task_history  # noqa: F401
+    from app.services.cache_warmer import most_active_users, warm_users
+
+    backend = await init_cache(os.getenv("REDIS_URL", "redis://localhost:6379/0"), start=False)
+    if backend.is_open:
+        print("Redis is unreachable; nothing to warm.")
+        return
+
+    db = SessionLocal()
+    try:
+        user_ids = most_active_users(db, args.users, args.days)
+    finally:
+        db.close()
+    print(f"Warming caches for {len(user_ids)} user(s) with {args.workers} worker(s)...")
+    start = time.perf_counter()
+    warmed = await warm_users(engine, user_ids, args.workers)
+    print(f"Computed {warmed} cache entr(ies) in {time.perf_counter() - start:.1f}s.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm analytics caches for the most active users.")
+    parser.add_argument("--users", type=int, default=200, help="How many of the most active users to warm")
+    parser.add_argument("--workers", type=int, default=4, help="Users warmed concurrently")
+    parser.add_argument("--days", type=int, default=30, help="Activity window used to rank users")
+    args = parser.parse_args()
+    if args.users < 1 or args.workers < 1 or args.days < 1:
+        parser.error("--users, --workers and --days must be at least 1")
+    asyncio.run(warm(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 """Verification tests for Single-Source-of-Truth Status Model."""
 import requests
-from sqlalchemy import text
+from sqlalchemy import and_, func, or_
 from app.database import SessionLocal
+from app.models import user, task, comment, file, archive, stats, task_history  # noqa: F401
+from app.models.task import Task
 
 # Test 1: Schema Rejection
 print("=" * 60)
@@ -49,34 +51,25 @@ print("=" * 60)
 
 db = SessionLocal()
 try:
-    result = db.execute(text("""
-        SELECT COUNT(*) as inconsistent_count
-        FROM tasks
-        WHERE (status = 'done' AND completed = false)
-           OR (status != 'done' AND completed = true)
-    """))
-    
-    row = result.fetchone()
-    inconsistent_count = row[0]
-    
+    # status is stored as a code; comparing through the Task column encodes "done"
+    inconsistent = or_(
+        and_(Task.status == "done", Task.completed == False),
+        and_(Task.status != "done", Task.completed == True),
+    )
+    inconsistent_count = db.query(func.count(Task.id)).filter(inconsistent).scalar()
+
     print(f"\nInconsistent records: {inconsistent_count}")
-    
+
     if inconsistent_count == 0:
         print("✅ PASS: Database invariant holds! All data is consistent.")
     else:
         print(f"❌ FAIL: Found {inconsistent_count} inconsistent records")
         print("Run the migration script to fix this:")
         print("  venv\\Scripts\\python.exe migrations\\sync_completed_field.py")
-        
+
         # Show sample inconsistent records
-        sample = db.execute(text("""
-            SELECT id, title, status, completed
-            FROM tasks
-            WHERE (status = 'done' AND completed = false)
-               OR (status != 'done' AND completed = true)
-            LIMIT 5
-        """))
-        
+        sample = db.query(Task.id, Task.title, Task.status, Task.completed).filter(inconsistent).limit(5).all()
+
         print("\nSample inconsistent records:")
         for record in sample:
             print(f"  ID {record.id}: status={record.status}, completed={record.completed}")
@@ -1,6 +1,8 @@
 """Pytest configuration and fixtures."""
 import pytest
 from fastapi.testclient import TestClient
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
@@ -8,13 +10,18 @@ from sqlalchemy.pool import StaticPool
 from app.database import Base, get_db
 from app.main import app
 from app.models.user import User
+from app.utils import cache_metrics
 from app.utils.auth import hash_password, create_access_token
+from app.utils.cache_coder import CompactCoder
 
 # Import all models so Base.metadata has every table before create_all()
 from app.models import user as _user  # noqa: F401
 from app.models import task as _task  # noqa: F401
 from app.models import comment as _comment  # noqa: F401
 from app.models import file as _file  # noqa: F401
+from app.models import archive as _archive  # noqa: F401
+from app.models import stats as _stats  # noqa: F401
+from app.models import task_history as _task_history  # noqa: F401
 
 # Use in-memory SQLite for tests; StaticPool keeps one connection so all sessions share the same DB
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -60,6 +67,17 @@ def db():
     db.close()
 
 
+@pytest.fixture(autouse=True)
+def cache_backend():
+    """Fresh in-memory cache and metrics per test (startup events don't run for TestClient, and entries must not leak)."""
+    FastAPICache.reset()
+    cache_metrics.reset()
+    backend = InMemoryBackend()
+    backend._store = {}  # the class-level default dict is shared by every instance
+    FastAPICache.init(backend, prefix="test-cache", coder=CompactCoder)
+    yield
+
+
 @pytest.fixture
 def client():
     """Get test client."""
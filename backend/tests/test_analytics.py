@@ -1,4 +1,5 @@
 """Tests for analytics endpoints."""
+import json
 import pytest
 from datetime import datetime, timedelta
 from app.models.task import Task, TaskPriority
@@ -10,13 +11,13 @@ def test_get_task_summary(authenticated_client, test_user, db):
     """Test getting task summary analytics."""
     # Create tasks with different statuses
     db.add(Task(title="High Priority Completed", priority=TaskPriority.high, 
-                completed=True, completed_at=datetime.utcnow(), owner_id=test_user.id))
+                status="done", completed=True, completed_at=datetime.utcnow(), owner_id=test_user.id))
     db.add(Task(title="High Priority Pending", priority=TaskPriority.high, 
                 completed=False, owner_id=test_user.id))
     db.add(Task(title="Medium Priority", priority=TaskPriority.medium, 
                 completed=False, owner_id=test_user.id))
     db.add(Task(title="Low Priority Completed", priority=TaskPriority.low, 
-                completed=True, completed_at=datetime.utcnow(), owner_id=test_user.id))
+                status="done", completed=True, completed_at=datetime.utcnow(), owner_id=test_user.id))
     db.commit()
 
     response = authenticated_client.get("/api/v1/analytics/summary")
@@ -65,6 +66,7 @@ def test_get_user_performance(authenticated_client, test_user, db):
         completed = i < 3  # 3 completed, 2 pending
         db.add(Task(
             title=f"Test User Task {i}",
+            status="done" if completed else "todo",
             completed=completed,
             completed_at=datetime.utcnow() if completed else None,
             owner_id=test_user.id
@@ -74,6 +76,7 @@ def test_get_user_performance(authenticated_client, test_user, db):
         completed = i < 4  # 4 completed, 2 pending
         db.add(Task(
             title=f"Other User Task {i}",
+            status="done" if completed else "todo",
             completed=completed,
             completed_at=datetime.utcnow() if completed else None,
             owner_id=other_user.id
@@ -153,6 +156,7 @@ def test_performance_completion_rate_calculation(authenticated_client, test_user
     for i in range(10):
         db.add(Task(
             title=f"Task {i}",
+            status="done" if i < 7 else "todo",
             completed=i < 7,
             completed_at=datetime.utcnow() if i < 7 else None,
             owner_id=test_user.id
@@ -191,3 +195,498 @@ def test_trends_only_count_30_days_by_default(authenticated_client, test_user, d
     data = response.json()
     # Should only include the new task or have data for today
     assert data is not None
+
+
+def test_performance_pagination_and_ordering(authenticated_client, test_user, db):
+    """Performance supports limit/offset and ordering by completion rate; avg time is computed in SQL."""
+    other_user = User(email="ranked@example.com", hashed_password=hash_password("password123"))
+    db.add(other_user)
+    db.commit()
+
+    now = datetime.utcnow()
+    # test_user: 1 of 2 done, took 2 hours
+    db.add(Task(title="Done", status="done", completed=True, owner_id=test_user.id,
+                created_at=now - timedelta(hours=2), completed_at=now))
+    db.add(Task(title="Open", owner_id=test_user.id))
+    # other_user: 1 of 1 done, took 4 hours
+    db.add(Task(title="Done", status="done", completed=True, owner_id=other_user.id,
+                created_at=now - timedelta(hours=4), completed_at=now))
+    db.commit()
+
+    response = authenticated_client.get(
+        "/api/v1/analytics/users/performance?order_by=completion_rate&sort_order=desc"
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [p["user_id"] for p in data] == [other_user.id, test_user.id]
+    assert data[0]["completion_rate"] == 100.0
+    assert data[0]["avg_completion_time_hours"] == 4.0
+    assert data[1]["completion_rate"] == 50.0
+    assert data[1]["avg_completion_time_hours"] == 2.0
+
+    response = authenticated_client.get(
+        "/api/v1/analytics/users/performance?order_by=completion_rate&sort_order=desc&limit=1&offset=1"
+    )
+    assert [p["user_id"] for p in response.json()] == [test_user.id]
+
+    response = authenticated_client.get("/api/v1/analytics/users/performance?order_by=email")
+    assert response.status_code == 400
+
+
+def test_task_summary_single_pass_counts_and_tag(authenticated_client, test_user, db):
+    """Summary counts by status/priority/overdue in one pass and can be limited to a tag."""
+    past = datetime.utcnow() - timedelta(days=1)
+    db.add(Task(title="Done", status="done", priority=TaskPriority.high, tags='["work"]',
+                owner_id=test_user.id))
+    db.add(Task(title="Overdue", status="in_progress", priority=TaskPriority.low, due_date=past,
+                tags='["work", "urgent"]', owner_id=test_user.id))
+    db.add(Task(title="Home", priority=TaskPriority.medium, tags='["home"]', owner_id=test_user.id))
+    db.commit()
+
+    data = authenticated_client.get("/api/v1/analytics/tasks/summary").json()
+    assert data["total"] == 3
+    assert data["completed"] == 1
+    assert data["pending"] == 2
+    assert data["overdue"] == 1
+    assert data["by_priority"] == {"low": 1, "medium": 1, "high": 1}
+    assert data["by_status"] == {"todo": 1, "in_progress": 1, "done": 1}
+
+    data = authenticated_client.get("/api/v1/analytics/tasks/summary?tag=work").json()
+    assert data["total"] == 2
+    assert data["by_status"] == {"todo": 0, "in_progress": 1, "done": 1}
+
+
+def test_task_trends_counts_per_day(authenticated_client, test_user, db):
+    """Trends bucket created and completed tasks per day in SQL, zero-filling empty days."""
+    now = datetime.utcnow()
+    two_days_ago = now - timedelta(days=2)
+    db.add(Task(title="Today 1", owner_id=test_user.id, created_at=now))
+    db.add(Task(title="Today 2", owner_id=test_user.id, created_at=now))
+    db.add(Task(title="Old, completed recently", owner_id=test_user.id, status="done", completed=True,
+                created_at=now - timedelta(days=60), completed_at=two_days_ago))
+    db.add(Task(title="Deleted", owner_id=test_user.id, created_at=now, is_deleted=True))
+    db.commit()
+
+    response = authenticated_client.get("/api/v1/analytics/tasks/trends?days=7")
+    assert response.status_code == 200
+    trends = {t["date"]: t for t in response.json()["daily_trends"]}
+    assert len(trends) == 7
+    assert trends[now.date().isoformat()]["tasks_created"] == 2
+    assert trends[two_days_ago.date().isoformat()]["tasks_completed"] == 1
+    assert sum(t["tasks_created"] for t in trends.values()) == 2
+
+
+def _daily_stats(db, owner_id):
+    from app.models.stats import TaskDailyStats
+    return {
+        row.day: (row.created, row.completed, row.deleted, row.overdue)
+        for row in db.query(TaskDailyStats).filter(TaskDailyStats.owner_id == owner_id)
+        if any((row.created, row.completed, row.deleted, row.overdue))
+    }
+
+
+def test_daily_stats_follow_task_writes(authenticated_client, test_user, db):
+    """Create, complete, reopen and delete through the API keep task_daily_stats in step."""
+    today = datetime.utcnow().date()
+    due = (datetime.utcnow() - timedelta(days=3)).replace(microsecond=0)
+    response = authenticated_client.post("/api/v1/tasks", json={"title": "Tracked", "due_date": due.isoformat()})
+    task_id = response.json()["id"]
+    assert _daily_stats(db, test_user.id) == {today: (1, 0, 0, 0), due.date(): (0, 0, 0, 1)}
+
+    authenticated_client.put(f"/api/v1/tasks/{task_id}", json={"status": "done"})
+    db.expire_all()
+    assert _daily_stats(db, test_user.id) == {today: (1, 1, 0, 0)}
+
+    authenticated_client.put(f"/api/v1/tasks/{task_id}", json={"status": "todo"})
+    db.expire_all()
+    assert _daily_stats(db, test_user.id) == {today: (1, 0, 0, 0), due.date(): (0, 0, 0, 1)}
+
+    authenticated_client.delete(f"/api/v1/tasks/{task_id}")
+    db.expire_all()
+    assert _daily_stats(db, test_user.id) == {today: (0, 0, 1, 0)}
+
+    trends = authenticated_client.get("/api/v1/analytics/tasks/trends?days=1").json()["daily_trends"]
+    assert trends[0]["tasks_created"] == 0
+    assert trends[0]["tasks_deleted"] == 1
+
+
+def test_rebuild_daily_stats_matches_incremental(test_user, db):
+    """A full rebuild reproduces the incrementally maintained rollup."""
+    from app.services.stats_service import rebuild_daily_stats
+    now = datetime.utcnow()
+    db.add(Task(title="Open", owner_id=test_user.id, due_date=now + timedelta(days=2)))
+    db.add(Task(title="Done", owner_id=test_user.id, status="done", completed_at=now - timedelta(days=1),
+                created_at=now - timedelta(days=5)))
+    db.add(Task(title="Gone", owner_id=test_user.id, is_deleted=True))
+    db.commit()
+    incremental = _daily_stats(db, test_user.id)
+
+    assert rebuild_daily_stats(db) > 0
+    db.expire_all()
+    assert _daily_stats(db, test_user.id) == incremental
+
+
+def test_summary_counters_follow_task_writes(authenticated_client, test_user, db):
+    """The owned summary comes from task_counters, kept current by create, update, delete and bulk create."""
+    past = (datetime.utcnow() - timedelta(days=1)).replace(microsecond=0).isoformat()
+    first = authenticated_client.post("/api/v1/tasks", json={"title": "A", "priority": "high", "due_date": past})
+    authenticated_client.post("/api/v1/tasks/bulk", json={"tasks": [{"title": "B"}, {"title": "C", "priority": "low"}]})
+    second = authenticated_client.post("/api/v1/tasks", json={"title": "D"})
+    authenticated_client.put(f"/api/v1/tasks/{second.json()['id']}", json={"status": "done"})
+    authenticated_client.delete(f"/api/v1/tasks/{first.json()['id']}")
+
+    from app.models.stats import TaskCounters
+    counters = db.get(TaskCounters, test_user.id)
+    db.refresh(counters)
+    assert (counters.total, counters.status_done, counters.priority_high, counters.due_open) == (3, 1, 0, 0)
+
+    from app.services.analytics_service import get_task_summary
+    summary = get_task_summary(db, test_user.id)
+    assert summary.total == 3
+    assert summary.completed == 1
+    assert summary.by_priority == {"low": 1, "medium": 2, "high": 0}
+    assert summary.by_status == {"todo": 2, "in_progress": 0, "done": 1}
+
+
+def test_summary_counters_overdue_and_reconcile(test_user, db):
+    """Overdue is counted from the due-date index; reconciliation repairs drifted counters."""
+    from app.models.stats import TaskCounters
+    from app.services.analytics_service import get_task_summary
+    from app.services.stats_service import reconcile_task_counters
+    now = datetime.utcnow()
+    db.add(Task(title="Late", owner_id=test_user.id, due_date=now - timedelta(days=1)))
+    db.add(Task(title="Later", owner_id=test_user.id, due_date=now + timedelta(days=1)))
+    db.commit()
+    assert get_task_summary(db, test_user.id).overdue == 1
+
+    db.query(TaskCounters).filter(TaskCounters.owner_id == test_user.id).update({"total": 99})
+    db.commit()
+    assert reconcile_task_counters(db) == 1
+    assert reconcile_task_counters(db) == 0
+    assert get_task_summary(db, test_user.id).total == 2
+
+
+def test_summary_cache_shared_by_alias_and_invalidated_by_writes(authenticated_client, test_user, db):
+    """Both summary paths share one cached entry; task writes through the API invalidate it."""
+    assert authenticated_client.get("/api/v1/analytics/tasks/summary").json()["total"] == 0
+
+    # Written outside the API, so nothing invalidates: the alias must serve the same cached entry
+    db.add(Task(title="Behind the cache", owner_id=test_user.id))
+    db.commit()
+    assert authenticated_client.get("/api/v1/analytics/summary").json()["total"] == 0
+
+    authenticated_client.post("/api/v1/tasks", json={"title": "Through the API"})
+    assert authenticated_client.get("/api/v1/analytics/summary").json()["total"] == 2
+    assert authenticated_client.get("/api/v1/analytics/tasks/summary").json()["total"] == 2
+
+
+def test_performance_and_trends_served_from_snapshots(authenticated_client, test_user, db):
+    """Performance and default trends come from snapshots (with generated_at) until they are refreshed."""
+    from app.models.stats import AnalyticsSnapshot
+    from app.services.snapshot_service import PERFORMANCE_SNAPSHOT, refresh_snapshots
+
+    first = authenticated_client.get("/api/v1/analytics/users/performance")
+    assert first.json()[0]["tasks_assigned"] == 0
+    generated_at = first.headers["X-Generated-At"]
+
+    authenticated_client.post("/api/v1/tasks", json={"title": "Mine"})
+    cached = authenticated_client.get("/api/v1/analytics/users/performance")
+    assert cached.json()[0]["tasks_assigned"] == 0
+    assert cached.headers["X-Generated-At"] == generated_at
+
+    assert refresh_snapshots(db) == 4  # performance plus 7/30/90-day trends for the one active user
+    refreshed = authenticated_client.get("/api/v1/analytics/users/performance")
+    assert refreshed.json()[0]["tasks_assigned"] == 1
+    assert refreshed.headers["X-Generated-At"] > generated_at
+
+    trends = authenticated_client.get("/api/v1/analytics/tasks/trends?days=7").json()
+    assert trends["generated_at"] is not None
+    assert sum(t["tasks_created"] for t in trends["daily_trends"]) == 1
+
+    # A snapshot past the max age is recomputed on request
+    db.query(AnalyticsSnapshot).filter(AnalyticsSnapshot.name == PERFORMANCE_SNAPSHOT).update(
+        {AnalyticsSnapshot.generated_at: datetime.utcnow() - timedelta(days=1)}
+    )
+    db.commit()
+    authenticated_client.post("/api/v1/tasks", json={"title": "Another"})
+    assert authenticated_client.get("/api/v1/analytics/users/performance").json()[0]["tasks_assigned"] == 2
+
+
+def test_snapshot_save_replaces_a_row_stored_meanwhile(db, test_user):
+    """Storing a snapshot another worker has just inserted replaces it instead of colliding."""
+    from sqlalchemy.orm import Session
+    from app.models.stats import AnalyticsSnapshot
+    from app.schemas.analytics import UserPerformance
+    from app.services.snapshot_service import PERFORMANCE_SNAPSHOT, save_snapshot
+
+    row = UserPerformance(user_id=test_user.id, email=test_user.email, tasks_assigned=0, tasks_completed=0,
+                          completion_rate=0.0, avg_completion_time_hours=None)
+    other = Session(bind=db.get_bind())
+    save_snapshot(other, PERFORMANCE_SNAPSHOT, [], datetime.utcnow())
+    other.commit()
+    other.close()
+
+    save_snapshot(db, PERFORMANCE_SNAPSHOT, [row], datetime.utcnow())
+    db.commit()
+    snapshots = db.query(AnalyticsSnapshot).all()
+    assert len(snapshots) == 1 and len(json.loads(snapshots[0].payload)) == 1
+
+
+def test_non_default_trends_are_cached_and_invalidated(authenticated_client, test_user):
+    """Trends other than the snapshot-backed default go through the tagged response cache."""
+    url = "/api/v1/analytics/tasks/trends?days=7&tz=Europe/Berlin"
+    assert authenticated_client.get(url).headers["X-Cache-Status"] == "MISS"
+    assert authenticated_client.get(url).headers["X-Cache-Status"] == "HIT"
+    assert "X-Cache-Status" not in authenticated_client.get("/api/v1/analytics/tasks/trends?days=7").headers
+    # Default shape, but no snapshot covers 14 days
+    assert authenticated_client.get("/api/v1/analytics/tasks/trends?days=14").headers["X-Cache-Status"] == "MISS"
+    assert authenticated_client.get("/api/v1/analytics/tasks/trends?days=14").headers["X-Cache-Status"] == "HIT"
+
+    authenticated_client.post("/api/v1/tasks", json={"title": "New"})
+    refreshed = authenticated_client.get(url)
+    assert refreshed.headers["X-Cache-Status"] == "MISS"
+    assert sum(t["tasks_created"] for t in refreshed.json()["daily_trends"]) == 1
+
+
+def test_completion_time_percentiles_and_histogram(authenticated_client, test_user, db):
+    """Percentiles interpolate like percentile_cont; histogram buckets by time-to-complete."""
+    now = datetime.utcnow()
+    # Off bucket edges: SQLite's julianday arithmetic is not exact to the second
+    for hours, priority, tags in [(1.5, "high", '["work"]'), (2, "high", '["work", "home"]'),
+                                  (3, "high", None), (100, "low", '["home"]')]:
+        db.add(Task(title=f"{hours}h", owner_id=test_user.id, priority=priority, status="done", tags=tags,
+                    created_at=now - timedelta(hours=hours), completed_at=now))
+    db.add(Task(title="Open", owner_id=test_user.id, created_at=now - timedelta(days=3)))
+    db.add(Task(title="Deleted", owner_id=test_user.id, status="done", is_deleted=True,
+                created_at=now - timedelta(days=30), completed_at=now))
+    db.commit()
+
+    response = authenticated_client.get("/api/v1/analytics/tasks/completion-times?group_by=priority")
+    assert response.status_code == 200
+    groups = {g["group"]: g for g in response.json()["groups"]}
+    assert set(groups) == {"low", "high"}
+    high = groups["high"]
+    assert high["count"] == 3
+    assert high["p50_hours"] == 2.0
+    assert high["p90_hours"] == 2.8
+    assert high["p99_hours"] == 2.98
+    counts = {b["min_hours"]: b["count"] for b in high["histogram"]}
+    assert counts[1.0] == 3  # [1h, 4h)
+    assert sum(counts.values()) == 3
+
+    by_user = authenticated_client.get("/api/v1/analytics/tasks/completion-times").json()["groups"]
+    assert by_user[0]["group"] == str(test_user.id)
+    assert by_user[0]["count"] == 4
+
+    by_tag = authenticated_client.get("/api/v1/analytics/tasks/completion-times?group_by=tag").json()["groups"]
+    assert {g["group"]: g["count"] for g in by_tag} == {"home": 2, "work": 2}
+    assert {g["group"]: g["p50_hours"] for g in by_tag} == {"home": 51.0, "work": 1.75}
+
+    bad = authenticated_client.get("/api/v1/analytics/tasks/completion-times?group_by=colour")
+    assert bad.status_code == 400
+
+
+def test_completion_times_by_tag_skip_legacy_comma_separated_tags(authenticated_client, test_user, db):
+    """Tags stored as a plain comma-separated string (not JSON) don't fail the tag grouping."""
+    now = datetime.utcnow()
+    db.add(Task(title="JSON tags", owner_id=test_user.id, status="done", tags='["work"]',
+                created_at=now - timedelta(hours=2), completed_at=now))
+    db.add(Task(title="Legacy tags", owner_id=test_user.id, status="done", tags="work,home",
+                created_at=now - timedelta(hours=2), completed_at=now))
+    db.commit()
+
+    response = authenticated_client.get("/api/v1/analytics/tasks/completion-times?group_by=tag")
+    assert response.status_code == 200
+    assert {g["group"]: g["count"] for g in response.json()["groups"]} == {"work": 1}
+
+
+def _trend_counts(client, query):
+    response = client.get(f"/api/v1/analytics/tasks/trends?{query}")
+    assert response.status_code == 200, response.text
+    return [(t["start"], t["tasks_created"]) for t in response.json()["daily_trends"]]
+
+
+def test_trends_granularity_timezone_and_range(authenticated_client, test_user, db):
+    """Buckets follow the requested zone across a DST change; UTC day/week/month agree with the scan."""
+    # Europe/Berlin moves from +01:00 to +02:00 at 2024-03-31 01:00 UTC
+    for created in (datetime(2024, 3, 30, 23, 30), datetime(2024, 3, 31, 1, 15), datetime(2024, 3, 31, 22, 30)):
+        db.add(Task(title=str(created), owner_id=test_user.id, created_at=created))
+    db.commit()
+
+    utc_days = _trend_counts(authenticated_client, "start=2024-03-30&end=2024-04-01")
+    assert utc_days == [("2024-03-30T00:00:00Z", 1), ("2024-03-31T00:00:00Z", 2), ("2024-04-01T00:00:00Z", 0)]
+    # Same zone by another name skips the rollup and buckets the tasks table instead
+    assert [n for _, n in _trend_counts(authenticated_client, "start=2024-03-30&end=2024-04-01&tz=Etc/UTC")] \
+        == [n for _, n in utc_days]
+
+    berlin_days = _trend_counts(authenticated_client, "start=2024-03-30&end=2024-04-01&tz=Europe/Berlin")
+    assert berlin_days == [
+        ("2024-03-30T00:00:00+01:00", 0), ("2024-03-31T00:00:00+01:00", 2), ("2024-04-01T00:00:00+02:00", 1),
+    ]
+
+    berlin_hours = _trend_counts(
+        authenticated_client, "granularity=hour&start=2024-03-31T00:00&end=2024-03-31T03:59&tz=Europe/Berlin"
+    )
+    assert [n for _, n in berlin_hours] == [1, 0, 0, 1]  # 00:30 local, then 03:15 local
+
+    weeks = _trend_counts(authenticated_client, "granularity=week&start=2024-03-25&end=2024-04-07")
+    assert weeks == [("2024-03-25T00:00:00Z", 3), ("2024-04-01T00:00:00Z", 0)]
+    months = _trend_counts(authenticated_client, "granularity=month&start=2022-01-15&end=2024-12-31")
+    assert len(months) == 36
+    assert dict(months)["2024-03-01T00:00:00Z"] == 3
+
+
+def test_trends_scope_and_validation(authenticated_client, test_user, db):
+    """Trends count the caller's tasks by scope; bad parameters are rejected."""
+    other = User(email="trend-assigner@example.com", hashed_password=hash_password("password123"))
+    db.add(other)
+    db.commit()
+    db.add(Task(title="Mine", owner_id=test_user.id))
+    db.add(Task(title="Assigned to me", owner_id=other.id, assigned_to=test_user.id))
+    db.add(Task(title="Not mine", owner_id=other.id))
+    db.commit()
+
+    def created_today(scope):
+        return _trend_counts(authenticated_client, f"days=1&scope={scope}")[0][1]
+
+    assert (created_today("owned"), created_today("assigned"), created_today("all")) == (1, 1, 2)
+
+    for query in ("granularity=minute", "tz=Mars/Olympus", "start=2024-02-01&end=2024-01-01",
+                  "granularity=hour&start=2020-01-01&end=2024-01-01", "scope=everyone"):
+        response = authenticated_client.get(f"/api/v1/analytics/tasks/trends?{query}")
+        assert response.status_code == 400, query
+
+
+def test_flow_and_burndown_from_status_transitions(authenticated_client, test_user, db):
+    """Status changes are recorded as transitions; flow and burndown replay them per day via checkpoints."""
+    from app.models.stats import TaskFlowCheckpoint
+    from app.models.task_history import TaskStatusTransition
+    from app.services import flow_service
+    now = datetime.utcnow()
+    today = now.date()
+    task = Task(title="Old", owner_id=test_user.id, created_at=now - timedelta(days=2))
+    db.add(task)
+    db.commit()
+    task_id = task.id
+
+    authenticated_client.put(f"/api/v1/tasks/{task_id}", json={"status": "in_progress"})
+    authenticated_client.put(f"/api/v1/tasks/{task_id}", json={"status": "done"})
+    gone = authenticated_client.post("/api/v1/tasks", json={"title": "Gone"}).json()["id"]
+    authenticated_client.delete(f"/api/v1/tasks/{gone}")
+    db.expire_all()
+    transitions = [
+        (t.from_status, t.to_status)
+        for t in db.query(TaskStatusTransition).filter(TaskStatusTransition.task_id == task_id)
+        .order_by(TaskStatusTransition.id)
+    ]
+    assert transitions == [(None, "todo"), ("todo", "in_progress"), ("in_progress", "done")]
+
+    response = authenticated_client.get("/api/v1/analytics/flow?days=3")
+    assert response.status_code == 200
+    assert [(d["todo"], d["in_progress"], d["done"]) for d in response.json()["days"]] == [
+        (1, 0, 0), (1, 0, 0), (0, 0, 1),
+    ]
+    burndown = authenticated_client.get("/api/v1/analytics/burndown?days=3").json()["days"]
+    assert [(d["remaining"], d["completed"]) for d in burndown] == [(1, 0), (1, 0), (0, 1)]
+    assert burndown[-1]["date"] == today.isoformat()
+    # Finished days are checkpointed; today is computed from its transitions
+    assert db.query(TaskFlowCheckpoint).filter(TaskFlowCheckpoint.owner_id == test_user.id).count() == 2
+
+    # A backdated task invalidates the checkpoints from its day on
+    db.add(Task(title="Imported", owner_id=test_user.id, created_at=now - timedelta(days=1)))
+    db.commit()
+    assert db.query(TaskFlowCheckpoint).filter(TaskFlowCheckpoint.day >= today - timedelta(days=1)).count() == 0
+    flow = flow_service.get_flow(db, test_user.id, today - timedelta(days=2), today)
+    assert [(d.todo, d.in_progress, d.done) for d in flow] == [(1, 0, 0), (2, 0, 0), (1, 0, 1)]
+
+
+def test_flow_backfill_and_validation(authenticated_client, test_user, db):
+    """Tasks without history get a creation transition from the backfill; bad windows are rejected."""
+    from sqlalchemy import insert
+    from app.services.stats_service import backfill_status_transitions
+    created = datetime.utcnow() - timedelta(days=1)
+    db.execute(insert(Task), [
+        {"title": "Bulk", "owner_id": test_user.id, "status": "in_progress", "priority": "medium",
+         "created_at": created, "updated_at": created},
+    ])
+    db.commit()
+    assert backfill_status_transitions(db) == 1
+    assert backfill_status_transitions(db) == 0
+
+    days = authenticated_client.get("/api/v1/analytics/flow?days=2").json()["days"]
+    assert [d["in_progress"] for d in days] == [1, 1]
+
+    assert authenticated_client.get("/api/v1/analytics/flow?days=0").status_code == 400
+    start = (datetime.utcnow().date() + timedelta(days=3)).isoformat()
+    assert authenticated_client.get(f"/api/v1/analytics/burndown?start={start}").status_code == 400
+
+
+def test_flow_never_negative_for_tasks_older_than_their_history(authenticated_client, test_user, db):
+    """A task created before the history table whose status then changes gets its creation backfilled."""
+    from app.models.stats import TaskFlowCheckpoint
+    from app.models.task_history import TaskStatusTransition
+    from app.services.stats_service import backfill_status_transitions
+    task = Task(title="Predates history", owner_id=test_user.id, created_at=datetime.utcnow() - timedelta(days=5))
+    db.add(task)
+    db.commit()
+    task_id = task.id
+    db.query(TaskStatusTransition).delete()  # as if created before the table existed
+    db.commit()
+    assert backfill_status_transitions(db) == 1  # what the migration writes for existing tasks
+
+    # Changed after the upgrade: only that change is recorded, not the creation
+    db.query(TaskStatusTransition).delete()
+    db.commit()
+    assert authenticated_client.put(f"/api/v1/tasks/{task_id}", json={"status": "done"}).status_code == 200
+    db.query(TaskStatusTransition).update({"changed_at": datetime.utcnow() - timedelta(days=2)})
+    db.commit()
+    authenticated_client.get("/api/v1/analytics/flow?days=5", headers={"Cache-Control": "no-cache"})
+    assert db.query(TaskFlowCheckpoint).count() > 0  # stored with todo = -1
+
+    assert backfill_status_transitions(db) == 1
+    assert backfill_status_transitions(db) == 0
+    days = authenticated_client.get("/api/v1/analytics/flow?days=5", headers={"Cache-Control": "no-cache"}).json()["days"]
+    assert all(d["todo"] >= 0 and d["in_progress"] >= 0 and d["done"] >= 0 for d in days)
+    assert [(d["todo"], d["done"]) for d in days] == [(1, 0), (1, 0), (0, 1), (0, 1), (0, 1)]
+
+
+def test_summary_cache_serves_stale_while_revalidating(authenticated_client, test_user, db, monkeypatch):
+    """An expired entry is served once more, marked STALE, while a background refresh replaces it."""
+    from app.routes.analytics import CACHE_TTL
+    from app.utils import cache as cache_utils
+    first = authenticated_client.get("/api/v1/analytics/tasks/summary")
+    assert first.headers["X-Cache-Status"] == "MISS"
+    assert authenticated_client.get("/api/v1/analytics/tasks/summary").headers["X-Cache-Status"] == "HIT"
+
+    # Written outside a request, so no tag is invalidated; only expiry can pick it up
+    db.add(Task(title="Out of band", owner_id=test_user.id))
+    db.commit()
+    later = cache_utils._now() + CACHE_TTL + 1
+    monkeypatch.setattr(cache_utils, "_now", lambda: later)
+
+    stale = authenticated_client.get("/api/v1/analytics/tasks/summary")
+    assert stale.headers["X-Cache-Status"] == "STALE"
+    assert int(stale.headers["Age"]) > CACHE_TTL
+    assert stale.json()["total"] == first.json()["total"]
+
+    refreshed = authenticated_client.get("/api/v1/analytics/tasks/summary")
+    assert refreshed.headers["X-Cache-Status"] == "HIT"
+    assert refreshed.json()["total"] == first.json()["total"] + 1
+    assert not cache_utils._refreshing
+
+
+def test_summary_counts_tasks_when_counters_row_is_missing(authenticated_client, test_user, db):
+    """Owners without a task_counters row (not backfilled) get a scanned summary, not zeros."""
+    from sqlalchemy import insert
+    from app.models.stats import TaskCounters
+    # Bulk inserts bypass the hook that creates the counters row
+    db.execute(insert(Task), [
+        {"title": "Open", "owner_id": test_user.id, "priority": "high"},
+        {"title": "Done", "owner_id": test_user.id, "status": "done"},
+    ])
+    db.commit()
+    assert db.get(TaskCounters, test_user.id) is None
+
+    data = authenticated_client.get("/api/v1/analytics/summary").json()
+    assert (data["total"], data["completed"], data["pending"]) == (2, 1, 1)
+    assert data["by_priority"]["high"] == 1
@@ -0,0 +1,464 @@
+"""Tests for the cache layer: coder, two-tier and failover backends, single-flight misses, metrics, admin endpoints and warming."""
+import asyncio
+import time
+from datetime import date
+
+import pytest
+
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+
+from app.config import settings
+from app.models.task import Task
+from app.models.user import User
+from app.services import cache_warmer, snapshot_service
+from app.utils import cache as cache_utils
+from app.utils import cache_metrics
+from app.utils.cache_backends import FailoverBackend, LocalLRU, TwoTierBackend
+from app.utils.cache_coder import CompactCoder
+
+
+class FakePublisher:
+    """Stands in for the Redis client: records what would be published."""
+
+    def __init__(self):
+        self.messages = []
+
+    async def publish(self, channel, message):
+        self.messages.append((channel, message))
+
+
+class FakeSyncRedis:
+    """Synchronous Redis client stand-in for jobs: records each pipelined command."""
+
+    def __init__(self):
+        self.commands = []
+
+    def pipeline(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def incr(self, key):
+        self.commands.append(("incr", key))
+
+    def expire(self, key, seconds):
+        self.commands.append(("expire", key))
+
+    def publish(self, channel, message):
+        self.commands.append(("publish", message.split(" ", 1)[1]))
+
+    def execute(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeLockRedis(FakePublisher):
+    """Redis client stand-in with SET NX and the compare-and-delete script used for locks."""
+
+    def __init__(self):
+        super().__init__()
+        self.keys = {}
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.keys:
+            return None
+        self.keys[key] = value
+        return True
+
+    async def eval(self, script, numkeys, key, token):
+        if self.keys.get(key) == token:
+            del self.keys[key]
+            return 1
+        return 0
+
+
+@pytest.fixture
+def as_admin(test_user, monkeypatch):
+    """Make the authenticated test user an admin (listed in ADMIN_EMAILS)."""
+    monkeypatch.setattr(settings, "ADMIN_EMAILS", test_user.email)
+
+
+def _remote():
+    backend = InMemoryBackend()
+    backend._store = {}
+    return backend
+
+
+def test_local_lru_bounds_size_and_ttl(monkeypatch):
+    """The LRU evicts the least recently used entry and never outlives the shared entry's TTL."""
+    lru = LocalLRU(max_entries=2, ttl_seconds=30)
+    lru.set("a", "1")
+    lru.set("b", "2")
+    assert lru.get("a")[1] == "1"  # a is now most recently used
+    lru.set("c", "3")
+    assert lru.get("b") is None
+    assert len(lru) == 2
+    assert lru.evictions == 1
+    assert cache_metrics.snapshot()["namespaces"]["other"]["evictions"] == 1
+
+    lru.set("short", "x", expire=1)
+    assert lru.get("short")[0] < lru.get("c")[0]
+    later = time.monotonic() + 31
+    monkeypatch.setattr(time, "monotonic", lambda: later)
+    assert lru.get("c") is None
+
+
+def test_two_tier_serves_hot_keys_locally_and_counts_tiers():
+    """First read goes to the remote tier, repeats are local; stats report each tier."""
+    async def scenario():
+        remote = _remote()
+        await remote.set("k", "v", 60)
+        backend = TwoTierBackend(remote)
+        assert await backend.get("k") == "v"
+        assert await backend.get("k") == "v"
+        assert await backend.get("missing") is None
+        return backend.stats()
+
+    stats = asyncio.run(scenario())
+    assert (stats["local_hits"], stats["remote_hits"], stats["misses"]) == (1, 1, 1)
+    assert stats["local_hit_ratio"] == stats["remote_hit_ratio"] == 1 / 3
+
+
+def test_two_tier_invalidates_other_workers_via_pubsub():
+    """A set in one worker is published; another worker drops its local copy and rereads the remote."""
+    async def scenario():
+        remote = _remote()
+        publisher = FakePublisher()
+        worker_a = TwoTierBackend(remote, publisher, channel="inv")
+        worker_b = TwoTierBackend(remote, publisher, channel="inv")
+        await worker_a.set("tag", "1", 60)
+        assert await worker_b.get("tag") == "1"
+
+        await worker_a.set("tag", "2", 60)
+        assert await worker_b.get("tag") == "1"  # local copy until the message arrives
+        for _, message in publisher.messages:
+            worker_a.handle_message(message)  # own messages are ignored
+            worker_b.handle_message(message)
+        assert await worker_b.get("tag") == "2"
+        assert await worker_a.get("tag") == "2"
+
+        await worker_b.clear(namespace="ta")
+        worker_a.handle_message(publisher.messages[-1][1])
+        return len(worker_a.local), publisher.messages[-1]
+
+    local_entries, last = asyncio.run(scenario())
+    assert local_entries == 0
+    assert last[0] == "inv" and last[1].endswith(" ns ta")
+
+
+def test_cache_stats_endpoint(authenticated_client, test_user, monkeypatch):
+    """Analytics responses cached through the two-tier backend show up in its hit counters (admins only)."""
+    assert authenticated_client.get("/api/v1/analytics/cache/stats").status_code == 403
+    assert authenticated_client.get("/api/v1/analytics/cache/metrics").status_code == 403
+    monkeypatch.setattr(settings, "ADMIN_EMAILS", test_user.email)
+    FastAPICache.reset()
+    FastAPICache.init(TwoTierBackend(_remote()), prefix="test-cache")
+    for _ in range(3):
+        assert authenticated_client.get("/api/v1/analytics/tasks/summary").status_code == 200
+    stats = authenticated_client.get("/api/v1/analytics/cache/stats").json()
+    assert stats["backend"] == "TwoTierBackend"
+    assert stats["local_hits"] > 0
+    assert stats["lookups"] == stats["local_hits"] + stats["remote_hits"] + stats["misses"]
+
+
+def _counting_compute(calls, value, delay=0.05):
+    async def compute():
+        calls.append(value)
+        await asyncio.sleep(delay)
+        return value, f"encoded {value}"
+    return compute
+
+
+def test_single_flight_shares_one_computation():
+    """Concurrent misses on one key run compute once; every caller gets its result."""
+    calls = []
+
+    async def scenario():
+        compute = _counting_compute(calls, "v")
+        return await asyncio.gather(*(cache_utils.single_flight("k", compute, 5) for _ in range(10)))
+
+    results = asyncio.run(scenario())
+    assert calls == ["v"]
+    assert results == [("v", "encoded v")] * 10
+    assert not cache_utils._inflight
+
+
+def test_single_flight_errors_reach_waiters_and_timeout_falls_back():
+    """The leader's error is raised to waiters; a waiter past its timeout computes by itself."""
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError("bad parameters")
+
+    async def errors():
+        results = await asyncio.gather(
+            *(cache_utils.single_flight("k", failing, 5) for _ in range(3)), return_exceptions=True
+        )
+        return [type(r) for r in results]
+
+    assert asyncio.run(errors()) == [ValueError] * 3
+
+    calls = []
+
+    async def slow_leader():
+        leader = asyncio.ensure_future(cache_utils.single_flight("k", _counting_compute(calls, "slow", 0.3), 5))
+        await asyncio.sleep(0)
+        follower = await cache_utils.single_flight("k", _counting_compute(calls, "own", 0), 0.05)
+        return follower, await leader
+
+    assert asyncio.run(slow_leader()) == (("own", "encoded own"), ("slow", "encoded slow"))
+    assert calls == ["slow", "own"]
+
+
+def test_single_flight_waits_for_another_worker_holding_the_lock():
+    """With the Redis lock held elsewhere, the caller reads the entry that worker stores."""
+    redis = FakeLockRedis()
+    remote = _remote()
+    FastAPICache.reset()
+    FastAPICache.init(TwoTierBackend(remote, redis), prefix="test-cache")
+    calls = []
+
+    async def scenario():
+        redis.keys["k:lock"] = "other-worker"
+
+        async def other_worker_finishes():
+            await asyncio.sleep(0.1)
+            await remote.set("k", FastAPICache.get_coder().encode({"cached_at": 0, "value": {"n": 1}}), 60)
+
+        asyncio.ensure_future(other_worker_finishes())
+        return await cache_utils.single_flight("k", _counting_compute(calls, "mine"), 5)
+
+    value, _ = asyncio.run(scenario())
+    assert value == {"n": 1}
+    assert calls == []
+
+    async def lock_free():
+        return await cache_utils.single_flight("k2", _counting_compute(calls, "mine"), 5)
+
+    assert asyncio.run(lock_free())[0] == "mine"
+    assert "k2:lock" not in redis.keys  # released after computing
+
+
+def test_cache_metrics_per_namespace_and_route(authenticated_client, as_admin):
+    """Hits, misses, sets and value sizes are counted per namespace and per route."""
+    authenticated_client.get("/api/v1/analytics/tasks/summary")
+    authenticated_client.get("/api/v1/analytics/summary")
+    authenticated_client.get("/api/v1/analytics/tasks/summary", headers={"Cache-Control": "no-cache"})
+
+    metrics = authenticated_client.get("/api/v1/analytics/cache/metrics").json()
+    summary = metrics["namespaces"]["analytics:summary"]
+    assert (summary["hits"], summary["misses"], summary["sets"]) == (1, 1, 1)
+    assert summary["hit_ratio"] == 0.5
+    assert summary["value_bytes"] == summary["max_value_bytes"] > 0
+    assert summary["get_calls"] == 2 and summary["avg_get_ms"] >= 0
+    assert metrics["routes"]["/api/v1/analytics/tasks/summary"]["misses"] == 1
+    assert metrics["routes"]["/api/v1/analytics/summary"]["hits"] == 1
+    assert metrics["namespaces"]["tag"]["get_calls"] == 2
+    assert metrics["tiers"] is None
+
+
+def test_cache_keys_inspect_and_purge_require_admin(authenticated_client, test_user, monkeypatch):
+    """Admins list a user's entries and purge them; the next request recomputes."""
+    authenticated_client.get("/api/v1/analytics/tasks/summary")
+    assert authenticated_client.get("/api/v1/analytics/cache/keys").status_code == 403
+
+    monkeypatch.setattr(settings, "ADMIN_EMAILS", f"other@example.com, {test_user.email.upper()}")
+    keys = authenticated_client.get(f"/api/v1/analytics/cache/keys?user_id={test_user.id}").json()["keys"]
+    assert [k["namespace"] for k in keys] == ["analytics:summary"]
+    assert keys[0]["bytes"] > 0 and keys[0]["ttl"] > 0
+    assert authenticated_client.get(f"/api/v1/analytics/cache/keys?user_id={test_user.id + 1}").json()["keys"] == []
+
+    assert authenticated_client.delete("/api/v1/analytics/cache/keys").status_code == 400
+    purged = authenticated_client.delete("/api/v1/analytics/cache/keys?namespace=analytics:summary")
+    assert purged.json() == {"purged": 1}
+    response = authenticated_client.get("/api/v1/analytics/tasks/summary")
+    assert response.headers["X-Cache-Status"] == "MISS"
+    metrics = authenticated_client.get("/api/v1/analytics/cache/metrics").json()
+    assert metrics["namespaces"]["analytics:summary"]["purged"] == 1
+
+
+class FlakyBackend:
+    """In-memory backend whose calls raise ConnectionError while down, like RedisBackend on an outage."""
+
+    def __init__(self):
+        self.store = _remote()
+        self.down = False
+
+    async def ping(self):
+        self._check()
+        return True
+
+    def _check(self):
+        if self.down:
+            raise ConnectionError("redis is down")
+
+    async def get_with_ttl(self, key):
+        self._check()
+        return await self.store.get_with_ttl(key)
+
+    async def get(self, key):
+        self._check()
+        return await self.store.get(key)
+
+    async def set(self, key, value, expire=None):
+        self._check()
+        await self.store.set(key, value, expire)
+
+    async def clear(self, namespace=None, key=None):
+        self._check()
+        return await self.store.clear(namespace, key)
+
+
+def test_failover_backend_trips_to_memory_and_recovers():
+    """Failures open the breaker; a good probe closes it and replays tag versions written meanwhile."""
+    redis = FlakyBackend()
+    backend = FailoverBackend(redis, _remote(), redis, failure_threshold=2)
+
+    async def scenario():
+        await backend.set("p:tag:user:1", "v1", 60)
+        await backend.set("p:entry", "cached", 60)
+        redis.down = True
+        assert await backend.get("p:entry") is None  # first failure: answered by the fallback
+        assert not backend.is_open
+        assert not await backend.probe()
+        assert backend.is_open and backend.redis is None
+
+        await backend.set("p:tag:user:1", "v2", 60)  # invalidation during the outage
+        await backend.set("p:entry", "fresh", 60)
+        assert await backend.get("p:entry") == "fresh"
+
+        redis.down = False
+        assert await backend.probe()
+        assert not backend.is_open
+        return await backend.get("p:tag:user:1"), await backend.get("p:entry"), backend.stats()
+
+    tag, entry, stats = asyncio.run(scenario())
+    assert tag == "v2"  # Redis got the newer version, so pre-outage entries stay orphaned
+    assert entry == "cached"
+    assert stats["redis_healthy"] and stats["breaker_trips"] == 1
+
+
+def test_failover_backend_opens_at_startup_when_redis_is_unreachable():
+    redis = FlakyBackend()
+    redis.down = True
+    backend = FailoverBackend(redis, _remote(), redis, failure_threshold=3)
+
+    async def scenario():
+        await backend.probe(open_on_failure=True)
+        await backend.set("k", "v", 60)
+        return await backend.get("k")
+
+    assert asyncio.run(scenario()) == "v"
+    assert backend.is_open and backend.consecutive_failures == 1
+
+
+def test_compact_coder_compresses_large_values_only():
+    """Small values are stored packed; large ones zlib-compressed; old JsonCoder text still decodes."""
+    small, small_raw = CompactCoder.encode_measured({"total": 3})
+    assert small[1:2] == b"-" and len(small) == small_raw + 2
+    assert CompactCoder.decode(small) == {"total": 3}
+
+    days = [{"date": date(2024, 1, 1), "todo": i, "in_progress": 0, "done": i} for i in range(365)]
+    large, large_raw = CompactCoder.encode_measured({"days": days})
+    assert large[1:2] == b"z"
+    assert large_raw / len(large) > 3
+    assert CompactCoder.decode(large)["days"][364] == {"date": "2024-01-01", "todo": 364, "in_progress": 0, "done": 364}
+
+    assert CompactCoder.decode('{"cached_at": 1, "value": [1, 2]}') == {"cached_at": 1, "value": [1, 2]}
+
+
+def test_compact_coder_uses_msgpack_when_installed():
+    pytest.importorskip("msgpack")
+    encoded = CompactCoder.encode({"n": 1})
+    assert encoded[:1] == b"m"
+    assert CompactCoder.decode(encoded) == {"n": 1}
+
+
+def test_undecodable_entry_is_dropped_and_recomputed(authenticated_client, monkeypatch):
+    """A msgpack entry read by a worker without msgpack is a miss, not a 500 until the TTL expires."""
+    from app.utils import cache_coder
+    monkeypatch.setattr(cache_coder, "msgpack", None)
+    url = "/api/v1/analytics/tasks/summary"
+    assert authenticated_client.get(url).headers["X-Cache-Status"] == "MISS"
+    backend = FastAPICache.get_backend()
+    (key,) = [k for k in backend._store if ":analytics:summary:" in k]
+    asyncio.run(backend.set(key, b"m-\x82\xa9cached_at\x00\xa5value\xc0", 60))
+
+    response = authenticated_client.get(url)
+    assert response.status_code == 200
+    assert response.headers["X-Cache-Status"] == "MISS"
+    assert authenticated_client.get(url).headers["X-Cache-Status"] == "HIT"
+    assert cache_metrics.snapshot()["namespaces"]["analytics:summary"]["errors"] == 1
+
+
+def test_cache_metrics_report_compression_ratio(authenticated_client, as_admin):
+    """A year of flow data is stored compressed; metrics report bytes before and after."""
+    assert authenticated_client.get("/api/v1/analytics/flow?days=366").status_code == 200
+    cached = authenticated_client.get("/api/v1/analytics/flow?days=366")
+    assert cached.headers["X-Cache-Status"] == "HIT"
+    assert len(cached.json()["days"]) == 366
+
+    flow = authenticated_client.get("/api/v1/analytics/cache/metrics").json()["namespaces"]["analytics:flow"]
+    assert flow["raw_value_bytes"] > flow["value_bytes"]
+    assert flow["compression_ratio"] > 3
+
+
+def test_login_warms_summary_and_trends(client, test_user, db):
+    db.add(Task(title="Warm me", owner_id=test_user.id))
+    db.commit()
+
+    login = client.post("/api/v1/auth/login", json={"email": test_user.email, "password": "testpassword123"})
+    assert login.status_code == 200
+    # TestClient runs background tasks before returning
+    assert snapshot_service.load_snapshot(db, snapshot_service.trends_snapshot_name(test_user.id, 30)) is not None
+
+    client.headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    summary = client.get("/api/v1/analytics/tasks/summary")
+    assert summary.headers["X-Cache-Status"] == "HIT"
+    assert summary.json()["total"] == 1
+    assert cache_metrics.snapshot()["namespaces"]["analytics:summary"]["warmed"] == 1
+
+
+def test_warm_users_ranks_by_activity_and_skips_cached(db, test_user):
+    other = User(email="idle@example.com", hashed_password="x")
+    db.add(other)
+    db.commit()
+    db.add_all([Task(title=f"Task {i}", owner_id=test_user.id) for i in range(3)])
+    db.add(Task(title="Only one", owner_id=other.id))
+    db.commit()
+
+    user_ids = cache_warmer.most_active_users(db, limit=10)
+    assert user_ids == [test_user.id, other.id]
+    assert cache_warmer.most_active_users(db, limit=1) == [test_user.id]
+
+    # One worker: the test engine shares a single SQLite connection between sessions
+    bind = db.get_bind()
+    assert asyncio.run(cache_warmer.warm_users(bind, user_ids, workers=1)) == 4
+    assert asyncio.run(cache_warmer.warm_users(bind, user_ids, workers=1)) == 0
+
+
+def test_jobs_without_cache_backend_bump_tags_in_redis(db, test_user, monkeypatch):
+    """Bulk jobs (here the archiver) outside the API INCR their users' tag keys straight in Redis."""
+    from datetime import datetime, timedelta
+    from app.services.archive_service import archive_tasks
+
+    task = Task(title="Old", status="done", completed=True, owner_id=test_user.id,
+                completed_at=datetime.utcnow() - timedelta(days=400))
+    db.add(task)
+    db.commit()
+    fake = FakeSyncRedis()
+    monkeypatch.setattr(cache_utils.sync_redis.Redis, "from_url", lambda *args, **kwargs: fake)
+    FastAPICache.reset()  # a Celery worker never initializes the cache
+
+    assert archive_tasks(db, older_than_days=180) == 1
+    tag_key = f"task-cache:tag:user:{test_user.id}"
+    assert ("incr", tag_key) in fake.commands
+    assert ("expire", tag_key) in fake.commands
+    assert ("publish", f"key {tag_key}") in fake.commands
+    assert ("incr", "task-cache:tag:performance") in fake.commands
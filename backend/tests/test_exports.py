@@ -90,8 +90,8 @@ def test_export_csv_with_priority_filter(authenticated_client, test_user, db):
 
 def test_export_json_with_completed_filter(authenticated_client, test_user, db):
     """Test exporting JSON filtered by completion status."""
-    db.add(Task(title="Completed 1", completed=True, owner_id=test_user.id))
-    db.add(Task(title="Completed 2", completed=True, owner_id=test_user.id))
+    db.add(Task(title="Completed 1", status="done", completed=True, owner_id=test_user.id))
+    db.add(Task(title="Completed 2", status="done", completed=True, owner_id=test_user.id))
     db.add(Task(title="Pending 1", completed=False, owner_id=test_user.id))
     db.commit()
 
@@ -179,11 +179,11 @@ def test_export_empty_result(authenticated_client, db):
 
 def test_export_csv_multiple_filters(authenticated_client, test_user, db):
     """Test export with multiple filters applied."""
-    db.add(Task(title="High Complete", priority=TaskPriority.high, completed=True,
+    db.add(Task(title="High Complete", priority=TaskPriority.high, status="done", completed=True,
                 owner_id=test_user.id))
     db.add(Task(title="High Pending", priority=TaskPriority.high, completed=False,
                 owner_id=test_user.id))
-    db.add(Task(title="Low Complete", priority=TaskPriority.low, completed=True,
+    db.add(Task(title="Low Complete", priority=TaskPriority.low, status="done", completed=True,
                 owner_id=test_user.id))
     db.commit()
 
@@ -200,3 +200,74 @@ def test_export_csv_multiple_filters(authenticated_client, test_user, db):
     assert rows[0]["title"] == "High Complete"
     assert rows[0]["priority"] == "high"
     assert rows[0]["completed"] == "True"
+
+
+def test_export_scope_assigned(authenticated_client, test_user, db):
+    """Export with scope=assigned returns tasks assigned to the current user."""
+    from app.models.user import User
+    from app.utils.auth import hash_password
+    other = User(email="exporter@example.com", hashed_password=hash_password("password123"))
+    db.add(other)
+    db.commit()
+    db.add(Task(title="Mine", owner_id=test_user.id))
+    db.add(Task(title="Assigned", owner_id=other.id, assigned_to=test_user.id))
+    db.commit()
+
+    response = authenticated_client.get("/api/v1/tasks/export?format=json&scope=assigned")
+    assert response.status_code == 200
+    data = response.json()
+    assert [task["title"] for task in data] == ["Assigned"]
+
+
+def test_export_csv_streams_in_chunks_without_row_cap(authenticated_client, test_user, db):
+    """CSV is written one chunk per cursor batch; without limit every task is exported."""
+    from sqlalchemy import insert, select
+    from app.services import export_service
+    db.execute(insert(Task), [{"title": f"Task {i}", "owner_id": test_user.id} for i in range(25)])
+    db.commit()
+
+    stmt = select(*[getattr(Task, c) for c in export_service.EXPORT_COLUMNS]).order_by(Task.id)
+    chunks = list(export_service.stream_tasks_csv(export_service.stream_rows(db.get_bind(), stmt, chunk_rows=10)))
+    assert len(chunks) == 3
+    assert chunks[0].startswith("id,title,")
+    rows = list(csv.DictReader(StringIO("".join(chunks))))
+    assert [row["title"] for row in rows] == [f"Task {i}" for i in range(25)]
+
+    response = authenticated_client.get("/api/v1/tasks/export?format=csv")
+    assert len(list(csv.DictReader(StringIO(response.text)))) == 25
+    empty = authenticated_client.get("/api/v1/tasks/export?format=csv&priority=urgent")
+    assert empty.text.strip() == ",".join(export_service.CSV_HEADERS)
+
+
+def test_export_json_streams_same_document_compact_and_indented(db, test_user):
+    """Streamed JSON matches json.dumps of the whole list, across chunks and when empty."""
+    from sqlalchemy import insert, select
+    from app.services import export_service
+    db.execute(insert(Task), [{"title": f"Task {i}", "owner_id": test_user.id} for i in range(5)])
+    db.commit()
+
+    def export(compact, where=True):
+        stmt = select(*[getattr(Task, c) for c in export_service.EXPORT_COLUMNS]).where(where).order_by(Task.id)
+        return "".join(export_service.stream_tasks_json(export_service.stream_rows(db.get_bind(), stmt, 2), compact))
+
+    tasks = json.loads(export(compact=True))
+    assert [task["title"] for task in tasks] == [f"Task {i}" for i in range(5)]
+    assert export(compact=True) == json.dumps(tasks, separators=(",", ":"))
+    assert export(compact=False) == json.dumps(tasks, indent=2)
+    assert export(compact=False, where=Task.id < 0) == "[]"
+
+
+def test_export_ndjson_and_compact_json(authenticated_client, test_user, db):
+    db.add(Task(title="Task 1", priority=TaskPriority.high, owner_id=test_user.id))
+    db.add(Task(title="Task 2", owner_id=test_user.id))
+    db.commit()
+
+    response = authenticated_client.get("/api/v1/tasks/export?format=ndjson&priority=high")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert [json.loads(line)["title"] for line in lines] == ["Task 1"]
+
+    compact = authenticated_client.get("/api/v1/tasks/export?format=json&compact=true")
+    assert "\n" not in compact.text and ", " not in compact.text
+    assert [task["title"] for task in compact.json()] == ["Task 1", "Task 2"]
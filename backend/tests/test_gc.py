@@ -0,0 +1,124 @@
+"""Tests for the soft-delete garbage collector."""
+import os
+import time
+from datetime import datetime, timedelta
+
+from app.models.comment import Comment
+from app.models.file import File
+from app.models.task import Task
+from app.models.task_history import TaskTombstone
+from app.services.gc_service import purge_deleted
+from app.services.task_service import encode_change_cursor
+
+
+def _backdate(db, model, row_id, **columns):
+    db.query(model).filter(model.id == row_id).update(columns, synchronize_session=False)
+    db.commit()
+
+
+def test_purge_deleted_cascades_and_removes_blobs(test_user, db, tmp_path):
+    """Old soft-deleted tasks are purged with their children and blobs; recent ones are kept."""
+    blob_dir = tmp_path / "task_files"
+    blob_dir.mkdir()
+    (blob_dir / "old.txt").write_text("old")
+    (blob_dir / "keep.txt").write_text("keep")
+
+    old_task = Task(title="Old deleted", is_deleted=True, owner_id=test_user.id)
+    recent_task = Task(title="Recent deleted", is_deleted=True, owner_id=test_user.id)
+    live_task = Task(title="Live", owner_id=test_user.id)
+    db.add_all([old_task, recent_task, live_task])
+    db.commit()
+    db.add(Comment(content="Live comment on old task", task_id=old_task.id, user_id=test_user.id))
+    db.add(File(filename="old.txt", filepath="task_files/old.txt", size=3, content_type="text/plain",
+                task_id=old_task.id, uploaded_by=test_user.id))
+    db.add(File(filename="keep.txt", filepath="task_files/keep.txt", size=4, content_type="text/plain",
+                task_id=live_task.id, uploaded_by=test_user.id))
+    db.add(Comment(content="Deleted comment", task_id=live_task.id, user_id=test_user.id, is_deleted=True))
+    db.commit()
+    _backdate(db, Task, old_task.id, updated_at=datetime.utcnow() - timedelta(days=60))
+    deleted_comment_id = db.query(Comment).filter(Comment.is_deleted == True).one().id
+    _backdate(db, Comment, deleted_comment_id, updated_at=datetime.utcnow() - timedelta(days=60))
+
+    counts = purge_deleted(db, retention_days=30, batch_size=1, sleep_seconds=0, upload_dir=tmp_path)
+
+    assert counts == {"tasks": 1, "comments": 2, "files": 1, "blobs": 1, "tombstones": 0}
+    assert {t.title for t in db.query(Task).all()} == {"Recent deleted", "Live"}
+    assert db.query(Comment).count() == 0
+    assert [f.filename for f in db.query(File).all()] == ["keep.txt"]
+    assert not (blob_dir / "old.txt").exists()
+    assert (blob_dir / "keep.txt").exists()
+
+
+def test_purge_deleted_removes_orphaned_blobs(db, tmp_path):
+    """Unreferenced blobs past the grace period are removed; fresh ones are left alone."""
+    blob_dir = tmp_path / "task_files"
+    blob_dir.mkdir()
+    stale = blob_dir / "stale.txt"
+    stale.write_text("orphan")
+    old_mtime = time.time() - 2 * 3600
+    os.utime(stale, (old_mtime, old_mtime))
+    fresh = blob_dir / "fresh.txt"
+    fresh.write_text("upload in progress")
+
+    counts = purge_deleted(db, retention_days=30, sleep_seconds=0, upload_dir=tmp_path)
+
+    assert counts["blobs"] == 1
+    assert not stale.exists()
+    assert fresh.exists()
+
+
+def test_delta_sync_reports_purged_tasks_and_expires_old_cursors(authenticated_client, test_user, db, tmp_path):
+    """A client that missed a soft delete still hears of the task after it is purged."""
+    task = Task(title="Synced then purged", owner_id=test_user.id)
+    db.add(task)
+    db.commit()
+    task_id = task.id
+    cursor = authenticated_client.get("/api/v1/tasks/changes").json()["cursor"]
+
+    assert authenticated_client.delete(f"/api/v1/tasks/{task_id}").status_code in (200, 204)
+    counts = purge_deleted(db, retention_days=0, sleep_seconds=0, upload_dir=tmp_path)
+    assert counts["tasks"] == 1
+
+    data = authenticated_client.get(f"/api/v1/tasks/changes?since={cursor}").json()
+    assert data["updated"] == []
+    assert data["deleted"] == [task_id]
+    assert authenticated_client.get(f"/api/v1/tasks/changes?since={data['cursor']}").json()["deleted"] == []
+
+    # Tombstones are kept for GC_RETENTION_DAYS; older cursors must do a full sync
+    old_cursor = encode_change_cursor(datetime.utcnow() - timedelta(days=31), 0)
+    response = authenticated_client.get(f"/api/v1/tasks/changes?since={old_cursor}")
+    assert response.status_code == 410
+    db.query(TaskTombstone).update({"removed_at": datetime.utcnow() - timedelta(days=31)})
+    db.commit()
+    assert purge_deleted(db, sleep_seconds=0, upload_dir=tmp_path)["tombstones"] == 1
+
+
+def test_delta_sync_cursor_expires_by_last_sync_not_data_age(authenticated_client, test_user, db, monkeypatch):
+    """No changes in GC_RETENTION_DAYS + 1 days still syncs; a client silent that long gets 410."""
+    from app.services import task_service
+
+    # A new user with no tasks gets a cursor at the initial position
+    cursor = authenticated_client.get("/api/v1/tasks/changes").json()["cursor"]
+    assert authenticated_client.get(f"/api/v1/tasks/changes?since={cursor}").status_code == 200
+
+    task = Task(title="Untouched for a while", owner_id=test_user.id)
+    db.add(task)
+    db.commit()
+    db.query(Task).filter(Task.id == task.id).update(
+        {"updated_at": datetime.utcnow() - timedelta(days=31)}, synchronize_session=False
+    )
+    db.commit()
+    cursor = authenticated_client.get("/api/v1/tasks/changes").json()["cursor"]
+    for _ in range(2):
+        response = authenticated_client.get(f"/api/v1/tasks/changes?since={cursor}")
+        assert response.status_code == 200
+        assert response.json()["updated"] == []
+        cursor = response.json()["cursor"]
+
+    class Later(datetime):
+        @classmethod
+        def utcnow(cls):
+            return datetime.utcnow() + timedelta(days=31)
+
+    monkeypatch.setattr(task_service, "datetime", Later)
+    assert authenticated_client.get(f"/api/v1/tasks/changes?since={cursor}").status_code == 410
@@ -2,6 +2,7 @@
 import pytest
 from app.models.task import Task, TaskPriority
 from app.schemas.task import TaskCreate, BulkTaskCreate
+from app.services.task_service import decode_change_cursor
 
 
 def test_create_task(authenticated_client, test_user, db):
@@ -252,3 +253,108 @@ def test_bulk_create_partial_failure(authenticated_client, test_user, db):
     assert response.status_code == 400 or response.status_code == 422
     # Verify no tasks were created (transaction rolled back)
     assert db.query(Task).filter_by(is_deleted=False).count() == 0
+
+
+def test_task_changes_full_then_incremental_sync(authenticated_client, test_user, db):
+    """Delta sync returns all tasks first, then only what changed since the returned cursor."""
+    for i in range(3):
+        db.add(Task(title=f"Task {i}", owner_id=test_user.id))
+    db.commit()
+
+    response = authenticated_client.get("/api/v1/tasks/changes")
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["updated"]) == 3
+    assert data["deleted"] == []
+    assert data["has_more"] is False
+    cursor = data["cursor"]
+
+    # Nothing changed: same position (only the sync time moves on), no rows
+    response = authenticated_client.get(f"/api/v1/tasks/changes?since={cursor}")
+    assert response.json()["updated"] == []
+    assert decode_change_cursor(response.json()["cursor"])[:2] == decode_change_cursor(cursor)[:2]
+
+    first_id = data["updated"][0]["id"]
+    second_id = data["updated"][1]["id"]
+    authenticated_client.put(f"/api/v1/tasks/{first_id}", json={"title": "Renamed"})
+    authenticated_client.delete(f"/api/v1/tasks/{second_id}")
+
+    response = authenticated_client.get(f"/api/v1/tasks/changes?since={cursor}")
+    data = response.json()
+    assert [t["title"] for t in data["updated"]] == ["Renamed"]
+    assert data["deleted"] == [second_id]
+
+
+def test_task_changes_pagination(authenticated_client, test_user, db):
+    """Delta sync pages through changes with has_more and the returned cursor."""
+    for i in range(5):
+        db.add(Task(title=f"Task {i}", owner_id=test_user.id))
+    db.commit()
+
+    response = authenticated_client.get("/api/v1/tasks/changes?limit=3")
+    data = response.json()
+    assert len(data["updated"]) == 3
+    assert data["has_more"] is True
+
+    response = authenticated_client.get(f"/api/v1/tasks/changes?limit=3&since={data['cursor']}")
+    data = response.json()
+    assert len(data["updated"]) == 2
+    assert data["has_more"] is False
+
+
+def test_task_changes_invalid_cursor(authenticated_client):
+    """Malformed cursors are rejected with 400."""
+    response = authenticated_client.get("/api/v1/tasks/changes?since=not-a-cursor")
+    assert response.status_code == 400
+
+
+def test_list_tasks_scope_assigned(authenticated_client, test_user, db):
+    """scope=assigned lists tasks other users assigned to me; scope=all adds my own."""
+    from app.models.user import User
+    from app.utils.auth import hash_password
+    other = User(email="assigner@example.com", hashed_password=hash_password("password123"))
+    db.add(other)
+    db.commit()
+    db.add(Task(title="Mine", owner_id=test_user.id))
+    db.add(Task(title="Assigned to me", owner_id=other.id, assigned_to=test_user.id))
+    db.add(Task(title="Not mine", owner_id=other.id))
+    db.commit()
+
+    owned = authenticated_client.get("/api/v1/tasks").json()
+    assert [t["title"] for t in owned] == ["Mine"]
+
+    assigned = authenticated_client.get("/api/v1/tasks?scope=assigned").json()
+    assert [t["title"] for t in assigned] == ["Assigned to me"]
+
+    both = authenticated_client.get("/api/v1/tasks?scope=all").json()
+    assert {t["title"] for t in both} == {"Mine", "Assigned to me"}
+
+    # Assignee can open the task they were assigned
+    response = authenticated_client.get(f"/api/v1/tasks/{assigned[0]['id']}")
+    assert response.status_code == 200
+
+    response = authenticated_client.get("/api/v1/tasks?scope=everyone")
+    assert response.status_code == 400
+
+
+def test_list_tasks_sort_by_priority(authenticated_client, test_user, db):
+    """Priority sorts by rank (low < medium < high), not alphabetically."""
+    for priority in ("medium", "high", "low"):
+        db.add(Task(title=f"{priority} task", priority=priority, owner_id=test_user.id))
+    db.commit()
+
+    response = authenticated_client.get("/api/v1/tasks?sort_by=priority&sort_order=desc")
+    assert [t["priority"] for t in response.json()] == ["high", "medium", "low"]
+
+    response = authenticated_client.get("/api/v1/tasks?sort_by=priority&sort_order=asc")
+    assert [t["priority"] for t in response.json()] == ["low", "medium", "high"]
+
+
+def test_list_tasks_unknown_priority_matches_nothing(authenticated_client, test_user, db):
+    """An unknown priority filter returns no tasks instead of erroring."""
+    db.add(Task(title="Task", owner_id=test_user.id))
+    db.commit()
+
+    response = authenticated_client.get("/api/v1/tasks?priority=urgent")
+    assert response.status_code == 200
+    assert response.json() == []